@@ -0,0 +1,694 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Deploy backups.
+
+Backups are sibling directories of the installed plugin named
+``<slug>.bak.<timestamp>``. In incremental mode (like ``rsync --link-dest``)
+a file whose size, mode and mtime match the newest existing backup is
+hardlinked to it instead of copied, so a backup costs time and disk in
+proportion to what changed since the previous one.
+
+Each generation is a complete tree of its own: deleting one only drops its
+links, the data stays reachable from the generations still sharing it.
+Backed up files must therefore never be modified in place, they are only
+replaced (the sync engine always unlinks before copying).
+
+Backups can instead be archived: the old tree is streamed into a compressed
+``<slug>.bak.<timestamp>.tar.<compression>`` in a backups directory outside
+the QGIS profile, so it neither multiplies disk use in the profile nor gets
+scanned by QGIS at startup. :func:`restore_backup` streams an archive back.
+
+:func:`rollback` reinstates a backup directory with renames only.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tarfile
+import threading
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+from .copying import copy_file
+from .manifest import DeployManifest
+from .store import ObjectStore
+from .sync import exchange_directories
+
+logger = logging.getLogger(__name__)
+
+
+def _zstd_available() -> bool:
+    try:
+        import compression.zstd  # noqa: F401  (Python 3.14+)
+    except ImportError:
+        return False
+    return True
+
+
+ARCHIVE_COMPRESSIONS = ("gz", "xz", *(("zst",) if _zstd_available() else ()))
+
+
+def get_data_dir() -> Path:
+    """Return the user data directory for QGIS Plugin Manager."""
+    base = os.environ.get("XDG_DATA_HOME")
+    data_root = Path(base) if base else Path.home() / ".local" / "share"
+    return data_root / "qgis-manager"
+
+
+def get_archive_dir(profile: str = "default") -> Path:
+    """Return the directory holding the backup archives of a QGIS profile."""
+    return get_data_dir() / "backups" / profile.replace("/", "-")
+
+
+def _is_archive(path: Path) -> bool:
+    return any(path.name.endswith(f".tar.{c}") for c in ARCHIVE_COMPRESSIONS)
+
+
+def backup_timestamp(backup: Path) -> str:
+    """Return the timestamp of a backup directory or archive."""
+    return backup.name.split(".bak.", 1)[1].split(".", 1)[0]
+
+
+def _tree_size(path: Path) -> int:
+    if not path.is_dir():
+        return path.stat().st_size
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def owned_size(path: Path) -> int:
+    """Return the bytes of the files under ``path`` that nothing else links to.
+
+    Files hardlinked from the object store, another backup or the installed
+    plugin are left out: deleting ``path`` would not free them.
+    """
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                st = os.lstat(os.path.join(dirpath, name))
+            except OSError:
+                continue
+            if st.st_nlink == 1:
+                total += st.st_size
+    return total
+
+
+class BackupIndex:
+    """Index of the backups of one plugin in one directory.
+
+    Stored as ``.<slug>.backups.json`` next to the backups, it maps each
+    backup name to the bytes it added on disk and to its full size, and
+    lists the backups being deleted. Listing and pruning backups read it
+    instead of scanning a directory that may hold hundreds of plugins; the
+    directory is only scanned when the index does not exist yet.
+
+    Attributes:
+        parent_dir: Directory holding the backups.
+        slug: Plugin directory name.
+        backups: Backup names mapped to the bytes they added.
+        sizes: Backup names mapped to their full size.
+        trash: Hidden names of backups whose deletion is pending.
+    """
+
+    VERSION = 2
+
+    def __init__(self, parent_dir: Path, slug: str):
+        self.parent_dir = parent_dir
+        self.slug = slug
+        self.backups: dict[str, int] = {}
+        self.sizes: dict[str, int] = {}
+        self.trash: list[str] = []
+        self._load()
+
+    @property
+    def path(self) -> Path:
+        return self.parent_dir / f".{self.slug}.backups.json"
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.backups = dict(data["backups"])
+                self.sizes = dict(data["sizes"])
+                self.trash = list(data.get("trash", []))
+                return
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Rebuilding unreadable backup index {self.path}: {e}")
+        self._scan()
+
+    def _scan(self) -> None:
+        self.backups = {}
+        self.sizes = {}
+        if not self.parent_dir.is_dir():
+            return
+        for item in self.parent_dir.iterdir():
+            if item.name.startswith(f"{self.slug}.bak.") and (
+                item.is_dir() or _is_archive(item)
+            ):
+                self.backups[item.name] = self.sizes[item.name] = _tree_size(item)
+
+    def names(self) -> list[str]:
+        """Return the backup names, newest first."""
+        # The timestamp suffix sorts chronologically
+        return sorted(self.backups, reverse=True)
+
+    def save(self) -> None:
+        """Atomically write the index."""
+        self.parent_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "backups": self.backups,
+                    "sizes": self.sizes,
+                    "trash": self.trash,
+                },
+                f,
+                indent=1,
+            )
+        os.replace(tmp_path, self.path)
+
+
+# Serialises index updates between the threads of a fan-out deploy
+_index_lock = threading.Lock()
+
+
+def register_backup(
+    backup: Path, nbytes: int | None = None, size: int | None = None
+) -> None:
+    """Record a new backup directory or archive in its index.
+
+    Args:
+        backup: Backup path, named ``<slug>.bak.<timestamp>[...]``.
+        nbytes: Bytes the backup added on disk (default: its full size).
+        size: Full size of the backup (default: measured).
+    """
+    slug = backup.name.split(".bak.", 1)[0]
+    if size is None:
+        size = _tree_size(backup)
+    if nbytes is None:
+        nbytes = size
+    with _index_lock:
+        index = BackupIndex(backup.parent, slug)
+        index.backups[backup.name] = nbytes
+        index.sizes[backup.name] = size
+        index.save()
+
+
+def unregister_backup(backup: Path) -> None:
+    """Remove a backup that was renamed or deleted from its index."""
+    slug = backup.name.split(".bak.", 1)[0]
+    with _index_lock:
+        index = BackupIndex(backup.parent, slug)
+        index.sizes.pop(backup.name, None)
+        if index.backups.pop(backup.name, None) is not None:
+            index.save()
+
+
+def list_backups(parent_dir: Path, slug: str) -> list[Path]:
+    """Return the backup directories and archives of a plugin, newest first."""
+    backups = [parent_dir / name for name in BackupIndex(parent_dir, slug).names()]
+    # Skip backups deleted behind the index's back
+    return [backup for backup in backups if backup.exists()]
+
+
+def _backup_time(name: str) -> datetime | None:
+    try:
+        return datetime.strptime(name.split(".bak.", 1)[1][:14], "%Y%m%d%H%M%S")
+    except (IndexError, ValueError):
+        return None
+
+
+@dataclass
+class RetentionPolicy:
+    """Which backups to keep when rotating.
+
+    A backup is kept if any rule keeps it; the size budget then drops the
+    oldest kept backups (never the newest one) until the total fits. With
+    every rule disabled, all backups are kept.
+
+    Attributes:
+        keep_last: Number of most recent backups to keep.
+        keep_daily: Number of days for which the newest backup is kept.
+        keep_weekly: Number of ISO weeks for which the newest backup is kept.
+        max_bytes: Total size budget of the kept backups.
+    """
+
+    keep_last: int = 3
+    keep_daily: int = 0
+    keep_weekly: int = 0
+    max_bytes: int | None = None
+
+    def select(
+        self,
+        backups: Sequence[tuple[str, int]],
+        sizes: Mapping[str, int] | None = None,
+    ) -> list[str]:
+        """Return the names of the backups to keep.
+
+        An incremental backup only adds the files that changed since the
+        previous one, but holds the linked ones alone once the older backups
+        are gone: the oldest kept backup is charged its full size.
+
+        Args:
+            backups: (name, bytes added) pairs, newest first.
+            sizes: Full size of each backup (default: the bytes added).
+        """
+        if not (self.keep_last > 0 or self.keep_daily > 0 or self.keep_weekly > 0):
+            keep = {name for name, _ in backups}
+        else:
+            keep = {name for name, _ in backups[: self.keep_last]}
+            for count, period in (
+                (self.keep_daily, "%Y-%m-%d"),
+                (self.keep_weekly, "%G-W%V"),
+            ):
+                seen: set[str] = set()
+                for name, _ in backups:
+                    taken = _backup_time(name)
+                    if taken is None or len(seen) >= count:
+                        continue
+                    bucket = taken.strftime(period)
+                    if bucket not in seen:
+                        seen.add(bucket)
+                        keep.add(name)
+
+        kept: list[str] = []
+        added = 0
+        for name, nbytes in backups:
+            if name not in keep:
+                continue
+            oldest = (sizes or {}).get(name, nbytes)
+            if kept and self.max_bytes is not None and added + oldest > self.max_bytes:
+                break
+            kept.append(name)
+            added += nbytes
+        return kept
+
+
+def parse_size(value: int | str) -> int:
+    """Parse a size such as ``1048576``, ``"500M"`` or ``"2GB"`` into bytes."""
+    if isinstance(value, int):
+        return value
+    text = value.strip().upper().removesuffix("B").removesuffix("I")
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def prune_backups(
+    parent_dir: Path,
+    slug: str,
+    policy: RetentionPolicy,
+    store: ObjectStore | None = None,
+    background: bool = False,
+) -> threading.Thread | None:
+    """Delete the backups a retention policy does not keep.
+
+    The doomed backups are renamed to hidden names and dropped from the index
+    right away, so listings never see them again. Deleting them (and
+    collecting the store blobs they referenced) can run in a background
+    thread, keeping large deletions off the deploy's critical path.
+
+    Args:
+        parent_dir: Directory holding the backups.
+        slug: Plugin directory name.
+        policy: Backups to keep.
+        store: Object store to garbage collect after the deletion.
+        background: Delete in a thread instead of before returning.
+
+    Returns:
+        The deleting thread when ``background`` is set and there is work.
+    """
+    with _index_lock:
+        index = BackupIndex(parent_dir, slug)
+        backups = [(name, index.backups[name]) for name in index.names()]
+        kept = set(policy.select(backups, sizes=index.sizes))
+        doomed = [name for name, _ in backups if name not in kept]
+        if not doomed and not index.trash:
+            return None
+
+        for name in doomed:
+            logger.debug(f"🧹 Removing old backup: {name}")
+            del index.backups[name]
+            index.sizes.pop(name, None)
+            trash_name = f".{name}.deleting"
+            try:
+                os.rename(parent_dir / name, parent_dir / trash_name)
+            except FileNotFoundError:
+                continue  # Already gone
+            index.trash.append(trash_name)
+        trash = list(index.trash)
+        index.save()
+
+    def delete() -> None:
+        for name in trash:
+            path = parent_dir / name
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+        with _index_lock:
+            index = BackupIndex(parent_dir, slug)
+            index.trash = [n for n in index.trash if (parent_dir / n).exists()]
+            index.save()
+        if store is not None:
+            store.gc()
+
+    if not background:
+        delete()
+        return None
+    thread = threading.Thread(target=delete, name=f"prune-{slug}")
+    thread.start()
+    return thread
+
+
+@dataclass
+class BackupStats:
+    """Outcome of a backup.
+
+    Attributes:
+        path: Backup directory.
+        previous: Backup the unchanged files were linked to, if any.
+        linked: Files hardlinked to the previous backup or the object store.
+        copied: Files copied from the installed plugin.
+        bytes_copied: Volume of the copied files.
+        bytes_linked: Volume of the linked files.
+    """
+
+    path: Path
+    previous: Path | None = None
+    linked: int = 0
+    copied: int = 0
+    bytes_copied: int = 0
+    bytes_linked: int = 0
+
+
+def _signature(st: os.stat_result) -> tuple[int, int, int]:
+    return st.st_size, st.st_mtime_ns, st.st_mode
+
+
+class _IncrementalCopier:
+    """``copy_function`` for :func:`shutil.copytree` linking unchanged files."""
+
+    def __init__(
+        self,
+        source: Path,
+        previous: Path | None,
+        stats: BackupStats,
+        store: ObjectStore | None = None,
+    ):
+        self.source = source
+        self.previous = previous
+        self.stats = stats
+        self.store = store
+
+    def __call__(self, src: str, dst: str) -> str:
+        st = os.stat(src)
+        if self.previous is not None:
+            old = self.previous / os.path.relpath(src, self.source)
+            try:
+                if _signature(os.lstat(old)) == _signature(st):
+                    os.link(old, dst)
+                    self.stats.linked += 1
+                    self.stats.bytes_linked += st.st_size
+                    return dst
+            except OSError:
+                # Missing in the previous backup, or too many links: copy
+                pass
+
+        if self.store is not None and not self.store.checkout(src, Path(dst)):
+            self.stats.linked += 1
+            self.stats.bytes_linked += st.st_size
+            return dst
+
+        if self.store is None:
+            copy_file(src, dst)
+        self.stats.copied += 1
+        self.stats.bytes_copied += st.st_size
+        return dst
+
+
+def create_backup(
+    target_path: Path,
+    backup_path: Path,
+    incremental: bool = True,
+    store: ObjectStore | None = None,
+) -> BackupStats:
+    """Back up an installed plugin.
+
+    Args:
+        target_path: Installed plugin directory.
+        backup_path: Backup directory to create.
+        incremental: Hardlink the files unchanged since the newest existing
+            backup instead of copying them.
+        store: Object store the other files are linked from, so a content
+            already stored for any backup or deploy is not copied again.
+
+    Returns:
+        What was linked and copied.
+    """
+    previous = None
+    if incremental:
+        slug = target_path.name
+        backups = list_backups(target_path.parent, slug)
+        previous = next((b for b in backups if b != backup_path and b.is_dir()), None)
+
+    if store is not None and not store.supports(backup_path.parent):
+        logger.debug(f"Object store not on the filesystem of {backup_path.parent}")
+        store = None
+
+    stats = BackupStats(backup_path, previous)
+    shutil.copytree(
+        target_path,
+        backup_path,
+        copy_function=_IncrementalCopier(target_path, previous, stats, store),
+    )
+    register_backup(
+        backup_path, stats.bytes_copied, stats.bytes_copied + stats.bytes_linked
+    )
+    return stats
+
+
+def archive_backup(
+    source: Path,
+    archive_dir: Path,
+    slug: str,
+    timestamp: str,
+    compression: str = "gz",
+) -> Path:
+    """Stream a plugin tree into a compressed tar archive.
+
+    The archive is written under a hidden temporary name and renamed when
+    complete, so an interrupted backup never looks like a valid one. A
+    ``-N`` suffix keeps archives taken within the same second apart (see
+    :func:`unique_backup_path`).
+
+    Args:
+        source: Plugin tree to archive.
+        archive_dir: Directory receiving the archive.
+        slug: Plugin directory name, used as the archive root.
+        timestamp: Backup timestamp.
+        compression: One of :data:`ARCHIVE_COMPRESSIONS`.
+
+    Returns:
+        The archive path.
+    """
+    if compression not in ARCHIVE_COMPRESSIONS:
+        raise ValueError(f"Unsupported archive compression: {compression}")
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = unique_backup_path(archive_dir, slug, timestamp, f".tar.{compression}")
+    partial = path.with_name(f".{path.name}.partial")
+    try:
+        # Symlink farms are archived as real files, like directory backups
+        mode = f"w:{compression}"
+        with tarfile.open(partial, mode, dereference=True) as tar:  # type: ignore[call-overload]
+            tar.add(source, arcname=slug)
+        partial.rename(path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    register_backup(path, path.stat().st_size)
+    return path
+
+
+def find_backup(
+    parent_dir: Path, slug: str, timestamp: str | None = None, archive: bool = False
+) -> Path:
+    """Return the newest backup of a plugin, or the one taken at ``timestamp``.
+
+    Args:
+        parent_dir: Directory holding the backups.
+        slug: Plugin directory name.
+        timestamp: Timestamp of the wanted backup.
+        archive: Look for an archive instead of a backup directory.
+
+    Raises:
+        FileNotFoundError: If there is no matching backup.
+    """
+    for backup in list_backups(parent_dir, slug):
+        if _is_archive(backup) != archive:
+            continue
+        if timestamp in (None, backup_timestamp(backup)):
+            return backup
+    kind = "backup archive" if archive else "backup"
+    wanted = f" from {timestamp}" if timestamp else ""
+    raise FileNotFoundError(f"No {kind}{wanted} for '{slug}' in {parent_dir}")
+
+
+def restore_backup(
+    archive: Path,
+    target_path: Path,
+    archive_dir: Path | None = None,
+    compression: str = "gz",
+) -> Path | None:
+    """Replace an installed plugin with the content of a backup archive.
+
+    The archive is extracted by streaming into a hidden sibling of the target,
+    then swapped in with :func:`exchange_directories`.
+
+    Args:
+        archive: Backup archive created by :func:`archive_backup`.
+        target_path: Installed plugin directory.
+        archive_dir: If given, the installed version is archived there before
+            being replaced.
+        compression: Compression of that archive.
+
+    Returns:
+        The archive of the replaced version, if one was made.
+    """
+    slug = target_path.name
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    staging = target_path.parent / f".{slug}.restore.{timestamp}"
+    staging.mkdir(parents=True)
+    try:
+        with tarfile.open(archive, "r|*") as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(staging, filter="data")
+            else:  # pragma: no cover - Python without extraction filters
+                tar.extractall(staging)  # noqa: S202
+        entries = list(staging.iterdir())
+        if len(entries) != 1 or not entries[0].is_dir():
+            raise ValueError(f"{archive.name} does not contain a plugin directory")
+        restored = entries[0]
+
+        previous = None
+        if target_path.exists():
+            if archive_dir is not None:
+                previous = archive_backup(
+                    target_path, archive_dir, slug, timestamp, compression
+                )
+            exchange_directories(target_path, restored)
+        else:
+            restored.rename(target_path)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return previous
+
+
+def unique_backup_path(
+    parent_dir: Path, slug: str, timestamp: str, extension: str = ""
+) -> Path:
+    """Return a free ``<slug>.bak.<timestamp><extension>`` path.
+
+    A ``-N`` suffix is added to the timestamp while a backup directory or
+    archive already uses it, so backups taken within the same second get
+    distinct timestamps that still sort after the first one.
+
+    Args:
+        parent_dir: Directory receiving the backup.
+        slug: Plugin directory name.
+        timestamp: Backup timestamp.
+        extension: ``.tar.<compression>`` for an archive.
+    """
+    suffix = 0
+    while True:
+        stamp = f"{timestamp}-{suffix}" if suffix else timestamp
+        base = parent_dir / f"{slug}.bak.{stamp}"
+        taken = [base] + [
+            base.with_name(f"{base.name}.tar.{c}") for c in ARCHIVE_COMPRESSIONS
+        ]
+        if not any(p.exists() for p in taken):
+            return base.with_name(base.name + extension)
+        suffix += 1
+
+
+def rollback(
+    target_path: Path, timestamp: str | None = None
+) -> tuple[Path, Path | None]:
+    """Reinstate a backup directory by renames only.
+
+    The backup is swapped with the installed plugin with
+    :func:`exchange_directories`, then the replaced version (now at the
+    backup's path) is renamed to a new ``<slug>.bak.<timestamp>``. No file is
+    copied, so this takes constant time whatever the plugin size. A replaced
+    link farm holds no data of its own and is removed instead.
+
+    Args:
+        target_path: Installed plugin directory.
+        timestamp: Backup to reinstate (default: the newest).
+
+    Returns:
+        The reinstated backup's original path, and the backup now holding the
+        replaced version, if any.
+
+    Raises:
+        FileNotFoundError: If there is no matching backup directory.
+    """
+    slug = target_path.name
+    backup = find_backup(target_path.parent, slug, timestamp)
+    index = BackupIndex(target_path.parent, slug)
+    nbytes, size = index.backups.get(backup.name), index.sizes.get(backup.name)
+    if not target_path.exists():
+        backup.rename(target_path)
+        unregister_backup(backup)
+        return backup, None
+
+    manifest = DeployManifest.load(target_path)
+    exchange_directories(target_path, backup)
+    unregister_backup(backup)
+    if manifest is not None and manifest.link is not None:
+        shutil.rmtree(backup)
+        return backup, None
+
+    now = datetime.now().strftime("%Y%m%d%H%M%S")
+    replaced = unique_backup_path(target_path.parent, slug, now)
+    backup.rename(replaced)
+    # Roughly what the reinstated backup held on its own
+    register_backup(replaced, nbytes, size)
+    return backup, replaced
@@ -31,13 +31,19 @@ class CLIApp:
         from .commands.compile import CompileCommand
         from .commands.deploy import DeployCommand
         from .commands.hooks import HooksCommand
+        from .commands.ignore import IgnoreCommand
         from .commands.init import InitCommand
         from .commands.install_deps import InstallDepsCommand
         from .commands.package import PackageCommand
+        from .commands.restore import RestoreCommand
+        from .commands.rollback import RollbackCommand
+        from .commands.store import StoreCommand
         from .commands.validate import ValidateCommand
 
         command_classes: list[type[BaseCommand]] = [
             DeployCommand,
+            RestoreCommand,
+            RollbackCommand,
             CompileCommand,
             PackageCommand,
             InitCommand,
@@ -46,6 +52,8 @@ class CLIApp:
             ValidateCommand,
             InstallDepsCommand,
             HooksCommand,
+            IgnoreCommand,
+            StoreCommand,
             BumpCommand,
         ]
         return {cmd().name: cmd() for cmd in command_classes}
@@ -6,7 +6,7 @@ from pathlib import Path
 import click
 
 from ...core import compile_qt_resources
-from ...discovery import find_project_root
+from ...discovery import find_project_files, find_project_root
 from ..base import BaseCommand
 
 
@@ -37,10 +37,14 @@ class CompileCommand(BaseCommand):
 
             if args.res_type in ["docs", "all"]:
                 qrc_count = (
-                    len(list(root.rglob("*.qrc"))) if args.res_type == "all" else 0
+                    len(find_project_files(root, ".qrc"))
+                    if args.res_type == "all"
+                    else 0
                 )
                 ts_count = (
-                    len(list(root.rglob("*.ts"))) if args.res_type == "all" else 0
+                    len(find_project_files(root, ".ts"))
+                    if args.res_type == "all"
+                    else 0
                 )
                 has_docs = (root / "docs" / "source" / "conf.py").exists()
                 total_steps = qrc_count + ts_count + (1 if has_docs else 0)
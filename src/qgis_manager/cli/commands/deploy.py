@@ -1,17 +1,84 @@
 """Deploy command implementation."""
 
 import argparse
+import json
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import Any
 
 import click
 
-from ...config import load_config, load_project_config
-from ...core import compile_qt_resources, deploy_plugin, get_qgis_plugin_dir
-from ...discovery import find_project_root, get_plugin_metadata
+from ...backups import ARCHIVE_COMPRESSIONS
+from ...config import Settings, load_config, load_project_config
+from ...core import (
+    compile_qt_resources,
+    deploy_changes,
+    deploy_matcher,
+    deploy_plugin,
+    deploy_to_profiles,
+    discover_qgis_profiles,
+    get_qgis_plugin_dir,
+)
+from ...discovery import (
+    find_project_files,
+    find_project_root,
+    get_plugin_metadata,
+)
 from ...hooks import run_hook
+from ...store import ObjectStore
+from ...sync import SyncPlan, SyncProgress, format_bytes
+from ...watch import (
+    RESCAN,
+    OwnWrites,
+    QtSourceIndex,
+    create_watcher,
+    watch_batches,
+)
 from ..base import BaseCommand
 
 
+class SyncProgressBar:
+    """Render sync progress events as a progress bar.
+
+    The bar measures bytes (files for link farms) and its label shows the
+    files done, the throughput and the estimated time left. It is only drawn
+    if there is something to copy.
+    """
+
+    def __init__(self) -> None:
+        self._stack = ExitStack()
+        self._bar: Any = None
+        self._bytes = True
+        self._done = 0
+
+    def __call__(self, event: SyncProgress) -> None:
+        if self._bar is None:
+            if event.phase == "done" or not event.files_total:
+                return
+            self._bytes = event.bytes_total > 0
+            total = event.bytes_total if self._bytes else event.files_total
+            self._bar = self._stack.enter_context(
+                click.progressbar(length=total, label="📤 Syncing")
+            )
+
+        done = event.bytes_done if self._bytes else event.files_done
+        eta = event.eta
+        self._bar.label = (
+            f"📤 {event.files_done}/{event.files_total} files, "
+            f"{format_bytes(event.rate)}/s"
+            + (f", {eta:.0f}s left" if eta and event.phase != "done" else "")
+        )
+        self._bar.update(done - self._done)
+        self._done = done
+        if event.phase == "done":
+            self._stack.close()
+            self._bar = None
+            self._done = 0
+
+
 class DeployCommand(BaseCommand):
     """Command to deploy the plugin to a local QGIS profile."""
 
@@ -30,6 +97,48 @@ class DeployCommand(BaseCommand):
             action="store_true",
             help="Skip backup of existing installation",
         )
+        parser.add_argument(
+            "--max-backups",
+            type=int,
+            help="Number of most recent backups to keep",
+        )
+        parser.add_argument(
+            "--keep-daily",
+            type=int,
+            metavar="DAYS",
+            help="Also keep the newest backup of each of the last DAYS days",
+        )
+        parser.add_argument(
+            "--keep-weekly",
+            type=int,
+            metavar="WEEKS",
+            help="Also keep the newest backup of each of the last WEEKS weeks",
+        )
+        parser.add_argument(
+            "--backup-budget",
+            metavar="SIZE",
+            help="Drop the oldest backups beyond this total size (e.g. 500M)",
+        )
+        parser.add_argument(
+            "--full-backup",
+            action="store_true",
+            help="Copy every file into the backup instead of hardlinking the "
+            "files unchanged since the previous backup",
+        )
+        parser.add_argument(
+            "--store",
+            action="store_true",
+            help="Hardlink backups and --atomic staging to a content-addressed "
+            "store, so each file content is copied only once",
+        )
+        parser.add_argument(
+            "--archive",
+            nargs="?",
+            const="gz",
+            choices=ARCHIVE_COMPRESSIONS,
+            help="Stream the backup into a compressed tar archive outside the "
+            "QGIS profile (default: gz); see 'qgis-manage restore'",
+        )
         parser.add_argument(
             "-i",
             "--interactive",
@@ -41,6 +150,77 @@ class DeployCommand(BaseCommand):
             action="store_true",
             help="Skip automatic resource compilation",
         )
+        parser.add_argument(
+            "--no-manifest",
+            action="store_true",
+            help="Compare against the target tree instead of the deploy manifest",
+        )
+        parser.add_argument(
+            "--compare",
+            choices=["mtime", "hash"],
+            default="mtime",
+            help="Detect changed files by size and mtime or by content hash "
+            "(default: mtime)",
+        )
+        parser.add_argument(
+            "--link",
+            nargs="?",
+            const="symlink",
+            choices=["symlink", "hardlink"],
+            help="Deploy links to the source files instead of copies "
+            "(default: symlink). Deploy without it to get real copies back",
+        )
+        parser.add_argument(
+            "--atomic",
+            action="store_true",
+            help="Build the new version next to the plugin and swap it in with a "
+            "rename; the previous version becomes the backup",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="Number of files copied concurrently (default: 1)",
+        )
+        parser.add_argument(
+            "--plan",
+            action="store_true",
+            help="Show what the deploy would change without deploying",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the deploy plan as JSON (implies --plan)",
+        )
+        parser.add_argument(
+            "--profiles",
+            nargs="+",
+            metavar="PROFILE",
+            help="Deploy to several profiles at once (QGIS4 ones as QGIS4/<name>)",
+        )
+        parser.add_argument(
+            "--all-profiles",
+            action="store_true",
+            help="Deploy to every QGIS3 and QGIS4 profile found",
+        )
+        parser.add_argument(
+            "-w",
+            "--watch",
+            action="store_true",
+            help="Keep watching the project and redeploy changed files",
+        )
+        parser.add_argument(
+            "--poll",
+            action="store_true",
+            help="Watch by polling instead of inotify",
+        )
+        parser.add_argument(
+            "--debounce",
+            type=float,
+            default=0.3,
+            help="Seconds without changes that close a watch batch (default: 0.3)",
+        )
         parser.add_argument(
             "--purge-backups",
             action="store_true",
@@ -56,6 +236,11 @@ class DeployCommand(BaseCommand):
             settings = load_project_config(root, settings)
 
             # Defaults
+            for option in ("max_backups", "keep_daily", "keep_weekly"):
+                if getattr(args, option) is not None:
+                    setattr(settings, option, getattr(args, option))
+            if args.backup_budget is not None:
+                settings.backup_budget = args.backup_budget
             target_profile = args.profile or settings.profile
             use_backup = not args.no_backup if args.no_backup else settings.backup
 
@@ -85,6 +270,52 @@ class DeployCommand(BaseCommand):
                 target_dir = get_qgis_plugin_dir(target_profile)
                 target_path = target_dir / slug
 
+            profiles = args.profiles
+            if args.all_profiles:
+                profiles = discover_qgis_profiles()
+                if not profiles:
+                    raise FileNotFoundError("No QGIS profiles found")
+            if profiles and args.watch:
+                raise ValueError("--watch deploys to a single profile")
+
+            if profiles and (args.plan or args.json):
+                results = deploy_to_profiles(
+                    root,
+                    profiles,
+                    use_manifest=not args.no_manifest,
+                    compare=args.compare,
+                    link=args.link,
+                    dry_run=True,
+                )
+                if args.json:
+                    data = {
+                        r.profile: r.plan.to_dict()
+                        if r.plan
+                        else {"error": str(r.error)}
+                        for r in results
+                    }
+                    click.echo(json.dumps(data, indent=2))
+                else:
+                    for result in results:
+                        if result.plan is not None:
+                            self._print_plan(result.plan, metadata["name"])
+                return 0 if all(r.error is None for r in results) else 1
+
+            if args.plan or args.json:
+                plan = deploy_plugin(
+                    root,
+                    profile=target_profile,
+                    use_manifest=not args.no_manifest,
+                    compare=args.compare,
+                    link=args.link,
+                    dry_run=True,
+                )
+                if args.json:
+                    click.echo(json.dumps(plan.to_dict(), indent=2))
+                else:
+                    self._print_plan(plan, metadata["name"])
+                return 0
+
             # Pre-deploy hook
             pre_hook = settings.hooks.get("pre-deploy")
             # Build context for native hooks
@@ -95,6 +326,8 @@ class DeployCommand(BaseCommand):
                 "target_path": target_path,
                 "args": vars(args),
             }
+            if profiles:
+                hook_ctx["profiles"] = profiles
 
             if pre_hook or (root / "plugin_hooks.py").exists():
                 if args.interactive:
@@ -110,68 +343,36 @@ class DeployCommand(BaseCommand):
                     click.echo("Aborted by user.")
                     return 1
 
+            compile_step = None
             if not args.no_compile and settings.auto_compile:
-                # Calculate steps: qrcs + ts + 1 (docs)
-                qrc_count = len(list(root.rglob("*.qrc")))
-                ts_count = len(list(root.rglob("*.ts")))
-                has_docs = (root / "docs" / "source" / "conf.py").exists()
-                total_steps = qrc_count + ts_count + (1 if has_docs else 0)
-
-                if total_steps > 0:
-                    with click.progressbar(
-                        length=total_steps,
-                        label="📚 Compiling resources and docs",
-                        show_pos=True,
-                    ) as bar:
-
-                        def comp_callback(line):
-                            import time
-
-                            icons = {
-                                "Recurso": "🔨",
-                                "Trad": "🌍",
-                                "Documentación": "📚",
-                            }
-                            msg = line.split(":", 1)[1] if ":" in line else line
-                            short_msg = msg[:40] + "..." if len(msg) > 40 else msg
-
-                            if line.startswith("START:"):
-                                icon = "🛠️"
-                                for k, v in icons.items():
-                                    if k in msg:
-                                        icon = v
-                                        break
-                                bar.label = f"{icon} {short_msg}"
-                                bar.update(0)
-                            elif line.startswith("PROGRESS:"):
-                                spinner = [
-                                    "⠋",
-                                    "⠙",
-                                    "⠹",
-                                    "⠸",
-                                    "⠼",
-                                    "⠴",
-                                    "⠦",
-                                    "⠧",
-                                    "⠇",
-                                    "⠏",
-                                ]
-                                s = spinner[int(time.time() * 5) % len(spinner)]
-                                bar.label = f"📚 {s} {short_msg}"
-                                bar.update(0)
-                            elif line.startswith("DONE:"):
-                                bar.update(1)
-
-                        compile_qt_resources(root, "all", callback=comp_callback)
+                compile_step = partial(self._compile, root)
 
             click.echo(f"🚀 Deploying '{metadata['name']}' ({slug}) to {target_path}")
 
+            if profiles:
+                if compile_step is not None:
+                    compile_step()
+                return self._deploy_profiles(
+                    root, args, settings, profiles, use_backup, hook_ctx
+                )
+
             # Deployment
             deploy_plugin(
                 root,
                 no_backup=not use_backup,
                 profile=target_profile,
-                max_backups=settings.max_backups,
+                retention=settings.retention_policy(),
+                use_manifest=not args.no_manifest,
+                jobs=max(1, args.jobs),
+                compare=args.compare,
+                link=args.link,
+                atomic=args.atomic,
+                incremental_backup=not args.full_backup,
+                archive=args.archive,
+                store=ObjectStore() if args.store else None,
+                compile_step=compile_step,
+                on_report=lambda report: click.echo(report.summary()),
+                progress=SyncProgressBar(),
             )
 
             # Post-deploy hook
@@ -185,8 +386,238 @@ class DeployCommand(BaseCommand):
                 run_hook("post-deploy", post_hook, root, context=hook_ctx)
 
             click.echo(click.style("✨ Deployment complete!", fg="green", bold=True))
+
+            if args.watch:
+                compile_enabled = not args.no_compile and settings.auto_compile
+                return self._watch(
+                    root, args, settings, target_profile, hook_ctx, compile_enabled
+                )
             return 0
 
         except Exception as e:
             click.echo(click.style(f"❌ Error: {e}", fg="red", bold=True), err=True)
             return 1
+
+    def _compile(self, root: Path) -> None:
+        """Compile resources, translations and docs with a progress bar."""
+        # Calculate steps: qrcs + ts + 1 (docs)
+        qrc_count = len(find_project_files(root, ".qrc"))
+        ts_count = len(find_project_files(root, ".ts"))
+        has_docs = (root / "docs" / "source" / "conf.py").exists()
+        total_steps = qrc_count + ts_count + (1 if has_docs else 0)
+
+        if total_steps > 0:
+            with click.progressbar(
+                length=total_steps,
+                label="📚 Compiling resources and docs",
+                show_pos=True,
+            ) as bar:
+
+                def comp_callback(line):
+                    import time
+
+                    icons = {
+                        "Recurso": "🔨",
+                        "Trad": "🌍",
+                        "Documentación": "📚",
+                    }
+                    msg = line.split(":", 1)[1] if ":" in line else line
+                    short_msg = msg[:40] + "..." if len(msg) > 40 else msg
+
+                    if line.startswith("START:"):
+                        icon = "🛠️"
+                        for k, v in icons.items():
+                            if k in msg:
+                                icon = v
+                                break
+                        bar.label = f"{icon} {short_msg}"
+                        bar.update(0)
+                    elif line.startswith("PROGRESS:"):
+                        spinner = [
+                            "⠋",
+                            "⠙",
+                            "⠹",
+                            "⠸",
+                            "⠼",
+                            "⠴",
+                            "⠦",
+                            "⠧",
+                            "⠇",
+                            "⠏",
+                        ]
+                        s = spinner[int(time.time() * 5) % len(spinner)]
+                        bar.label = f"📚 {s} {short_msg}"
+                        bar.update(0)
+                    elif line.startswith("DONE:"):
+                        bar.update(1)
+
+                compile_qt_resources(root, "all", callback=comp_callback)
+
+    def _deploy_profiles(
+        self,
+        root: Path,
+        args: argparse.Namespace,
+        settings: Settings,
+        profiles: list[str],
+        use_backup: bool,
+        hook_ctx: dict,
+    ) -> int:
+        """Deploy to several profiles at once and report per profile."""
+        click.echo(f"🚀 Deploying to {len(profiles)} profiles: {', '.join(profiles)}")
+        results = deploy_to_profiles(
+            root,
+            profiles,
+            no_backup=not use_backup,
+            retention=settings.retention_policy(),
+            use_manifest=not args.no_manifest,
+            jobs=max(1, args.jobs),
+            compare=args.compare,
+            link=args.link,
+            atomic=args.atomic,
+            incremental_backup=not args.full_backup,
+            archive=args.archive,
+            store=ObjectStore() if args.store else None,
+        )
+
+        post_hook = settings.hooks.get("post-deploy")
+        has_hooks = (root / "plugin_hooks.py").exists()
+        width = max(len(r.profile) for r in results)
+        failed = 0
+        for result in results:
+            elapsed = f"{result.seconds * 1000:.0f} ms"
+            if result.plan is None:
+                failed += 1
+                click.echo(
+                    click.style(
+                        f"  ❌ {result.profile:<{width}}  {result.error}", fg="red"
+                    )
+                )
+                continue
+
+            counts = result.plan.counts
+            click.echo(
+                click.style(f"  ✅ {result.profile:<{width}}", fg="green")
+                + f"  {counts['adds']} added, {counts['updates']} updated, "
+                f"{counts['deletes']} deleted, "
+                f"{format_bytes(result.plan.bytes)} ({elapsed})"
+            )
+            if post_hook or has_hooks:
+                ctx = dict(hook_ctx, profile=result.profile, target_path=result.target)
+                run_hook("post-deploy", post_hook, root, context=ctx)
+
+        if failed:
+            click.echo(
+                click.style(
+                    f"❌ {failed} of {len(results)} profiles failed",
+                    fg="red",
+                    bold=True,
+                ),
+                err=True,
+            )
+            return 1
+        click.echo(click.style("✨ Deployment complete!", fg="green", bold=True))
+        return 0
+
+    def _watch(
+        self,
+        root: Path,
+        args: argparse.Namespace,
+        settings: Settings,
+        profile: str,
+        hook_ctx: dict,
+        compile_enabled: bool,
+    ) -> int:
+        """Redeploy changed files in debounced batches until interrupted."""
+        slug = hook_ctx["metadata"]["slug"]
+        target_path = get_qgis_plugin_dir(profile) / slug
+        watcher = create_watcher(
+            root, deploy_matcher(root, target_path), polling=args.poll
+        )
+        index = QtSourceIndex(root) if compile_enabled else None
+        pre_hook = settings.hooks.get("pre-deploy")
+        post_hook = settings.hooks.get("post-deploy")
+        has_hooks = (root / "plugin_hooks.py").exists()
+        # Files written by our own compilation, ignored in the next batch
+        compiled_outputs = OwnWrites(root)
+        store = ObjectStore() if args.store else None
+
+        click.echo(f"👀 Watching {root} for changes (Ctrl+C to stop)")
+        try:
+            for batch in watch_batches(watcher, debounce=args.debounce):
+                batch = compiled_outputs.filter(batch)
+                if not batch:
+                    continue
+
+                start = time.perf_counter()
+                if pre_hook or has_hooks:
+                    if not run_hook("pre-deploy", pre_hook, root, context=hook_ctx):
+                        continue
+
+                affected = index.affected(batch) if index is not None else []
+                if affected:
+                    compile_qt_resources(root, "all", only=affected)
+                    for source in affected:
+                        output = source.with_suffix(
+                            ".py" if source.suffix == ".qrc" else ".qm"
+                        )
+                        compiled_outputs.record(output.relative_to(root).as_posix())
+
+                if RESCAN in batch:
+                    plan = deploy_plugin(
+                        root,
+                        no_backup=True,
+                        profile=profile,
+                        jobs=max(1, args.jobs),
+                        compare=args.compare,
+                        link=args.link,
+                        atomic=args.atomic,
+                        store=store,
+                    )
+                else:
+                    plan = deploy_changes(
+                        root,
+                        batch | compiled_outputs.paths(),
+                        profile=profile,
+                        jobs=max(1, args.jobs),
+                        compare=args.compare,
+                        atomic=args.atomic,
+                        store=store,
+                    )
+
+                if post_hook or has_hooks:
+                    run_hook("post-deploy", post_hook, root, context=hook_ctx)
+
+                counts = plan.counts
+                elapsed = (time.perf_counter() - start) * 1000
+                click.echo(
+                    f"[{datetime.now():%H:%M:%S}] 🔄 {counts['adds']} added, "
+                    f"{counts['updates']} updated, {counts['deletes']} deleted"
+                    + (f", {len(affected)} recompiled" if affected else "")
+                    + f" ({elapsed:.0f} ms)"
+                )
+        except KeyboardInterrupt:
+            click.echo("👋 Stopped watching.")
+        finally:
+            watcher.close()
+        return 0
+
+    def _print_plan(self, plan: SyncPlan, name: str) -> None:
+        """Print a human readable deploy plan."""
+        click.echo(click.style(f"📋 Deploy plan for '{name}' → {plan.dst}", bold=True))
+        for action in plan.adds:
+            size = format_bytes(action.size)
+            click.echo(click.style(f"   + {action.path} ({size})", fg="green"))
+        for action in plan.updates:
+            size = format_bytes(action.size)
+            click.echo(click.style(f"   ~ {action.path} ({size})", fg="yellow"))
+        for rel in sorted(plan.deletes + plan.delete_trees):
+            click.echo(click.style(f"   - {rel}", fg="red"))
+
+        counts = plan.counts
+        summary = (
+            f"📊 {counts['adds']} added, {counts['updates']} updated, "
+            f"{counts['deletes']} deleted, {counts['unchanged']} unchanged"
+        )
+        if plan.link is None:
+            summary += f" ({format_bytes(plan.bytes)} to copy)"
+        click.echo(summary)
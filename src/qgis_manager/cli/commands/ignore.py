@@ -0,0 +1,139 @@
+"""Ignore command implementation."""
+
+import argparse
+import time
+from pathlib import Path
+
+import click
+
+from ...discovery import find_project_root, walk_project
+from ...ignore import IgnoreMatcher, ProfilingIgnoreMatcher
+from ..base import BaseCommand
+
+
+class IgnoreCommand(BaseCommand):
+    """Command to explain and profile the ignore rules of a project."""
+
+    @property
+    def name(self) -> str:
+        return "ignore"
+
+    @property
+    def help(self) -> str:
+        return "Explain and profile ignore rules"
+
+    def configure_parser(self, parser: argparse.ArgumentParser) -> None:
+        subparsers = parser.add_subparsers(dest="subcommand", help="Ignore subcommand")
+
+        # Explain
+        explain_parser = subparsers.add_parser(
+            "explain", help="Show which rule includes or excludes a path"
+        )
+        explain_parser.add_argument(
+            "targets",
+            nargs="+",
+            help="Paths to explain (the project is found from each path)",
+        )
+        explain_parser.add_argument(
+            "--dev", action="store_true", help="Evaluate as a development build"
+        )
+
+        # Stats
+        stats_parser = subparsers.add_parser(
+            "stats", help="Scan the project and report hits and time per pattern"
+        )
+        self.add_common_args(stats_parser, include_profile=False)
+        stats_parser.add_argument(
+            "--dev", action="store_true", help="Evaluate as a development build"
+        )
+        stats_parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of patterns to show, most expensive first (default: 20)",
+        )
+
+    def execute(self, args: argparse.Namespace) -> int:
+        try:
+            if args.subcommand == "explain":
+                return self._ignore_explain(args.targets, args.dev)
+            elif args.subcommand == "stats":
+                root = find_project_root(Path(args.path))
+                return self._ignore_stats(root, args.dev, args.top)
+            else:
+                # If no subcommand, show help
+                click.echo(
+                    click.style(
+                        "❌ No subcommand specified. Use --help for usage.", fg="red"
+                    )
+                )
+                return 1
+
+        except Exception as e:
+            click.echo(click.style(f"❌ Error: {e}", fg="red"), err=True)
+            return 1
+
+    def _ignore_explain(self, targets: list[str], include_dev: bool) -> int:
+        """Print the deciding rule for each target path."""
+        matchers: dict[Path, IgnoreMatcher] = {}
+
+        for target in targets:
+            path = Path(target).absolute()
+            root = find_project_root(path if path.is_dir() else path.parent)
+            if root not in matchers:
+                matchers[root] = IgnoreMatcher(root, include_dev=include_dev)
+            matcher = matchers[root]
+            rel = path.resolve().relative_to(root).as_posix()
+            path = root / rel
+
+            decision = matcher.explain(path)
+            if decision.excluded:
+                click.echo(click.style(f"❌ excluded  {rel}", fg="red"))
+            else:
+                click.echo(click.style(f"✅ included  {rel}", fg="green"))
+
+            if decision.pattern is not None:
+                verb = "matched" if decision.excluded else "re-included"
+                via = ""
+                if decision.matched_path != rel:
+                    via = f" via '{decision.matched_path}'"
+                click.echo(
+                    f"   ↳ {verb} by '{decision.pattern}' ({decision.source}){via}"
+                )
+
+        return 0
+
+    def _ignore_stats(self, root: Path, include_dev: bool, top: int) -> int:
+        """Run a full scan with a profiling matcher and print per-pattern cost."""
+        matcher = ProfilingIgnoreMatcher(root, include_dev=include_dev)
+
+        start = time.perf_counter()
+        kept = sum(1 for _ in walk_project(root, matcher, include_dirs=True))
+        elapsed = time.perf_counter() - start
+
+        click.echo(
+            click.style(
+                f"📊 Scanned {matcher.evaluated} entries in {elapsed * 1000:.1f} ms "
+                f"({kept} kept, {matcher.excluded} excluded)",
+                bold=True,
+            )
+        )
+        click.echo(f"   Compiled matcher time: {matcher.matcher_seconds * 1000:.2f} ms")
+
+        ranked = sorted(matcher.stats.values(), key=lambda s: s.seconds, reverse=True)
+        if top > 0:
+            ranked = ranked[:top]
+
+        width = max([len("Pattern")] + [len(s.pattern) for s in ranked])
+        src_width = max([len("Source")] + [len(s.source) for s in ranked])
+        click.echo(
+            f"\n  {'Pattern':<{width}}  {'Source':<{src_width}}  "
+            f"{'Hits':>7}  {'Time (ms)':>10}"
+        )
+        for stats in ranked:
+            click.echo(
+                f"  {stats.pattern:<{width}}  {stats.source:<{src_width}}  "
+                f"{stats.hits:>7}  {stats.seconds * 1000:>10.3f}"
+            )
+
+        return 0
@@ -5,9 +5,11 @@ from pathlib import Path
 
 import click
 
+from ...config import load_config, load_project_config
 from ...core import create_plugin_package
 from ...dependencies import install_external_libs
 from ...discovery import find_project_root
+from ...packaging import CHECKSUM_ALGORITHMS, PackageCache, ZipReport
 from ..base import BaseCommand
 
 
@@ -28,6 +30,37 @@ class PackageCommand(BaseCommand):
         parser.add_argument(
             "--dev", action="store_true", help="Include development files in package"
         )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=None,
+            help="Number of files compressed concurrently (default: number of CPUs)",
+        )
+        parser.add_argument(
+            "--deterministic",
+            action="store_true",
+            help="Build a reproducible ZIP (sorted entries, fixed timestamps "
+            "and permissions, honours SOURCE_DATE_EPOCH)",
+        )
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="Reuse the cached package when the inputs did not change",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Copy the entries of unchanged files from the previous package "
+            "instead of compressing them again",
+        )
+        parser.add_argument(
+            "--checksum",
+            action="append",
+            default=[],
+            choices=CHECKSUM_ALGORITHMS,
+            help="Also write this digest of the ZIP besides SHA256 (repeatable)",
+        )
         parser.add_argument(
             "--repo-check",
             action="store_true",
@@ -89,6 +122,9 @@ class PackageCommand(BaseCommand):
             # Auto-install deps if any are defined
             install_external_libs(root)
 
+            settings = load_project_config(root, load_config())
+            reports: list[ZipReport] = []
+
             with click.progressbar(
                 length=100,
                 label="📦 Packaging files",
@@ -109,8 +145,20 @@ class PackageCommand(BaseCommand):
                     output_dir=Path(args.output) if args.output else None,
                     include_dev=args.dev,
                     callback=update_bar,
+                    jobs=args.jobs,
+                    deterministic=args.deterministic,
+                    cache=PackageCache() if args.cache else None,
+                    checksums=args.checksum,
+                    policy=settings.compression_policy(),
+                    on_report=reports.append,
+                    incremental=args.incremental,
                 )
 
+            for report in reports:
+                click.echo("🗜️ Compression by file class:")
+                for line in report.summary():
+                    click.echo(f"   {line}")
+
             click.echo(click.style(f"✅ Package created: {zip_path}", fg="green"))
             return 0
         except Exception as e:
@@ -0,0 +1,102 @@
+"""Restore command implementation."""
+
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from ...backups import (
+    ARCHIVE_COMPRESSIONS,
+    backup_timestamp,
+    find_backup,
+    get_archive_dir,
+    list_backups,
+    restore_backup,
+)
+from ...config import load_config, load_project_config
+from ...core import get_qgis_plugin_dir, rotate_backups
+from ...discovery import find_project_root, get_plugin_metadata
+from ...sync import format_bytes
+from ..base import BaseCommand
+
+
+class RestoreCommand(BaseCommand):
+    """Command to restore the plugin from a backup archive."""
+
+    @property
+    def name(self) -> str:
+        return "restore"
+
+    @property
+    def help(self) -> str:
+        return "Restore the plugin from a backup archive (see 'deploy --archive')"
+
+    def configure_parser(self, parser: argparse.ArgumentParser) -> None:
+        self.add_common_args(parser)
+        parser.add_argument(
+            "--from",
+            dest="source",
+            metavar="ARCHIVE",
+            help="Archive file or backup timestamp to restore (default: newest)",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the available backup archives",
+        )
+        parser.add_argument(
+            "--no-backup",
+            action="store_true",
+            help="Do not archive the installed version before replacing it",
+        )
+        parser.add_argument(
+            "--archive",
+            choices=ARCHIVE_COMPRESSIONS,
+            default="gz",
+            help="Compression of the archive of the replaced version (default: gz)",
+        )
+
+    def execute(self, args: argparse.Namespace) -> int:
+        try:
+            root = find_project_root(Path(args.path))
+            settings = load_project_config(root, load_config())
+            slug = get_plugin_metadata(root)["slug"]
+            profile = args.profile or settings.profile
+            archive_dir = get_archive_dir(profile)
+
+            if args.list:
+                archives = list_backups(archive_dir, slug)
+                if not archives:
+                    click.echo(f"No backup archives for '{slug}' in {archive_dir}")
+                for archive in archives:
+                    timestamp = backup_timestamp(archive)
+                    taken = datetime.strptime(timestamp[:14], "%Y%m%d%H%M%S")
+                    click.echo(
+                        f"  {timestamp}  {taken:%Y-%m-%d %H:%M:%S}  "
+                        f"{format_bytes(archive.stat().st_size):>10}  {archive.name}"
+                    )
+                return 0
+
+            if args.source and Path(args.source).is_file():
+                archive = Path(args.source)
+            else:
+                archive = find_backup(archive_dir, slug, args.source, archive=True)
+
+            target_path = get_qgis_plugin_dir(profile) / slug
+            click.echo(f"⏪ Restoring {archive.name} to {target_path}")
+            previous = restore_backup(
+                archive,
+                target_path,
+                archive_dir=None if args.no_backup else archive_dir,
+                compression=args.archive,
+            )
+            if previous is not None:
+                click.echo(f"📦 Replaced version archived as {previous.name}")
+                rotate_backups(archive_dir, slug, 0, policy=settings.retention_policy())
+
+            click.echo(click.style("✨ Restore complete!", fg="green", bold=True))
+            return 0
+        except Exception as e:
+            click.echo(click.style(f"❌ Error: {e}", fg="red", bold=True), err=True)
+            return 1
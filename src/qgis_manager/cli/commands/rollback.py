@@ -0,0 +1,75 @@
+"""Rollback command implementation."""
+
+import argparse
+import time
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from ...backups import backup_timestamp, list_backups, rollback
+from ...config import load_config, load_project_config
+from ...core import get_qgis_plugin_dir
+from ...discovery import find_project_root, get_plugin_metadata
+from ..base import BaseCommand
+
+
+class RollbackCommand(BaseCommand):
+    """Command to reinstate a previous deploy from its backup directory."""
+
+    @property
+    def name(self) -> str:
+        return "rollback"
+
+    @property
+    def help(self) -> str:
+        return "Swap a backup back in place of the deployed plugin (no copy)"
+
+    def configure_parser(self, parser: argparse.ArgumentParser) -> None:
+        self.add_common_args(parser)
+        parser.add_argument(
+            "--to",
+            metavar="TIMESTAMP",
+            help="Backup to reinstate (default: the newest)",
+        )
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the available backup generations",
+        )
+
+    def execute(self, args: argparse.Namespace) -> int:
+        try:
+            root = find_project_root(Path(args.path))
+            settings = load_project_config(root, load_config())
+            slug = get_plugin_metadata(root)["slug"]
+            profile = args.profile or settings.profile
+            target_path = get_qgis_plugin_dir(profile) / slug
+
+            if args.list:
+                backups = [
+                    b for b in list_backups(target_path.parent, slug) if b.is_dir()
+                ]
+                if not backups:
+                    click.echo(f"No backups for '{slug}' in {target_path.parent}")
+                for backup in backups:
+                    timestamp = backup_timestamp(backup)
+                    try:
+                        taken = datetime.strptime(timestamp[:14], "%Y%m%d%H%M%S")
+                        click.echo(f"  {timestamp}  {taken:%Y-%m-%d %H:%M:%S}")
+                    except ValueError:
+                        click.echo(f"  {timestamp}")
+                return 0
+
+            start = time.perf_counter()
+            backup, replaced = rollback(target_path, args.to)
+            elapsed = (time.perf_counter() - start) * 1000
+            click.echo(f"⏪ Rolled back '{slug}' to {backup.name} ({elapsed:.0f} ms)")
+            if replaced is not None:
+                click.echo(f"📦 Previous deploy kept as {replaced.name}")
+
+            click.echo(click.style("✨ Rollback complete!", fg="green", bold=True))
+            return 0
+        except Exception as e:
+            click.echo(click.style(f"❌ Error: {e}", fg="red", bold=True), err=True)
+            return 1
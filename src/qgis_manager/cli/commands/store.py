@@ -0,0 +1,56 @@
+"""Store command implementation."""
+
+import argparse
+
+import click
+
+from ...store import ObjectStore
+from ...sync import format_bytes
+from ..base import BaseCommand
+
+
+class StoreCommand(BaseCommand):
+    """Command to inspect and garbage collect the object store."""
+
+    @property
+    def name(self) -> str:
+        return "store"
+
+    @property
+    def help(self) -> str:
+        return "Inspect and clean the content-addressed object store"
+
+    def configure_parser(self, parser: argparse.ArgumentParser) -> None:
+        subparsers = parser.add_subparsers(dest="subcommand", help="Store subcommand")
+        subparsers.add_parser("stats", help="Show the size of the store")
+        subparsers.add_parser(
+            "gc", help="Remove the blobs no backup or deploy references anymore"
+        )
+
+    def execute(self, args: argparse.Namespace) -> int:
+        try:
+            store = ObjectStore()
+            if args.subcommand == "stats":
+                stats = store.stats()
+                click.echo(f"📦 Object store: {store.root}")
+                click.echo(f"  {stats.blobs} blobs, {format_bytes(stats.bytes)}")
+                click.echo(
+                    f"  {stats.unreferenced} unreferenced, "
+                    f"{format_bytes(stats.unreferenced_bytes)} reclaimable"
+                )
+                return 0
+            elif args.subcommand == "gc":
+                removed, freed = store.gc()
+                click.echo(f"🧹 Removed {removed} blobs, freed {format_bytes(freed)}")
+                return 0
+            else:
+                click.echo(
+                    click.style(
+                        "❌ No subcommand specified. Use --help for usage.", fg="red"
+                    )
+                )
+                return 1
+
+        except Exception as e:
+            click.echo(click.style(f"❌ Error: {e}", fg="red"), err=True)
+            return 1
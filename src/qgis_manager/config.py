@@ -7,6 +7,9 @@ if sys.version_info >= (3, 11):
 else:
     import tomli as tomllib
 
+from .backups import RetentionPolicy, parse_size
+from .packaging import CompressionPolicy
+
 
 @dataclass
 class Settings:
@@ -15,8 +18,33 @@ class Settings:
     profile: str = "default"
     backup: bool = True
     max_backups: int = 3
+    keep_daily: int = 0
+    keep_weekly: int = 0
+    backup_budget: int | str | None = None
     auto_compile: bool = True
     hooks: dict[str, str] = field(default_factory=dict)
+    compression: dict[str, str | int] = field(default_factory=dict)
+    compression_level: int = 6
+    compression_auto: bool = True
+
+    def retention_policy(self) -> RetentionPolicy:
+        """Return the backup retention policy described by the settings."""
+        return RetentionPolicy(
+            keep_last=max(self.max_backups, 0),
+            keep_daily=self.keep_daily,
+            keep_weekly=self.keep_weekly,
+            max_bytes=(
+                parse_size(self.backup_budget)
+                if self.backup_budget is not None
+                else None
+            ),
+        )
+
+    def compression_policy(self) -> CompressionPolicy:
+        """Return the package compression policy described by the settings."""
+        return CompressionPolicy(
+            self.compression, level=self.compression_level, auto=self.compression_auto
+        )
 
 
 def load_config() -> Settings:
@@ -33,6 +61,11 @@ def load_config() -> Settings:
                 settings.profile = defaults.get("profile", settings.profile)
                 settings.backup = defaults.get("backup", settings.backup)
                 settings.max_backups = defaults.get("max_backups", settings.max_backups)
+                settings.keep_daily = defaults.get("keep_daily", settings.keep_daily)
+                settings.keep_weekly = defaults.get("keep_weekly", settings.keep_weekly)
+                settings.backup_budget = defaults.get(
+                    "backup_budget", settings.backup_budget
+                )
                 settings.auto_compile = defaults.get(
                     "auto_compile", settings.auto_compile
                 )
@@ -63,10 +96,28 @@ def load_project_config(project_root: Path, base_settings: Settings) -> Settings
                 base_settings.max_backups = tool_config.get(
                     "max_backups", base_settings.max_backups
                 )
+                base_settings.keep_daily = tool_config.get(
+                    "keep_daily", base_settings.keep_daily
+                )
+                base_settings.keep_weekly = tool_config.get(
+                    "keep_weekly", base_settings.keep_weekly
+                )
+                base_settings.backup_budget = tool_config.get(
+                    "backup_budget", base_settings.backup_budget
+                )
                 base_settings.auto_compile = tool_config.get(
                     "auto_compile", base_settings.auto_compile
                 )
                 base_settings.hooks = tool_config.get("hooks", base_settings.hooks)
+                base_settings.compression = tool_config.get(
+                    "compression", base_settings.compression
+                )
+                base_settings.compression_level = tool_config.get(
+                    "compression_level", base_settings.compression_level
+                )
+                base_settings.compression_auto = tool_config.get(
+                    "compression_auto", base_settings.compression_auto
+                )
 
         except Exception:
             pass
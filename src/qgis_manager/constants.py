@@ -63,3 +63,16 @@ DEV_DIRECTORIES = {
     "research",
     ".github",
 }
+
+# Directories that never contain project sources or build artifacts worth
+# touching. Maintenance scans (e.g. clean) do not descend into them.
+UNSCANNED_DIRECTORIES = {
+    ".git",
+    ".venv",
+    "venv",
+    "env",
+    ".mypy_cache",
+}
+
+# Name of the manifest written into each deployed plugin directory
+MANIFEST_FILENAME = ".qgis-manage-manifest.json"
@@ -0,0 +1,159 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Copy backends.
+
+Files are copied with the cheapest mechanism the filesystems support:
+
+1. ``reflink``: clone the extents with the ``FICLONE`` ioctl (Btrfs, XFS).
+   No data is copied at all.
+2. ``copy_file_range``: the kernel copies the data without it passing through
+   user space (ext4, NFS 4.2, and reflink-capable filesystems).
+3. ``copyfile``: :func:`shutil.copyfile`, which still uses ``sendfile`` on
+   Linux.
+
+Support is probed once per (source device, destination device) pair: a
+backend that fails with an "unsupported" error is disabled for that pair and
+the next one is tried.
+"""
+
+import errno
+import logging
+import os
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# From linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+COPY_BACKENDS = ("reflink", "copy_file_range", "copyfile")
+
+# Errors meaning "this backend does not work here", as opposed to real I/O errors
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+}
+
+_backends: dict[tuple[int, int], list[str]] = {}
+_lock = threading.Lock()
+
+
+def _platform_backends() -> list[str]:
+    backends = []
+    if sys.platform.startswith("linux"):
+        backends.append("reflink")
+    if hasattr(os, "copy_file_range"):
+        backends.append("copy_file_range")
+    backends.append("copyfile")
+    return backends
+
+
+def _reflink(src_fd: int, dst_fd: int, size: int) -> None:
+    import fcntl
+
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> None:
+    remaining = size
+    while remaining > 0:
+        copied = os.copy_file_range(src_fd, dst_fd, remaining)
+        if copied == 0:
+            break
+        remaining -= copied
+    done = size - remaining
+    # Some filesystems (procfs-like, some FUSE and network ones) return 0
+    # without copying anything: let the next backend copy the file
+    if remaining and (done == 0 or os.fstat(src_fd).st_size > done):
+        raise OSError(errno.EOPNOTSUPP, f"copy_file_range stopped at {done} bytes")
+
+
+_FD_BACKENDS = {"reflink": _reflink, "copy_file_range": _copy_file_range}
+
+
+def get_copy_backends(src: str | Path, dst: str | Path) -> list[str]:
+    """Return the backends still enabled for copying ``src`` into ``dst``.
+
+    Args:
+        src: Source file.
+        dst: Destination file (its parent directory must exist).
+
+    Returns:
+        Backend names, fastest first.
+    """
+    key = (
+        os.stat(src).st_dev,
+        os.stat(os.path.dirname(os.path.abspath(dst))).st_dev,
+    )
+    with _lock:
+        backends = _backends.get(key)
+        if backends is None:
+            backends = _backends[key] = _platform_backends()
+        return list(backends)
+
+
+def _disable_backend(src: str | Path, dst: str | Path, backend: str) -> None:
+    key = (
+        os.stat(src).st_dev,
+        os.stat(os.path.dirname(os.path.abspath(dst))).st_dev,
+    )
+    with _lock:
+        backends = _backends.get(key, [])
+        if backend in backends:
+            backends.remove(backend)
+            logger.debug(f"Copy backend '{backend}' unsupported for devices {key}")
+
+
+def copy_file(src: str | Path, dst: str | Path) -> str | Path:
+    """Copy a file with data and metadata, like :func:`shutil.copy2`.
+
+    Usable as ``copy_function`` for :func:`shutil.copytree`.
+
+    Args:
+        src: Source file.
+        dst: Destination file path.
+
+    Returns:
+        The destination path.
+    """
+    for backend in get_copy_backends(src, dst):
+        if backend == "copyfile":
+            shutil.copyfile(src, dst)
+            break
+
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                _FD_BACKENDS[backend](fsrc.fileno(), fdst.fileno(), size)
+            break
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+            _disable_backend(src, dst, backend)
+
+    shutil.copystat(src, dst)
+    return dst
@@ -34,116 +34,156 @@ Functions:
     init_plugin_project: Scaffolding for a new QGIS plugin project
 """
 
+import fnmatch
 import logging
 import os
+import re
 import shutil
+import stat
 import subprocess
 import sys
-import zipfile
-from collections.abc import Callable
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Collection, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from .discovery import get_plugin_metadata, get_source_files
+from .backups import (
+    RetentionPolicy,
+    archive_backup,
+    create_backup,
+    get_archive_dir,
+    owned_size,
+    prune_backups,
+    register_backup,
+    unique_backup_path,
+)
+from .constants import UNSCANNED_DIRECTORIES
+from .discovery import find_project_files, get_plugin_metadata, walk_project
 from .ignore import IgnoreMatcher
+from .manifest import DeployManifest
+from .packaging import (
+    CompressionPolicy,
+    PackageCache,
+    ZipEntry,
+    ZipReport,
+    write_zip,
+)
+from .pipeline import PipelineReport, Stage, run_pipeline
+from .store import ObjectStore
+from .sync import (  # noqa: F401
+    SourceIndex,
+    SyncPlan,
+    SyncProgress,
+    exchange_directories,
+    execute_sync_plan,
+    format_bytes,
+    plan_paths,
+    plan_sync,
+    scan_source,
+    stage_sync_plan,
+    sync_directory,
+)
 
 logger = logging.getLogger(__name__)
 
 
-def get_qgis_plugin_dir(profile: str = "default") -> Path:
-    """Detect the QGIS plugin directory based on the OS."""
+QGIS_PROFILE_TREES = ("QGIS3", "QGIS4")
+
+# Plugin versions as found in package names: 1.2.3, 2.0-beta, 1.0rc1...
+_VERSION_PATTERN = r"\d+(?:\.\d+)*(?:[-+_]?[A-Za-z0-9]+)*"
+
+
+def get_qgis_profiles_dir(qgis_dir: str = "QGIS3") -> Path:
+    """Detect the QGIS profiles directory based on the OS."""
     if sys.platform == "linux":
-        return (
-            Path.home() / f".local/share/QGIS/QGIS3/profiles/{profile}/python/plugins"
-        )
+        return Path.home() / f".local/share/QGIS/{qgis_dir}/profiles"
     elif sys.platform == "darwin":
-        return (
-            Path.home()
-            / "Library/Application Support/QGIS/QGIS3/profiles"
-            / profile
-            / "python/plugins"
-        )
+        return Path.home() / f"Library/Application Support/QGIS/{qgis_dir}/profiles"
     elif sys.platform == "win32":
-        return (
-            Path(os.environ["APPDATA"])
-            / f"QGIS/QGIS3/profiles/{profile}/python/plugins"
-        )
+        return Path(os.environ["APPDATA"]) / f"QGIS/{qgis_dir}/profiles"
     else:
         raise OSError(f"Unsupported platform: {sys.platform}")
 
 
-def rotate_backups(parent_dir: Path, slug: str, limit: int):
-    """Keep only the N most recent backups for a plugin."""
-    if limit <= 0:
-        return
+def get_qgis_plugin_dir(profile: str = "default") -> Path:
+    """Detect the QGIS plugin directory based on the OS.
 
-    # Find all backup directories for this slug
-    backups = []
-    for item in parent_dir.iterdir():
-        if item.is_dir() and item.name.startswith(f"{slug}.bak."):
-            backups.append(item)
+    Profiles of another profile tree are prefixed with it, e.g.
+    ``QGIS4/default``.
+    """
+    qgis_dir, _, name = profile.rpartition("/")
+    if qgis_dir not in QGIS_PROFILE_TREES:
+        qgis_dir, name = "QGIS3", profile
+    return get_qgis_profiles_dir(qgis_dir) / name / "python/plugins"
+
+
+def discover_qgis_profiles() -> list[str]:
+    """List the existing QGIS profiles, QGIS4 ones prefixed with ``QGIS4/``."""
+    profiles = []
+    for qgis_dir in QGIS_PROFILE_TREES:
+        profiles_dir = get_qgis_profiles_dir(qgis_dir)
+        if not profiles_dir.is_dir():
+            continue
+        for item in sorted(profiles_dir.iterdir()):
+            if item.is_dir():
+                prefix = "" if qgis_dir == "QGIS3" else f"{qgis_dir}/"
+                profiles.append(f"{prefix}{item.name}")
+    return profiles
 
-    # Sort by name (which contains timestamp) descending
-    backups.sort(key=lambda x: x.name, reverse=True)
 
-    # Remove those exceeding the limit
-    if len(backups) > limit:
-        cols = backups[limit:]
-        for old_bak in cols:
-            logger.debug(f"🧹 Removing old backup: {old_bak.name}")
-            shutil.rmtree(old_bak)
+def rotate_backups(
+    parent_dir: Path,
+    slug: str,
+    limit: int,
+    store: ObjectStore | None = None,
+    policy: RetentionPolicy | None = None,
+    background: bool = False,
+) -> threading.Thread | None:
+    """Prune the backups (directories or archives) of a plugin.
 
+    Keeps the ``limit`` most recent backups, or those selected by ``policy``
+    (see :func:`prune_backups`, which also describes ``store`` and
+    ``background``). Generations only share hardlinks, so any can be removed.
 
-def sync_directory(src: Path, dst: Path, matcher: IgnoreMatcher):
-    """Sync source to destination only copying changed files (rsync-like)."""
-    if not dst.exists():
-        dst.mkdir(parents=True)
+    Returns:
+        The thread deleting the pruned backups, if running in the background.
+    """
+    if policy is None:
+        policy = RetentionPolicy(keep_last=max(limit, 0))
+    return prune_backups(parent_dir, slug, policy, store, background)
 
-    # 1. Copy/Update files from source
-    for item in src.iterdir():
-        if matcher.should_exclude(item):
-            continue
 
-        # Safeguard: Do not copy the destination directory into itself
-        # This prevents infinite recursion if deploying into a subfolder of the project
+def deploy_matcher(project_root: Path, *target_paths: Path) -> IgnoreMatcher:
+    """Return the ignore matcher used to deploy a project into targets."""
+    # Load ignore patterns
+    matcher = IgnoreMatcher(project_root, include_dev=False)
+
+    # Automatically ignore the target_path if it's inside project_root
+    # to avoid infinite recursion
+    for target_path in target_paths:
         try:
-            is_same = item.resolve() == dst.resolve()
-            is_nested = dst.resolve().is_relative_to(item.resolve())
-            if is_same or is_nested:
-                continue
-        except Exception:
+            if target_path.resolve().is_relative_to(project_root.resolve()):
+                rel_target = target_path.resolve().relative_to(project_root.resolve())
+                matcher.patterns.append(str(rel_target))
+                matcher.patterns.append(f"/{rel_target}")
+        except (ValueError, Exception):
             pass
+    return matcher
 
-        dest_item = dst / item.name
-        if item.is_dir():
-            sync_directory(item, dest_item, matcher)
-        else:
-            # Check if we need to copy
-            if dest_item.exists():
-                src_stat = item.stat()
-                dst_stat = dest_item.stat()
-                # Skip if size and mtime match
-                if (
-                    src_stat.st_size == dst_stat.st_size
-                    and src_stat.st_mtime == dst_stat.st_mtime
-                ):
-                    continue
-
-            shutil.copy2(item, dest_item)
-            logger.debug(f"  ✅ {item.name} (updated)")
-
-    # 2. Cleanup files in destination that no longer exist in source
-    # Important: only cleanup items NOT ignored (otherwise we'd delete things like .git)
-    for item in dst.iterdir():
-        source_item = src / item.name
-        # If it doesn't exist in source AND is not ignored/dev file
-        if not source_item.exists() and not matcher.should_exclude(source_item):
-            if item.is_dir():
-                shutil.rmtree(item)
-            else:
-                item.unlink()
-            logger.debug(f"  🗑️ {item.name} (removed from target)")
+
+def _load_deploy_manifest(
+    project_root: Path, target_path: Path
+) -> DeployManifest | None:
+    """Load the manifest of a previous deploy of ``project_root``, if any."""
+    manifest = DeployManifest.load(target_path)
+    if manifest is not None and manifest.source != str(project_root.resolve()):
+        return None
+    return manifest
 
 
 def deploy_plugin(
@@ -153,9 +193,69 @@ def deploy_plugin(
     profile: str = "default",
     callback: Callable[[int], Any] | None = None,
     max_backups: int = 3,
-):
-    """Deploy the plugin to the QGIS directory."""
-    metadata = get_plugin_metadata(project_root)
+    use_manifest: bool = True,
+    jobs: int = 1,
+    compare: str = "mtime",
+    link: str | None = None,
+    dry_run: bool = False,
+    atomic: bool = False,
+    index: SourceIndex | None = None,
+    metadata: dict[str, str] | None = None,
+    incremental_backup: bool = True,
+    archive: str | None = None,
+    archive_dir: Path | None = None,
+    store: ObjectStore | None = None,
+    retention: RetentionPolicy | None = None,
+    compile_step: Callable[[], Any] | None = None,
+    on_report: Callable[[PipelineReport], Any] | None = None,
+    progress: Callable[[SyncProgress], Any] | None = None,
+) -> SyncPlan:
+    """Deploy the plugin to the QGIS directory.
+
+    When ``use_manifest`` is True and the target holds the manifest of a
+    previous deploy of the same project, only the source tree is scanned.
+    ``jobs`` sets the number of concurrent copy workers and ``compare`` the
+    change detection mode (see :func:`sync_directory`). ``link`` deploys a
+    symlink or hardlink farm instead of copies; a later deploy without it turns
+    the farm back into real copies, and backups always hold real copies.
+
+    The sync is planned before anything is written. With ``dry_run`` the plan
+    is returned without backing up or touching the target.
+
+    With ``atomic`` the new version is built in a sibling staging directory
+    (unchanged files are hardlinked from the current version) and swapped in
+    with a rename, so QGIS never sees a half-updated plugin. The previous tree
+    becomes the backup without copying it.
+
+    ``index`` (see :func:`scan_source`) and ``metadata`` let several deploys
+    of the same project share one source scan and metadata parse.
+
+    With ``incremental_backup`` the files unchanged since the previous backup
+    are hardlinked to it instead of copied (see :func:`create_backup`).
+    ``archive`` (a compression from ``ARCHIVE_COMPRESSIONS``) streams the old
+    tree into an archive in ``archive_dir`` (by default the profile's
+    directory from :func:`get_archive_dir`) instead of a sibling directory.
+    ``store`` makes directory backups and atomic staging reference the
+    contents of an :class:`ObjectStore` through hardlinks.
+
+    Backups are pruned with ``retention`` (by default the ``max_backups``
+    most recent are kept); old backups are deleted in a background thread
+    while the files are synced.
+
+    The deploy runs as a pipeline (see :func:`run_pipeline`): the backup of
+    the target runs alongside ``compile_step`` (compiling resources into the
+    source) and the source scan, and the sync starts once all are done.
+    ``on_report`` receives the stage timings and critical path; without it,
+    their summary is logged.
+
+    ``progress`` receives the :class:`SyncProgress` events of the sync (files
+    and bytes planned, copied, skipped and deleted), from the worker threads.
+
+    Returns:
+        The sync plan that was (or, with ``dry_run``, would be) applied.
+    """
+    if metadata is None:
+        metadata = get_plugin_metadata(project_root)
     slug = metadata["slug"]
 
     if dest_dir is None:
@@ -163,39 +263,378 @@ def deploy_plugin(
 
     target_path = dest_dir / slug
 
-    # Pre-deployment backup
-    if target_path.exists() and not no_backup:
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        backup_path = target_path.parent / f"{slug}.bak.{timestamp}"
-        logger.info(f"📦 Creating backup at: {backup_path.name}")
-        shutil.copytree(target_path, backup_path)
+    if index is not None:
+        matcher = index.matcher
+    else:
+        matcher = deploy_matcher(project_root, target_path)
+
+    def scan(_: dict[str, Any]) -> SyncPlan:
+        manifest = _load_deploy_manifest(project_root, target_path)
+        # A link farm is always diffed against its manifest so links get replaced
+        if manifest is not None and not use_manifest and manifest.link is None:
+            manifest = None
+        if manifest is not None and manifest.link not in (None, link):
+            logger.info(f"🔗 Replacing {manifest.link} farm with {link or 'copies'}")
+
+        return plan_sync(
+            project_root,
+            target_path,
+            matcher,
+            manifest=manifest,
+            compare=compare,
+            link=link,
+            index=index,
+        )
 
-        # Rotate backups
-        rotate_backups(target_path.parent, slug, max_backups)
+    if dry_run:
+        return scan({})
+
+    if atomic and link is not None:
+        raise ValueError("Atomic deploys cannot be combined with link farms")
+    if retention is None:
+        retention = RetentionPolicy(keep_last=max(max_backups, 0))
+    if archive is not None and archive_dir is None:
+        archive_dir = get_archive_dir(profile)
+
+    def backup(_: dict[str, Any]) -> threading.Thread | None:
+        return backup_plugin(
+            target_path,
+            incremental=incremental_backup,
+            archive=archive,
+            archive_dir=archive_dir,
+            store=store,
+            retention=retention,
+            background=True,
+        )
 
-    # Deployment using smart sync
-    target_path.mkdir(parents=True, exist_ok=True)
+    def sync(results: dict[str, Any]) -> None:
+        plan = results["scan"]
+        if atomic:
+            _atomic_deploy(
+                plan,
+                slug,
+                no_backup,
+                retention,
+                jobs,
+                archive,
+                archive_dir,
+                store,
+                progress,
+            )
+            return
+
+        # Deployment using smart sync
+        target_path.mkdir(parents=True, exist_ok=True)
+        logger.info(f"🚀 Syncing files to {target_path}")
+        result = execute_sync_plan(plan, jobs=jobs, progress=progress)
+        result.save(target_path)
+        if store is not None:
+            store.save()
+
+    # The backup only reads the target and the compilation only writes the
+    # source, so they overlap; the scan must see the compiled files
+    stages = []
+    if compile_step is not None:
+        stages.append(Stage("compile", lambda _: compile_step()))
+    stages.append(Stage("scan", scan, ("compile",) if compile_step else ()))
+    # Atomic deploys turn the previous version into the backup when swapping
+    if target_path.exists() and not no_backup and not atomic:
+        stages.append(Stage("backup", backup))
+    stages.append(Stage("sync", sync, tuple(s.name for s in stages)))
+
+    report = run_pipeline(stages)
+    pruning = report.results.get("backup")
+    if pruning is not None:
+        pruning.join()
+    if on_report is not None:
+        on_report(report)
+    else:
+        logger.info(report.summary())
 
-    # Load ignore patterns
-    matcher = IgnoreMatcher(project_root, include_dev=False)
+    if callback:
+        callback(100)  # Simple completion signal
 
-    # Automatically ignore the target_path if it's inside project_root
-    # to avoid infinite recursion
+    logger.info("✨ Deployment complete.")
+    plan: SyncPlan = report.results["scan"]
+    return plan
+
+
+def backup_plugin(
+    target_path: Path,
+    incremental: bool = True,
+    archive: str | None = None,
+    archive_dir: Path | None = None,
+    store: ObjectStore | None = None,
+    retention: RetentionPolicy | None = None,
+    background: bool = False,
+) -> threading.Thread | None:
+    """Back up an installed plugin, then prune its old backups.
+
+    Args:
+        target_path: Installed plugin directory.
+        incremental: Hardlink the files unchanged since the previous backup
+            (see :func:`create_backup`).
+        archive: Compression of a backup archive written to ``archive_dir``,
+            instead of a backup directory next to the plugin.
+        archive_dir: Directory receiving the archive.
+        store: Object store backing up directory backups.
+        retention: Backups to keep (default: the 3 most recent).
+        background: Delete the pruned backups in a background thread.
+
+    Returns:
+        The thread deleting the pruned backups, if any.
+    """
+    slug = target_path.name
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    if retention is None:
+        retention = RetentionPolicy()
+
+    if archive is not None:
+        if archive_dir is None:
+            raise ValueError("An archive directory is required to archive backups")
+        archive_path = archive_backup(
+            target_path, archive_dir, slug, timestamp, archive
+        )
+        logger.info(f"📦 Backup archived to: {archive_path}")
+        return rotate_backups(
+            archive_dir, slug, 0, policy=retention, background=background
+        )
+
+    backup_path = target_path.parent / f"{slug}.bak.{timestamp}"
+    logger.info(f"📦 Creating backup at: {backup_path.name}")
+    stats = create_backup(target_path, backup_path, incremental, store)
+    if stats.previous is not None or store is not None:
+        logger.info(
+            f"📦 {stats.linked} files linked, "
+            f"{stats.copied} copied ({format_bytes(stats.bytes_copied)})"
+        )
+    return rotate_backups(
+        target_path.parent, slug, 0, store, policy=retention, background=background
+    )
+
+
+@dataclass
+class ProfileDeploy:
+    """Outcome of deploying to one profile in a fan-out deploy.
+
+    Attributes:
+        profile: Profile name.
+        target: Deployed plugin directory.
+        plan: Applied sync plan, None on failure.
+        error: Exception raised by the deploy, if any.
+        seconds: Duration of the deploy.
+    """
+
+    profile: str
+    target: Path
+    plan: SyncPlan | None = None
+    error: Exception | None = None
+    seconds: float = 0.0
+
+
+def deploy_to_profiles(
+    project_root: Path, profiles: Sequence[str], **options: Any
+) -> list[ProfileDeploy]:
+    """Deploy the plugin to several QGIS profiles concurrently.
+
+    The metadata, ignore rules and source tree are read once and shared by
+    all targets, which are then planned and synced in parallel. Profiles
+    resolving to the same plugins directory are deployed once, and share the
+    result. A failing profile does not stop the others.
+
+    Args:
+        project_root: Project root.
+        profiles: Profile names (see :func:`get_qgis_plugin_dir`).
+        **options: Extra :func:`deploy_plugin` arguments (``no_backup``,
+            ``jobs``, ``atomic``...).
+
+    Returns:
+        One result per profile, in the given order.
+    """
+    metadata = get_plugin_metadata(project_root)
+    slug = metadata["slug"]
+    plugin_dirs = {profile: get_qgis_plugin_dir(profile) for profile in profiles}
+    targets = [plugin_dir / slug for plugin_dir in plugin_dirs.values()]
+
+    start = time.perf_counter()
+    matcher = deploy_matcher(project_root, *targets)
+    index = scan_source(project_root, matcher, exclude=targets)
+    logger.info(
+        f"🔎 Scanned {len(index.files)} files once for {len(profiles)} profiles "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+
+    # One deploy per plugins directory: two threads syncing the same target
+    # would race on its files, manifest and backups
+    first: dict[Path, str] = {}
+    for profile in profiles:
+        first.setdefault(plugin_dirs[profile].resolve(), profile)
+
+    def deploy_one(profile: str) -> ProfileDeploy:
+        outcome = ProfileDeploy(profile, plugin_dirs[profile] / slug)
+        start = time.perf_counter()
+        try:
+            outcome.plan = deploy_plugin(
+                project_root,
+                dest_dir=plugin_dirs[profile],
+                profile=profile,
+                index=index,
+                metadata=metadata,
+                **options,
+            )
+        except Exception as e:
+            logger.error(f"  ❌ {profile}: {e}")
+            outcome.error = e
+        outcome.seconds = time.perf_counter() - start
+        return outcome
+
+    with ThreadPoolExecutor(max_workers=max(1, len(first))) as pool:
+        outcomes = {o.profile: o for o in pool.map(deploy_one, first.values())}
+    results = []
+    for profile in profiles:
+        outcome = outcomes[first[plugin_dirs[profile].resolve()]]
+        if outcome.profile != profile:
+            outcome = replace(outcome, profile=profile)
+        results.append(outcome)
+    return results
+
+
+def _atomic_deploy(
+    plan: SyncPlan,
+    slug: str,
+    no_backup: bool,
+    retention: RetentionPolicy,
+    jobs: int,
+    archive: str | None = None,
+    archive_dir: Path | None = None,
+    store: ObjectStore | None = None,
+    progress: Callable[[SyncProgress], Any] | None = None,
+) -> None:
+    """Stage a sync plan next to its target and swap it in."""
+    target_path = plan.dst
+    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    parent_dir = target_path.parent
+    parent_dir.mkdir(parents=True, exist_ok=True)
+
+    # Left behind by an interrupted deploy; QGIS would scan them at startup
+    for stale in parent_dir.iterdir():
+        if stale.name.startswith(f".{slug}.staging."):
+            logger.debug(f"🧹 Removing stale staging directory {stale.name}")
+            shutil.rmtree(stale, ignore_errors=True)
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{slug}.staging.", dir=parent_dir))
+    # mkdtemp creates a private directory: give it the plugin's permissions
+    mode_source = target_path if target_path.exists() else parent_dir
+    os.chmod(staging, stat.S_IMODE(mode_source.stat().st_mode))
+
+    logger.info(f"🚀 Staging files in {staging.name}")
     try:
-        if target_path.resolve().is_relative_to(project_root.resolve()):
-            rel_target = target_path.resolve().relative_to(project_root.resolve())
-            matcher.patterns.append(str(rel_target))
-            matcher.patterns.append(f"/{rel_target}")
-    except (ValueError, Exception):
-        pass
+        result = stage_sync_plan(
+            plan, staging, jobs=jobs, store=store, progress=progress
+        )
+        result.save(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    if store is not None:
+        store.save()
+
+    if not target_path.exists():
+        staging.rename(target_path)
+        return
 
-    logger.info(f"🚀 Syncing files to {target_path}")
-    sync_directory(project_root, target_path, matcher)
+    # Named before the swap, so nothing can fail between the swap and the rename
+    backup_path = unique_backup_path(target_path.parent, slug, timestamp)
 
-    if callback:
-        callback(100)  # Simple completion signal
+    # staging holds the previous version after the swap
+    exchange_directories(target_path, staging)
+    logger.info(f"🔀 Swapped in the new version of {slug}")
+    if no_backup:
+        shutil.rmtree(staging)
+        return
 
-    logger.info("✨ Deployment complete.")
+    if archive is not None and archive_dir is not None:
+        try:
+            archive_path = archive_backup(
+                staging, archive_dir, slug, timestamp, archive
+            )
+        except BaseException:
+            # Kept as a directory backup: stale staging directories are removed
+            staging.rename(backup_path)
+            register_backup(backup_path, owned_size(backup_path))
+            raise
+        shutil.rmtree(staging)
+        logger.info(f"📦 Previous version archived to: {archive_path}")
+        rotate_backups(archive_dir, slug, 0, policy=retention)
+        return
+
+    staging.rename(backup_path)
+    register_backup(backup_path, owned_size(backup_path))
+    logger.info(f"📦 Previous version kept as backup: {backup_path.name}")
+    rotate_backups(target_path.parent, slug, 0, store, policy=retention)
+
+
+def deploy_changes(
+    project_root: Path,
+    paths: Collection[str],
+    dest_dir: Path | None = None,
+    profile: str = "default",
+    jobs: int = 1,
+    compare: str = "mtime",
+    atomic: bool = False,
+    store: ObjectStore | None = None,
+) -> SyncPlan:
+    """Sync only the given changed paths into an existing deploy.
+
+    Used by ``deploy --watch``: the source is not rescanned, the changes are
+    applied on top of the manifest of the previous deploy. Without a usable
+    manifest, a full deploy (without backup) is done instead.
+
+    Args:
+        project_root: Project root.
+        paths: Changed POSIX paths relative to ``project_root``.
+        dest_dir: QGIS plugins directory (defaults to the profile's).
+        profile: QGIS profile name.
+        jobs: Number of concurrent copy workers.
+        compare: Change detection mode (see :func:`sync_directory`).
+        atomic: Stage the updated plugin and swap it in, as in
+            :func:`deploy_plugin`; the previous version is not kept.
+        store: Object store the atomic staging links changed files from.
+
+    Returns:
+        The applied sync plan.
+    """
+    metadata = get_plugin_metadata(project_root)
+    slug = metadata["slug"]
+    if dest_dir is None:
+        dest_dir = get_qgis_plugin_dir(profile)
+    target_path = dest_dir / slug
+
+    manifest = _load_deploy_manifest(project_root, target_path)
+    if manifest is None:
+        return deploy_plugin(
+            project_root,
+            dest_dir=dest_dir,
+            no_backup=True,
+            profile=profile,
+            jobs=jobs,
+            compare=compare,
+            atomic=atomic,
+            metadata=metadata,
+            store=store,
+        )
+    if atomic and manifest.link is not None:
+        raise ValueError("Atomic deploys cannot be combined with link farms")
+
+    matcher = deploy_matcher(project_root, target_path)
+    plan = plan_paths(project_root, target_path, matcher, paths, manifest, compare)
+    if plan.is_empty:
+        return plan
+    if atomic:
+        _atomic_deploy(plan, slug, True, RetentionPolicy(), jobs, store=store)
+    else:
+        execute_sync_plan(plan, jobs=jobs).save(target_path)
+    return plan
 
 
 def compile_docs(project_root: Path, callback: Callable[[str], Any] | None = None):
@@ -330,11 +769,18 @@ def compile_qt_resources(
     project_root: Path,
     res_type: str = "all",
     callback: Callable[[str], Any] | None = None,
+    only: Collection[Path] | None = None,
 ):
-    """Compile Qt resources, translations, and documentation."""
+    """Compile Qt resources, translations, and documentation.
+
+    ``only`` restricts compilation to the given ``.qrc``/``.ts`` files and
+    skips the documentation (used by ``deploy --watch``).
+    """
     if res_type in ["resources", "all"]:
         # Look for .qrc files
-        qrc_files = list(project_root.rglob("*.qrc"))
+        qrc_files = find_project_files(project_root, ".qrc")
+        if only is not None:
+            qrc_files = [qrc for qrc in qrc_files if qrc in only]
         if qrc_files:
             rcc_tool = get_rcc_tool()
             if not rcc_tool:
@@ -371,7 +817,9 @@ def compile_qt_resources(
 
     if res_type in ["translations", "all"]:
         # Look for .ts files
-        ts_files = list(project_root.rglob("*.ts"))
+        ts_files = find_project_files(project_root, ".ts")
+        if only is not None:
+            ts_files = [ts for ts in ts_files if ts in only]
         for ts in ts_files:
             rel_ts = ts.relative_to(project_root)
             if callback:
@@ -390,7 +838,7 @@ def compile_qt_resources(
             except FileNotFoundError:
                 logger.error("  ❌ lrelease not found. Is it installed?")
 
-    if res_type in ["docs", "all"]:
+    if res_type in ["docs", "all"] and only is None:
         compile_docs(project_root, callback=callback)
 
 
@@ -399,20 +847,25 @@ def clean_artifacts(project_root: Path):
     logger.info("Cleaning artifacts...")
 
     # Directorios a eliminar
-    cache_dirs = ["__pycache__", ".pytest_cache", ".ruff_cache"]
-    for dir_name in cache_dirs:
-        for item in project_root.rglob(dir_name):
-            if item.is_dir():
-                shutil.rmtree(item)
-                logger.debug(f"  🗑️ {item.relative_to(project_root)}")
+    cache_dirs = {"__pycache__", ".pytest_cache", ".ruff_cache"}
+    found_dirs: list[tuple[str, Path]] = []
+
+    def prune(rel: str, entry: os.DirEntry[str]) -> bool:
+        if entry.name in cache_dirs:
+            found_dirs.append((rel, Path(entry.path)))
+            return True
+        return entry.name in UNSCANNED_DIRECTORIES
 
     # Archivos a eliminar
     cache_files = ["*.pyc", "*.qpj", "*.cpg"]
-    for file_pattern in cache_files:
-        for item in project_root.rglob(file_pattern):
-            if item.is_file():
-                item.unlink()
-                logger.debug(f"  🗑️ {item.relative_to(project_root)}")
+    for rel, entry in walk_project(project_root, prune=prune):
+        if entry.is_file() and any(fnmatch.fnmatch(entry.name, p) for p in cache_files):
+            os.unlink(entry.path)
+            logger.debug(f"  🗑️ {rel}")
+
+    for rel, item in found_dirs:
+        shutil.rmtree(item)
+        logger.debug(f"  🗑️ {rel}")
 
     logger.info("✨ Clean complete.")
 
@@ -422,20 +875,47 @@ def create_plugin_package(
     output_dir: Path | None = None,
     include_dev: bool = False,
     callback: Callable[[int], Any] | None = None,
+    jobs: int | None = None,
+    deterministic: bool = False,
+    cache: PackageCache | None = None,
+    checksums: Sequence[str] = (),
+    policy: CompressionPolicy | None = None,
+    on_report: Callable[[ZipReport], Any] | None = None,
+    incremental: bool = False,
 ) -> Path:
     """
     Create a distributable ZIP package for the plugin.
 
+    Entries are deflated concurrently and written in a fixed order (see
+    :func:`write_zip`). With ``deterministic`` the archive is reproducible:
+    sorted entries, normalised timestamps (``SOURCE_DATE_EPOCH`` if set) and
+    permissions. With a ``cache``, an unchanged set of inputs (files, their
+    content, modes and timestamps, the plugin version and the build options)
+    returns the previously built archive and checksum without rebuilding.
+    With ``incremental`` the entries of files unchanged since the previous
+    package (the same version, or else the newest one in ``output_dir``) are
+    copied from it instead of being compressed again.
+
     Args:
         project_root: Root directory of the plugin project
         output_dir: Output directory for the ZIP file (default: project_root/dist)
         include_dev: Include development files in the package
+        callback: Called with the number of files, then with 1 per file written
+        jobs: Number of compression workers (default: number of CPUs)
+        deterministic: Build a reproducible archive
+        cache: Package cache to reuse and record builds in
+        checksums: Digests written next to the archive (``<zip>.<algorithm>``)
+            besides SHA256, from ``CHECKSUM_ALGORITHMS``; all are computed
+            while the archive is written
+        policy: Compression of each file (default: already compressed formats
+            are stored, incompressible files detected by sampling)
+        on_report: Called with the time and ratio per compression class (not
+            called when the package comes from the cache)
+        incremental: Reuse the unchanged entries of the previous package
 
     Returns:
         Path to the created ZIP file
     """
-    import hashlib
-
     metadata = get_plugin_metadata(project_root)
     slug = metadata["slug"]
     version = metadata.get("version", "0.0.0")
@@ -455,45 +935,80 @@ def create_plugin_package(
 
     # Collect items for ZIP
     items_to_zip = []
-    for item in get_source_files(project_root, include_dev=include_dev):
-        if item.is_file():
-            items_to_zip.append((item, f"{slug}/{item.name}"))
-        elif item.is_dir():
-            for file_path in item.rglob("*"):
-                if (
-                    file_path.is_file()
-                    and not file_path.is_symlink()
-                    and not matcher.should_exclude(file_path)
-                ):  # noqa: E501
-                    arcname = f"{slug}/{file_path.relative_to(project_root)}"
-                    items_to_zip.append((file_path, arcname))
+    for rel, entry in walk_project(project_root, matcher):
+        if entry.is_file():
+            items_to_zip.append((Path(entry.path), f"{slug}/{rel}"))
 
     if callback:
         callback(len(items_to_zip))
 
-    # Create ZIP file
-    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-        for item, arcname in items_to_zip:
-            zipf.write(item, arcname)
+    if policy is None:
+        policy = CompressionPolicy()
+    checksums = list(dict.fromkeys(["sha256", *checksums]))
+    checksum_files = [output_dir / f"{zip_filename}.{name}" for name in checksums]
+    key = None
+    if cache is not None:
+        options = {"deterministic": deterministic, "compression": policy.to_dict()}
+        key = cache.key(items_to_zip, zip_filename, options)
+        names = [zip_filename] + [path.name for path in checksum_files]
+        if cache.fetch(key, output_dir, names):
+            cache.save()
             if callback:
-                callback(1)
-            logger.debug(f"  ✅ {arcname}")
-
-    # Generate SHA256 checksum
-    sha256_hash = hashlib.sha256()
-    with open(zip_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-
-    checksum = sha256_hash.hexdigest()
-    checksum_file = output_dir / f"{zip_filename}.sha256"
+                callback(len(items_to_zip))
+            logger.info(f"♻️ Inputs unchanged, reused cached package: {zip_path}")
+            return zip_path
 
-    with open(checksum_file, "w") as cf:
-        cf.write(f"{checksum}  {zip_filename}\n")
+    def written(entry: ZipEntry) -> None:
+        if callback:
+            callback(1)
+        logger.debug(f"  ✅ {entry.arcname}")
+
+    previous = None
+    if incremental:
+        candidates = [zip_path] if zip_path.exists() else []
+        # <slug>.<version>.zip only, not the packages of "<slug>.<other>"
+        own = re.compile(re.escape(slug) + rf"\.{_VERSION_PATTERN}\.zip")
+        candidates += sorted(
+            (p for p in output_dir.glob(f"{slug}.*.zip") if own.fullmatch(p.name)),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        previous = candidates[0] if candidates else None
+
+    # Create ZIP file, hashing it as it is written
+    report = write_zip(
+        zip_path,
+        items_to_zip,
+        jobs=jobs or os.cpu_count() or 1,
+        policy=policy,
+        callback=written,
+        deterministic=deterministic,
+        checksums=checksums,
+        previous=previous,
+    )
+    digests = report.digests
+    if previous is not None:
+        logger.info(f"♻️ {report.reused} unchanged entries reused from {previous.name}")
+    for line in report.summary():
+        logger.debug(f"  🗜️ {line}")
+    if on_report is not None:
+        on_report(report)
+
+    for name, checksum_file in zip(checksums, checksum_files, strict=True):
+        # Replaced, not rewritten: the previous file may be linked to the cache
+        tmp = checksum_file.with_name(f".{checksum_file.name}.partial")
+        with open(tmp, "w") as cf:
+            cf.write(f"{digests[name]}  {zip_filename}\n")
+        os.replace(tmp, checksum_file)
+
+    if cache is not None and key is not None:
+        cache.put(key, [zip_path, *checksum_files])
+        cache.save()
 
     logger.info(f"✨ Package created: {zip_path}")
-    logger.info(f"🔒 Checksum saved: {checksum_file}")
-    logger.info(f"📊 SHA256: {checksum}")
+    for name, checksum_file in zip(checksums, checksum_files, strict=True):
+        logger.info(f"🔒 Checksum saved: {checksum_file}")
+        logger.info(f"📊 {name.upper()}: {digests[name]}")
 
     return zip_path
 
@@ -27,8 +27,9 @@ read metadata.txt files, and identify source files for deployment.
 
 import configparser
 import logging
+import os
 import re
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Any
 
@@ -165,3 +166,110 @@ def get_source_files(project_root: Path, include_dev: bool = False) -> Iterator[
             continue
 
         yield item
+
+
+def walk_project(
+    root: Path,
+    matcher: IgnoreMatcher | None = None,
+    include_dirs: bool = False,
+    follow_symlinks: bool = False,
+    prune: Callable[[str, os.DirEntry[str]], bool] | None = None,
+) -> Iterator[tuple[str, os.DirEntry[str]]]:
+    """Lazily walk a project tree, pruning excluded directories on entry.
+
+    Built on ``os.scandir`` so callers can reuse the type information and
+    cached stat results of each ``DirEntry``. Excluded directories are never
+    entered, so the cost of a scan depends on what is kept, not on what sits
+    in the tree (``.venv``, ``.git``, ``__pycache__``...).
+
+    Args:
+        root: Directory to walk.
+        matcher: Optional ignore matcher. Excluded entries are skipped.
+        include_dirs: Also yield directories (always before their contents).
+        follow_symlinks: Follow symbolic links. When False they are skipped.
+        prune: Optional predicate called as ``prune(rel_path, entry)`` for each
+            directory; returning True skips the directory and its contents.
+
+    Yields:
+        Tuples of (POSIX path relative to ``root``, DirEntry).
+    """
+    # Matcher paths are relative to its own project root
+    base_parts: tuple[str, ...] | None = None
+    if matcher is not None:
+        try:
+            base_parts = root.relative_to(matcher.project_root).parts
+        except ValueError:
+            base_parts = None
+
+    visited: set[tuple[int, int]] = set()
+    if follow_symlinks:
+        try:
+            st = root.stat()
+            visited.add((st.st_dev, st.st_ino))
+        except OSError:
+            pass
+
+    stack: list[tuple[str, tuple[str, ...]]] = [(str(root), ())]
+    while stack:
+        current, rel_parts = stack.pop()
+        try:
+            scanner = os.scandir(current)
+        except OSError as e:
+            logger.debug(f"Cannot scan {current}: {e}")
+            continue
+
+        subdirs: list[tuple[str, tuple[str, ...]]] = []
+        with scanner:
+            for entry in scanner:
+                parts = rel_parts + (entry.name,)
+                try:
+                    if not follow_symlinks and entry.is_symlink():
+                        continue
+                    is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                except OSError:
+                    continue
+
+                if base_parts is not None and matcher is not None:
+                    if matcher.should_exclude_parts(base_parts + parts, is_dir):
+                        continue
+
+                rel = "/".join(parts)
+                if not is_dir:
+                    yield rel, entry
+                    continue
+
+                if prune is not None and prune(rel, entry):
+                    continue
+                if follow_symlinks:
+                    # Guard against symlink loops
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if (st.st_dev, st.st_ino) in visited:
+                        continue
+                    visited.add((st.st_dev, st.st_ino))
+
+                subdirs.append((entry.path, parts))
+                if include_dirs:
+                    yield rel, entry
+
+        stack.extend(reversed(subdirs))
+
+
+def find_project_files(project_root: Path, suffix: str) -> list[Path]:
+    """Find project files with the given suffix, skipping ignored directories.
+
+    Args:
+        project_root: Root directory of the project.
+        suffix: File suffix to look for (e.g. ``.qrc``).
+
+    Returns:
+        List of matching file paths.
+    """
+    matcher = IgnoreMatcher(project_root, include_dev=True)
+    return [
+        Path(entry.path)
+        for _, entry in walk_project(project_root, matcher)
+        if entry.name.endswith(suffix) and entry.is_file()
+    ]
@@ -0,0 +1,139 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Content hashing with a persistent cache.
+
+Digests are cached on disk keyed by (path, size, mtime_ns, inode), so a file
+is only rehashed when its stat signature changes. This makes content-based
+change detection cheap across runs, even after a checkout touched every mtime.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HASH_CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def get_cache_dir() -> Path:
+    """Return the user cache directory for QGIS Plugin Manager."""
+    base = os.environ.get("XDG_CACHE_HOME")
+    cache_root = Path(base) if base else Path.home() / ".cache"
+    return cache_root / "qgis-manager"
+
+
+def file_digest(path: str | Path) -> str:
+    """Return the blake2b hex digest of a file's content."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class HashCache:
+    """Persistent cache of file digests keyed by path and stat signature.
+
+    Safe to share between threads: the entries are only touched under a lock
+    (files are hashed outside of it).
+
+    Attributes:
+        path: Location of the JSON cache file.
+        hits: Number of digests served from the cache.
+        misses: Number of files hashed.
+    """
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or get_cache_dir() / "hashes.json"
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[str, list] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == HASH_CACHE_VERSION:
+                self._entries = data["entries"]
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable hash cache {self.path}: {e}")
+
+    def digest(self, path: str | Path, st: os.stat_result | None = None) -> str:
+        """Return the digest of a file, hashing it only if the cache is stale.
+
+        Args:
+            path: File to hash.
+            st: Stat result of the file, if already known.
+
+        Returns:
+            The blake2b hex digest of the file content.
+        """
+        key = os.path.abspath(path)
+        if st is None:
+            st = os.stat(path)
+        signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[:3] == signature:
+                self.hits += 1
+                return str(cached[3])
+            self.misses += 1
+
+        value = file_digest(path)
+        with self._lock:
+            self._entries[key] = [*signature, value]
+            self._dirty = True
+        return value
+
+    def save(self) -> None:
+        """Atomically write the cache to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(
+                f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": HASH_CACHE_VERSION, "entries": entries},
+                    f,
+                    separators=(",", ":"),
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            with self._lock:
+                self._dirty = True
+            logger.debug(f"Could not write hash cache {self.path}: {e}")
@@ -25,8 +25,14 @@ without requiring external dependencies like pathspec.
 """
 
 import fnmatch
+import os
+import re
 import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 # tomllib is 3.11+, fallback to a simple parser for 3.10
 if sys.version_info >= (3, 11):
@@ -66,31 +72,38 @@ else:
 
 from .constants import DEFAULT_EXCLUDE_PATTERNS
 
+# Ignore files looked up in every directory, by precedence. If the first one
+# exists in a directory, the second one is not read for that directory.
+IGNORE_FILE_NAMES = (".qgisignore", ".gitignore")
 
-def load_ignore_patterns(project_root: Path, include_dev: bool = False):
+
+def load_ignore_sources(
+    project_root: Path, include_dev: bool = False
+) -> list[tuple[str, str]]:
     """
-    Load ignore patterns from .gitignore and pyproject.toml.
+    Load ignore patterns together with the place each one comes from.
 
     Args:
         project_root: The root directory of the project.
         include_dev: Whether to include development files (docs, tests, etc.).
 
     Returns:
-        A list of patterns.
+        A list of (pattern, source) tuples in evaluation order. The source is
+        ``default``, the ignore file name or ``pyproject.toml``.
     """
-    patterns = list(DEFAULT_EXCLUDE_PATTERNS)
+    sources = [(p, "default") for p in DEFAULT_EXCLUDE_PATTERNS]
 
     if not include_dev:
         from .constants import DEV_DIRECTORIES
 
         for d in DEV_DIRECTORIES:
             # Root-level only dev dirs
-            patterns.append(f"/{d}")
-            patterns.append(f"/{d}/**/*")
+            sources.append((f"/{d}", "default"))
+            sources.append((f"/{d}/**/*", "default"))
 
     # 1. Try to load from .gitignore or .qgisignore
     ignore_loaded = False
-    for ignore_name in [".qgisignore", ".gitignore"]:
+    for ignore_name in IGNORE_FILE_NAMES:
         if ignore_loaded:
             break
 
@@ -101,7 +114,7 @@ def load_ignore_patterns(project_root: Path, include_dev: bool = False):
                     for line in f:
                         line = line.strip()
                         if line and not line.startswith("#"):
-                            patterns.append(line)
+                            sources.append((line, ignore_name))
                 ignore_loaded = True
             except Exception:
                 pass
@@ -119,19 +132,402 @@ def load_ignore_patterns(project_root: Path, include_dev: bool = False):
                 tool_config = data.get("tool", {}).get("qgis-manager", {})
                 custom_ignores = tool_config.get("ignore", [])
                 if isinstance(custom_ignores, list):
-                    patterns.extend(custom_ignores)
+                    sources.extend((p, "pyproject.toml") for p in custom_ignores)
         except Exception:
             pass
 
-    return patterns
+    return sources
+
+
+def load_ignore_patterns(project_root: Path, include_dev: bool = False):
+    """
+    Load ignore patterns from .gitignore and pyproject.toml.
+
+    Patterns starting with ``!`` are negations: they re-include paths matched by
+    earlier patterns (the last matching pattern wins).
+
+    Args:
+        project_root: The root directory of the project.
+        include_dev: Whether to include development files (docs, tests, etc.).
+
+    Returns:
+        A list of patterns.
+    """
+    return [pattern for pattern, _ in load_ignore_sources(project_root, include_dev)]
+
+
+def pattern_matches(pattern: str, path_str: str, parts: tuple[str, ...]) -> bool:
+    """Evaluate a single ignore pattern against a project-relative path.
+
+    This is the reference (uncompiled) implementation of the matching rules.
+    ``CompiledPatterns`` must give exactly the same answers.
+
+    Args:
+        pattern: Raw ignore pattern.
+        path_str: Project-relative path using forward slashes.
+        parts: Components of the project-relative path.
+
+    Returns:
+        True if the pattern matches the path.
+    """
+    p = pattern.rstrip("/")
+    if p.startswith("/"):
+        p = p[1:]
+        return fnmatch.fnmatch(path_str, p) or path_str.startswith(p + "/")
+
+    # Global matching (matches any part of the path or the whole path)
+    if any(fnmatch.fnmatch(part, p) for part in parts):
+        return True
+
+    # Match full path
+    if fnmatch.fnmatch(path_str, p) or fnmatch.fnmatch(path_str, f"*/{p}"):
+        return True
+
+    # Implicit recursion for directories
+    return path_str.startswith(f"{p}/") or f"/{p}/" in path_str
+
+
+def _is_literal(pattern: str) -> bool:
+    return not any(c in pattern for c in "*?[")
+
+
+def _union(regexes: list[str], flags: int = 0) -> re.Pattern[str] | None:
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{r})" for r in regexes), flags)
+
+
+class CompiledPatterns:
+    """Pre-compiled, partitioned form of an ignore pattern list.
+
+    Patterns are split into:
+        - literal basenames (``__pycache__``), checked with a set lookup on
+          every path component,
+        - literal root-relative prefixes (``/tests``), checked with a set lookup
+          on every leading sub-path,
+        - true globs, merged into a single combined regex per kind of check.
+
+    Component and prefix checks of the ancestors of a path only depend on its
+    parent directory, so their result is cached per directory.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.basenames: set[str] = set()
+        self.root_prefixes: set[str] = set()
+        self._root_exact: set[str] = set()
+        part_globs: list[str] = []
+        path_globs: list[str] = []
+        literal_prefixes: list[str] = []
+
+        for pattern in patterns:
+            if pattern.startswith("!"):
+                # Negations are resolved by IgnoreMatcher, in order
+                continue
+            p = pattern.rstrip("/")
+            if p.startswith("/"):
+                p = p[1:]
+                if _is_literal(p):
+                    self.root_prefixes.add(p)
+                    self._root_exact.add(os.path.normcase(p))
+                else:
+                    path_globs.append(fnmatch.translate(os.path.normcase(p)))
+                    literal_prefixes.append(re.escape(p + "/"))
+                continue
+
+            if p and "/" not in p and _is_literal(p):
+                self.basenames.add(os.path.normcase(p))
+                continue
+
+            if "/" not in p:
+                part_globs.append(fnmatch.translate(os.path.normcase(p)))
+            path_globs.append(fnmatch.translate(os.path.normcase(p)))
+            path_globs.append(fnmatch.translate(os.path.normcase(f"*/{p}")))
+            literal_prefixes.append(f"(?:.*/)?{re.escape(p + '/')}")
+
+        self._part_re = _union(part_globs)
+        self._path_re = _union(path_globs)
+        self._prefix_re = _union(literal_prefixes, re.DOTALL)
+        self._dir_cache: dict[str, bool] = {}
+
+    def _component_hit(self, name: str) -> bool:
+        name = os.path.normcase(name)
+        if name in self.basenames:
+            return True
+        return self._part_re is not None and self._part_re.match(name) is not None
+
+    def _ancestors_hit(self, parts: tuple[str, ...]) -> bool:
+        """Return True if any of ``parts`` or a leading sub-path matches."""
+        if not parts:
+            return False
+        key = "/".join(parts)
+        cached = self._dir_cache.get(key)
+        if cached is None:
+            cached = (
+                self._ancestors_hit(parts[:-1])
+                or self._component_hit(parts[-1])
+                or key in self.root_prefixes
+            )
+            self._dir_cache[key] = cached
+        return cached
+
+    def matches(self, path_str: str, parts: tuple[str, ...]) -> bool:
+        """Return True if any (non-negated) pattern matches the relative path."""
+        if self._ancestors_hit(parts[:-1]) or self._component_hit(parts[-1]):
+            return True
+
+        norm_path = os.path.normcase(path_str)
+        if norm_path in self._root_exact:
+            return True
+        if self._path_re is not None and self._path_re.match(norm_path):
+            return True
+        if self._prefix_re is not None and self._prefix_re.match(path_str):
+            return True
+        return False
+
+
+def _gitignore_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob (``*``, ``?``, ``[...]``, ``**``) to a regex."""
+    i, n = 0, len(pattern)
+    out: list[str] = []
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and i + 2 == n and pattern[i - 1] == "/":
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] in "!^" else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+                continue
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """A single rule of a nested ignore file, with gitignore semantics.
+
+    Attributes:
+        pattern: The rule as written in the ignore file.
+        regex: Compiled regex, matched against the path relative to the
+            directory holding the ignore file.
+        negated: True for ``!pattern`` rules (re-include).
+        dir_only: True for ``pattern/`` rules (directories only).
+    """
+
+    pattern: str
+    regex: re.Pattern[str]
+    negated: bool
+    dir_only: bool
+
+    @classmethod
+    def parse(cls, line: str) -> "IgnoreRule | None":
+        """Parse one ignore file line. Returns None for blanks and comments."""
+        line = line.rstrip("\n").rstrip("\r")
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(" ")
+        if stripped.endswith("\\") and len(stripped) < len(line):
+            stripped += " "
+        raw = stripped
+        if not raw or raw.startswith("#"):
+            return None
+
+        negated = raw.startswith("!")
+        if negated:
+            raw = raw[1:]
+        elif raw.startswith(("\\!", "\\#")):
+            raw = raw[1:]
+
+        dir_only = raw.endswith("/")
+        raw = raw.rstrip("/")
+        if not raw:
+            return None
+
+        # A slash at the beginning or middle anchors the rule to its directory
+        anchored = "/" in raw
+        raw = raw.lstrip("/")
+        regex = _gitignore_to_regex(raw)
+        if not anchored:
+            regex = f"(?:.*/)?{regex}"
+        return cls(
+            pattern=stripped,
+            regex=re.compile(regex + r"\Z", re.DOTALL),
+            negated=negated,
+            dir_only=dir_only,
+        )
+
+
+class IgnoreLayer:
+    """Compiled rules of one nested ignore file.
+
+    Rules are evaluated in file order and the last matching rule wins. A union
+    of all the rules is used to reject non-matching paths in a single regex
+    search.
+    """
+
+    def __init__(
+        self, directory: tuple[str, ...], source: Path, rules: list[IgnoreRule]
+    ):
+        self.directory = directory
+        self.source = source
+        self.rules = rules
+        self._any = _union([r.regex.pattern for r in rules], re.DOTALL)
+
+    @classmethod
+    def load(
+        cls, project_root: Path, directory: tuple[str, ...]
+    ) -> "IgnoreLayer | None":
+        """Load the ignore file of ``directory`` (relative parts), if any."""
+        base = project_root.joinpath(*directory)
+        for ignore_name in IGNORE_FILE_NAMES:
+            ignore_file = base / ignore_name
+            try:
+                with open(ignore_file, encoding="utf-8") as f:
+                    rules = [r for r in map(IgnoreRule.parse, f) if r is not None]
+            except FileNotFoundError:
+                continue
+            except Exception:
+                return None
+            return cls(directory, ignore_file, rules) if rules else None
+        return None
+
+    def match(self, rel: str, is_dir: Callable[[], bool]) -> IgnoreRule | None:
+        """Return the deciding rule for a path relative to this layer, if any.
+
+        Args:
+            rel: Path relative to the directory holding the ignore file.
+            is_dir: Callable telling whether the path is a directory. Only
+                called when a directory-only rule matches.
+        """
+        if self._any is None or self._any.match(rel) is None:
+            return None
+        for rule in reversed(self.rules):
+            if rule.regex.match(rel) and (not rule.dir_only or is_dir()):
+                return rule
+        return None
+
+
+def _mutator(method: Callable[..., Any]) -> Callable[..., Any]:
+    def mutate(self: "_PatternList", *args: Any, **kwargs: Any) -> Any:
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    return mutate
+
+
+class _PatternList(list[str]):
+    """List of patterns counting its modifications.
+
+    ``IgnoreMatcher`` compares the counter with the one it compiled, instead
+    of comparing every pattern on every lookup.
+    """
+
+    version = 0
+
+    append = _mutator(list.append)
+    extend = _mutator(list.extend)
+    insert = _mutator(list.insert)
+    remove = _mutator(list.remove)
+    pop = _mutator(list.pop)
+    clear = _mutator(list.clear)
+    sort = _mutator(list.sort)
+    reverse = _mutator(list.reverse)
+    __setitem__ = _mutator(list.__setitem__)
+    __delitem__ = _mutator(list.__delitem__)
+    __iadd__ = _mutator(list.__iadd__)
+    __imul__ = _mutator(list.__imul__)
+
+
+@dataclass
+class IgnoreDecision:
+    """Outcome of ``IgnoreMatcher.explain``.
+
+    Attributes:
+        excluded: Whether the path is excluded.
+        pattern: Deciding pattern, or None if no rule matched.
+        source: Where the pattern comes from (``default``, an ignore file or
+            ``pyproject.toml``).
+        matched_path: Project-relative path the pattern matched. It is a parent
+            directory when the path is excluded because of it.
+    """
+
+    excluded: bool
+    pattern: str | None = None
+    source: str | None = None
+    matched_path: str | None = None
 
 
 class IgnoreMatcher:
-    """Helper class to filter paths against ignore patterns using standard fnmatch."""
+    """Helper class to filter paths against ignore patterns using standard fnmatch.
+
+    Root-level patterns (defaults, root ignore file and pyproject.toml) are
+    evaluated in order, ``!pattern`` entries re-including earlier matches,
+    with the legacy rules of :func:`pattern_matches`: ``dir/`` also matches
+    files and only a leading ``/`` anchors a pattern.
+    Ignore files found in subdirectories are loaded lazily the first time a
+    path below them is evaluated and applied with full gitignore semantics
+    (anchoring, directory-only rules, ``**`` and negation), deeper files taking
+    precedence. A path inside an excluded directory is always excluded.
+    """
 
-    def __init__(self, project_root: Path, include_dev: bool = False):
+    def __init__(
+        self, project_root: Path, include_dev: bool = False, nested: bool = True
+    ):
         self.project_root = project_root
-        self.patterns = load_ignore_patterns(project_root, include_dev)
+        sources = load_ignore_sources(project_root, include_dev)
+        self.patterns = [pattern for pattern, _ in sources]
+        self.pattern_sources = [source for _, source in sources]
+        self.nested = nested
+        self._compiled: CompiledPatterns | None = None
+        self._compiled_source: tuple[_PatternList, int] | None = None
+        self._has_negations = False
+        self._layers: dict[tuple[str, ...], tuple[IgnoreLayer, ...]] = {}
+        self._excluded_dirs: dict[tuple[str, ...], bool] = {}
+
+    @property
+    def patterns(self) -> list[str]:
+        """Root-level patterns, in evaluation order. May be modified in place."""
+        return self._patterns
+
+    @patterns.setter
+    def patterns(self, patterns: list[str]) -> None:
+        self._patterns = _PatternList(patterns)
+
+    @property
+    def compiled(self) -> CompiledPatterns:
+        """Compiled form of ``patterns``, rebuilt whenever the list changes."""
+        source = self._compiled_source
+        if (
+            self._compiled is None
+            or source is None
+            or source[0] is not self._patterns
+            or source[1] != self._patterns.version
+        ):
+            self._compiled = CompiledPatterns(self.patterns)
+            self._compiled_source = (self._patterns, self._patterns.version)
+            self._has_negations = any(p.startswith("!") for p in self.patterns)
+            self._excluded_dirs.clear()
+        return self._compiled
 
     def should_exclude(self, path: Path) -> bool:
         """Determine if a path should be excluded (fnmatch with Git-like semantics)."""
@@ -140,32 +536,166 @@ class IgnoreMatcher:
         except ValueError:
             return False
 
-        path_str = str(rel_path).replace("\\", "/")
-        parts = rel_path.parts
-
-        for pattern in self.patterns:
-            p = pattern.rstrip("/")
-            is_root_relative = p.startswith("/")
-            if is_root_relative:
-                p = p[1:]
-
-            if is_root_relative:
-                if fnmatch.fnmatch(path_str, p) or path_str.startswith(p + "/"):
-                    return True
-            else:
-                # Global matching (matches any part of the path or the whole path)
-                if any(fnmatch.fnmatch(part, p) for part in parts):
-                    return True
-
-                # Match full path
-                if fnmatch.fnmatch(path_str, p) or fnmatch.fnmatch(path_str, f"*/{p}"):
-                    return True
-
-                # Implicit recursion for directories
-                if path_str.startswith(f"{p}/") or f"/{p}/" in path_str:
-                    return True
-
-        return False
+        return self.should_exclude_parts(rel_path.parts)
+
+    def should_exclude_parts(
+        self, parts: tuple[str, ...], is_dir: bool | None = None
+    ) -> bool:
+        """Same as ``should_exclude`` for an already project-relative path.
+
+        Args:
+            parts: Components of the path relative to the project root.
+            is_dir: Whether the path is a directory, if already known. Only
+                needed for directory-only rules; looked up on disk otherwise.
+
+        Returns:
+            True if the path should be excluded.
+        """
+        compiled = self.compiled
+        if parts and self._dir_excluded(parts[:-1], compiled):
+            return True
+        return self._decide(parts, is_dir, compiled)
+
+    def _dir_excluded(self, parts: tuple[str, ...], compiled: CompiledPatterns) -> bool:
+        """Return True if the directory ``parts`` or one of its parents is excluded."""
+        if not parts:
+            return False
+        cached = self._excluded_dirs.get(parts)
+        if cached is None:
+            cached = self._dir_excluded(parts[:-1], compiled) or self._decide(
+                parts, True, compiled
+            )
+            self._excluded_dirs[parts] = cached
+        return cached
+
+    def _dir_checker(
+        self, parts: tuple[str, ...], is_dir: bool | None
+    ) -> Callable[[], bool]:
+        """Return a callable telling whether ``parts`` is a directory (memoized)."""
+        known: dict[str, bool] = {}
+        if is_dir is not None:
+            known["is_dir"] = is_dir
+
+        def check_dir() -> bool:
+            if "is_dir" not in known:
+                known["is_dir"] = self.project_root.joinpath(*parts).is_dir()
+            return known["is_dir"]
+
+        return check_dir
+
+    def _decide(
+        self,
+        parts: tuple[str, ...],
+        is_dir: bool | None,
+        compiled: CompiledPatterns,
+    ) -> bool:
+        """Decide a single path, assuming its parent directory is not excluded."""
+        if self.nested and len(parts) > 1:
+            layers = self._layer_stack(parts[:-1])
+            if layers:
+                check_dir = self._dir_checker(parts, is_dir)
+                for layer in reversed(layers):
+                    rel = "/".join(parts[len(layer.directory) :])
+                    rule = layer.match(rel, check_dir)
+                    if rule is not None:
+                        return not rule.negated
+
+        return self._root_verdict(parts, compiled)
+
+    @staticmethod
+    def _path_str(parts: tuple[str, ...]) -> str:
+        return "/".join(parts).replace("\\", "/") if parts else "."
+
+    def _root_verdict(self, parts: tuple[str, ...], compiled: CompiledPatterns) -> bool:
+        """Evaluate the root-level patterns (last matching pattern wins)."""
+        path_str = self._path_str(parts)
+
+        # The project root itself and (on POSIX) names containing a literal
+        # backslash do not split cleanly into components: use the reference loop.
+        if not parts or path_str.count("/") != len(parts) - 1:
+            hit = any(
+                pattern_matches(p, path_str, parts)
+                for p in self.patterns
+                if not p.startswith("!")
+            )
+        else:
+            hit = compiled.matches(path_str, parts)
+
+        if hit and self._has_negations:
+            for pattern in reversed(self.patterns):
+                negated = pattern.startswith("!")
+                if pattern_matches(pattern[negated:], path_str, parts):
+                    return not negated
+        return hit
+
+    def pattern_source(self, index: int) -> str:
+        """Return where the pattern at ``index`` of ``patterns`` comes from."""
+        if index < len(self.pattern_sources):
+            return self.pattern_sources[index]
+        return "runtime"
+
+    def layer_source(self, layer: "IgnoreLayer") -> str:
+        """Return the project-relative path of a nested ignore file."""
+        return "/".join(layer.directory + (layer.source.name,))
+
+    def explain(self, path: Path) -> "IgnoreDecision":
+        """Explain why a path is (or is not) excluded.
+
+        Args:
+            path: Path to evaluate.
+
+        Returns:
+            The decision, with the deciding pattern and its source if any.
+        """
+        try:
+            parts = path.relative_to(self.project_root).parts
+        except ValueError:
+            return IgnoreDecision(excluded=False)
+
+        for depth in range(1, len(parts)):
+            decision = self._explain_one(parts[:depth], lambda: True)
+            if decision.excluded:
+                return decision
+        return self._explain_one(parts, self._dir_checker(parts, None))
+
+    def _explain_one(
+        self, parts: tuple[str, ...], check_dir: Callable[[], bool]
+    ) -> "IgnoreDecision":
+        rel_path = self._path_str(parts)
+        if self.nested and len(parts) > 1:
+            for layer in reversed(self._layer_stack(parts[:-1])):
+                rule = layer.match("/".join(parts[len(layer.directory) :]), check_dir)
+                if rule is not None:
+                    return IgnoreDecision(
+                        excluded=not rule.negated,
+                        pattern=rule.pattern,
+                        source=self.layer_source(layer),
+                        matched_path=rel_path,
+                    )
+
+        for index in range(len(self.patterns) - 1, -1, -1):
+            pattern = self.patterns[index]
+            negated = pattern.startswith("!")
+            if pattern_matches(pattern[negated:], rel_path, parts):
+                return IgnoreDecision(
+                    excluded=not negated,
+                    pattern=pattern,
+                    source=self.pattern_source(index),
+                    matched_path=rel_path,
+                )
+        return IgnoreDecision(excluded=False)
+
+    def _layer_stack(self, directory: tuple[str, ...]) -> tuple[IgnoreLayer, ...]:
+        """Return the nested ignore layers active in ``directory`` (cached)."""
+        stack = self._layers.get(directory)
+        if stack is None:
+            stack = self._layer_stack(directory[:-1]) if directory else ()
+            if directory:
+                layer = IgnoreLayer.load(self.project_root, directory)
+                if layer is not None:
+                    stack = stack + (layer,)
+            self._layers[directory] = stack
+        return stack
 
     def get_ignore_func(self):
         """Returns a function compatible with shutil.copytree's ignore argument."""
@@ -180,3 +710,77 @@ class IgnoreMatcher:
             return ignored
 
         return ignore_func
+
+
+@dataclass
+class PatternStats:
+    """Accumulated cost of a single ignore pattern.
+
+    Attributes:
+        pattern: The pattern as written.
+        source: Where the pattern comes from.
+        hits: Number of evaluated paths matched by the pattern.
+        seconds: Cumulative time spent evaluating the pattern.
+    """
+
+    pattern: str
+    source: str
+    hits: int = 0
+    seconds: float = 0.0
+
+
+class ProfilingIgnoreMatcher(IgnoreMatcher):
+    """IgnoreMatcher that accounts hits and time for every pattern.
+
+    Each evaluated path is additionally checked against every pattern one by
+    one, so this matcher is much slower than the regular one: diagnostics only.
+    """
+
+    def __init__(
+        self, project_root: Path, include_dev: bool = False, nested: bool = True
+    ):
+        super().__init__(project_root, include_dev, nested)
+        self.stats: dict[tuple[str, str], PatternStats] = {}
+        self.evaluated = 0
+        self.excluded = 0
+        self.matcher_seconds = 0.0
+
+    def should_exclude_parts(
+        self, parts: tuple[str, ...], is_dir: bool | None = None
+    ) -> bool:
+        start = time.perf_counter()
+        result = super().should_exclude_parts(parts, is_dir)
+        self.matcher_seconds += time.perf_counter() - start
+        self.evaluated += 1
+        self.excluded += result
+        self._account(parts, is_dir)
+        return result
+
+    def _record(self, pattern: str, source: str, hit: bool, seconds: float) -> None:
+        stats = self.stats.get((pattern, source))
+        if stats is None:
+            stats = self.stats[(pattern, source)] = PatternStats(pattern, source)
+        stats.hits += hit
+        stats.seconds += seconds
+
+    def _account(self, parts: tuple[str, ...], is_dir: bool | None) -> None:
+        path_str = self._path_str(parts)
+        for index, pattern in enumerate(self.patterns):
+            negated = pattern.startswith("!")
+            start = time.perf_counter()
+            hit = pattern_matches(pattern[negated:], path_str, parts)
+            elapsed = time.perf_counter() - start
+            self._record(pattern, self.pattern_source(index), hit, elapsed)
+
+        if not self.nested or len(parts) < 2:
+            return
+        for layer in self._layer_stack(parts[:-1]):
+            rel = "/".join(parts[len(layer.directory) :])
+            source = self.layer_source(layer)
+            for rule in layer.rules:
+                start = time.perf_counter()
+                hit = rule.regex.match(rel) is not None
+                if hit and rule.dir_only and is_dir is False:
+                    hit = False
+                elapsed = time.perf_counter() - start
+                self._record(rule.pattern, source, hit, elapsed)
@@ -0,0 +1,124 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Deploy manifest handling.
+
+After each deploy a compact manifest describing the deployed files is written
+into the target directory. The next deploy compares the source scan against it
+instead of stat-ing the destination tree, and gets the exact list of files to
+delete without walking the destination.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .constants import MANIFEST_FILENAME
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """State of a deployed file, as seen in the source at copy time.
+
+    Attributes:
+        size: File size in bytes.
+        mtime_ns: Modification time in nanoseconds.
+        digest: Optional content hash (hex).
+    """
+
+    size: int
+    mtime_ns: int
+    digest: str | None = None
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Return True if a stat result has the recorded size and mtime."""
+        return self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+
+
+@dataclass
+class DeployManifest:
+    """Files and directories deployed into a target directory.
+
+    Attributes:
+        source: Resolved path of the project the files were deployed from.
+        files: Mapping of relative POSIX paths to their entries.
+        dirs: Relative POSIX paths of deployed directories.
+        link: ``"symlink"`` or ``"hardlink"`` if the files are links to the
+            source (see ``deploy --link``), None for real copies.
+    """
+
+    source: str
+    files: dict[str, ManifestEntry] = field(default_factory=dict)
+    dirs: set[str] = field(default_factory=set)
+    link: str | None = None
+
+    @classmethod
+    def load(cls, target: Path) -> "DeployManifest | None":
+        """Load the manifest stored in a target directory.
+
+        Args:
+            target: Deployed plugin directory.
+
+        Returns:
+            The manifest, or None if it is missing, unreadable or outdated.
+        """
+        try:
+            with open(target / MANIFEST_FILENAME, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != MANIFEST_VERSION:
+                return None
+            return cls(
+                source=data["source"],
+                files={
+                    rel: ManifestEntry(size, mtime_ns, digest)
+                    for rel, (size, mtime_ns, digest) in data["files"].items()
+                },
+                dirs=set(data["dirs"]),
+                link=data.get("link"),
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable deploy manifest in {target}: {e}")
+            return None
+
+    def save(self, target: Path) -> None:
+        """Atomically write the manifest into a target directory."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "source": self.source,
+            "files": {
+                rel: [e.size, e.mtime_ns, e.digest]
+                for rel, e in sorted(self.files.items())
+            },
+            "dirs": sorted(self.dirs),
+        }
+        if self.link is not None:
+            data["link"] = self.link
+        tmp_path = target / f"{MANIFEST_FILENAME}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, target / MANIFEST_FILENAME)
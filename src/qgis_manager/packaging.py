@@ -0,0 +1,977 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+ZIP packaging.
+
+Entries are compressed concurrently in a worker pool (zlib releases the GIL
+while compressing) as a :class:`CompressionPolicy` says: stored for already
+compressed formats, deflated at some level otherwise. They are then written
+in a fixed order by :class:`ZipWriter`, which lays out a standard ZIP archive
+(with ZIP64 records when needed) from the already-compressed streams. The
+result is the same kind of archive :mod:`zipfile` writes, readable by the
+QGIS plugin installer.
+
+Deterministic archives (sorted entries, normalised timestamps and
+permissions) are byte-identical for identical inputs, which lets
+:class:`PackageCache` hand back a previous build when the hash of the
+inputs did not change.
+"""
+
+import fnmatch
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import stat
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+from .copying import copy_file
+from .hashing import HashCache, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+# Compressed entries waiting to be written are kept in memory up to this size
+SPOOL_SIZE = 8 * 1024 * 1024
+# Entries compressed ahead of the writer, per worker
+PREFETCH = 4
+
+# Auto-detection: files at least this large are sampled, and stored if the
+# sample does not compress below INCOMPRESSIBLE_RATIO
+AUTO_MIN_SIZE = 16 * 1024
+SAMPLE_SIZE = 64 * 1024
+INCOMPRESSIBLE_RATIO = 0.95
+
+# Formats that are already compressed
+DEFAULT_COMPRESSION_RULES: dict[str, str | int] = {
+    pattern: "store"
+    for pattern in (
+        "*.png",
+        "*.jpg",
+        "*.jpeg",
+        "*.gif",
+        "*.webp",
+        "*.zip",
+        "*.whl",
+        "*.gz",
+        "*.tgz",
+        "*.xz",
+        "*.bz2",
+        "*.zst",
+        "*.7z",
+        "*.mp3",
+        "*.mp4",
+    )
+}
+
+# Digests that can be produced alongside a package
+CHECKSUM_ALGORITHMS = ("sha256", "sha512", "blake2b")
+
+PACKAGE_CACHE_VERSION = 1
+# Number of packages kept in the package cache
+PACKAGE_CACHE_SIZE = 10
+
+# Sizes and offsets from this value on are stored in ZIP64 extra fields
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_FILECOUNT_LIMIT = 0xFFFF
+# Value of a field moved to the ZIP64 records
+_ZIP64_MARKER = 0xFFFFFFFF
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+_CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+_END_RECORD = struct.Struct("<4s4H2LH")
+_END_RECORD64 = struct.Struct("<4sQ2H2L4Q")
+_END_LOCATOR64 = struct.Struct("<4sLQL")
+
+_UNIX = 3
+_UTF8_FLAG = 0x800
+
+PACKAGE_LEVELS_VERSION = 1
+
+DateTime = tuple[int, int, int, int, int, int]
+ZIP_EPOCH: DateTime = (1980, 1, 1, 0, 0, 0)
+
+
+@dataclass
+class ZipEntry:
+    """A compressed entry, ready to be written.
+
+    Attributes:
+        arcname: Path of the entry in the archive.
+        method: ``zipfile.ZIP_DEFLATED`` or ``zipfile.ZIP_STORED``.
+        crc: CRC-32 of the uncompressed content.
+        size: Uncompressed size.
+        compressed_size: Size of ``data``.
+        date_time: Local modification time, as in :attr:`zipfile.ZipInfo.date_time`.
+        mode: File mode (``st_mode``).
+        data: Compressed content, positioned at its start.
+        label: Compression class of the entry, for reporting.
+        seconds: Time spent compressing the entry.
+        reused: Whether ``data`` was copied from a previous archive.
+        level: zlib level ``data`` was deflated at, if known.
+    """
+
+    arcname: str
+    method: int
+    crc: int
+    size: int
+    compressed_size: int
+    date_time: DateTime
+    mode: int
+    data: IO[bytes]
+    label: str = ""
+    seconds: float = 0.0
+    reused: bool = False
+    level: int | None = None
+
+
+@dataclass(frozen=True)
+class Compression:
+    """How to compress an entry.
+
+    Attributes:
+        method: ``zipfile.ZIP_DEFLATED`` or ``zipfile.ZIP_STORED``.
+        level: zlib compression level, for deflated entries.
+        label: Compression class, for reporting.
+    """
+
+    method: int = zipfile.ZIP_DEFLATED
+    level: int = zlib.Z_DEFAULT_COMPRESSION
+    label: str = ""
+
+
+def compress_file(
+    path: str | Path,
+    arcname: str,
+    level: int = zlib.Z_DEFAULT_COMPRESSION,
+    method: int = zipfile.ZIP_DEFLATED,
+) -> ZipEntry:
+    """Deflate (or store) a file into a spooled buffer.
+
+    Args:
+        path: File to compress.
+        arcname: Path of the entry in the archive.
+        level: zlib compression level.
+        method: ``zipfile.ZIP_DEFLATED`` or ``zipfile.ZIP_STORED``.
+
+    Returns:
+        The compressed entry. Its ``data`` must be closed by the caller.
+    """
+    start = time.perf_counter()
+    st = os.stat(path)
+    data = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+    compressor = None
+    if method == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    elif method != zipfile.ZIP_STORED:
+        raise ValueError(f"Unsupported compression method {method}")
+    crc = size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            data.write(compressor.compress(chunk) if compressor else chunk)
+    if compressor is not None:
+        data.write(compressor.flush())
+    compressed_size = data.tell()
+    data.seek(0)
+    return ZipEntry(
+        arcname,
+        method,
+        crc,
+        size,
+        compressed_size,
+        _date_time(time.localtime(st.st_mtime)),
+        st.st_mode,
+        data,
+        seconds=time.perf_counter() - start,
+        level=level if compressor is not None else None,
+    )
+
+
+def is_incompressible(path: str | Path) -> bool:
+    """Return True if a sample of the file barely compresses.
+
+    Deflates the first ``SAMPLE_SIZE`` bytes at the fastest level; a ratio
+    above ``INCOMPRESSIBLE_RATIO`` means the file is already compressed.
+    """
+    with open(path, "rb") as f:
+        sample = f.read(SAMPLE_SIZE)
+    if not sample:
+        return False
+    return len(zlib.compress(sample, 1)) > len(sample) * INCOMPRESSIBLE_RATIO
+
+
+class CompressionPolicy:
+    """Choose the compression of each entry from its name and content.
+
+    Rules map fnmatch patterns to ``"store"``, ``"deflate"`` or a deflate
+    level (0-9), ignoring case. Patterns containing a ``/`` are matched
+    against the path inside the plugin folder (the archive name without its
+    first component), others against the file name. User rules are tried
+    first, in order, then ``DEFAULT_COMPRESSION_RULES``. With ``auto``, other
+    files of at least ``AUTO_MIN_SIZE`` bytes are stored if
+    :func:`is_incompressible`.
+
+    Attributes:
+        rules: (pattern, setting) pairs, in priority order.
+        level: Deflate level of the files no rule matches.
+        auto: Detect incompressible files by sampling them.
+    """
+
+    def __init__(
+        self,
+        rules: dict[str, str | int] | None = None,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+        auto: bool = True,
+    ):
+        if not -1 <= level <= 9:
+            raise ValueError(f"Invalid compression level {level} (expected 0 to 9)")
+        self.rules = [*(rules or {}).items(), *DEFAULT_COMPRESSION_RULES.items()]
+        self.level = level
+        self.auto = auto
+        self._compressions = [
+            (pattern, self._parse(pattern, value)) for pattern, value in self.rules
+        ]
+
+    def _parse(self, pattern: str, value: str | int) -> Compression:
+        if value in ("store", "stored"):
+            return Compression(zipfile.ZIP_STORED, 0, pattern)
+        if value == "deflate":
+            return Compression(zipfile.ZIP_DEFLATED, self.level, pattern)
+        if isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= 9:
+            return Compression(zipfile.ZIP_DEFLATED, value, pattern)
+        raise ValueError(
+            f"Invalid compression for '{pattern}': {value!r} "
+            "(expected 'store', 'deflate' or a level from 0 to 9)"
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Describe the policy (for package cache keys)."""
+        return {"rules": self.rules, "level": self.level, "auto": self.auto}
+
+    def resolve(self, path: str | Path, arcname: str) -> Compression:
+        """Return the compression of a file."""
+        rel = arcname.split("/", 1)[-1].lower()
+        name = rel.rsplit("/", 1)[-1]
+        for pattern, compression in self._compressions:
+            if fnmatch.fnmatchcase(rel if "/" in pattern else name, pattern.lower()):
+                return compression
+
+        suffix = os.path.splitext(name)[1].lower()
+        label = f"*{suffix}" if suffix else "(no extension)"
+        if (
+            self.auto
+            and os.path.getsize(path) >= AUTO_MIN_SIZE
+            and is_incompressible(path)
+        ):
+            return Compression(zipfile.ZIP_STORED, 0, f"{label} (incompressible)")
+        return Compression(zipfile.ZIP_DEFLATED, self.level, label)
+
+    def compress(
+        self, path: str | Path, arcname: str, compression: Compression | None = None
+    ) -> ZipEntry:
+        """Compress a file as the policy (or a resolved ``compression``) says."""
+        start = time.perf_counter()
+        if compression is None:
+            compression = self.resolve(path, arcname)
+        entry = compress_file(path, arcname, compression.level, compression.method)
+        entry.label = compression.label
+        entry.seconds = time.perf_counter() - start
+        return entry
+
+
+@dataclass
+class CompressionStats:
+    """Packaging figures of a compression class.
+
+    Attributes:
+        files: Number of entries.
+        size: Uncompressed bytes.
+        compressed_size: Bytes written to the archive.
+        seconds: Compression time, summed over the workers.
+        stored: Whether the class is stored rather than deflated.
+        reused: Entries copied from the previous archive.
+    """
+
+    files: int = 0
+    size: int = 0
+    compressed_size: int = 0
+    seconds: float = 0.0
+    stored: bool = False
+    reused: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size over uncompressed size."""
+        return self.compressed_size / self.size if self.size else 1.0
+
+
+@dataclass
+class ZipReport:
+    """Outcome of :func:`write_zip`.
+
+    Attributes:
+        digests: Hex digests of the archive, by algorithm.
+        classes: Figures per compression class.
+    """
+
+    digests: dict[str, str] = field(default_factory=dict)
+    classes: dict[str, CompressionStats] = field(default_factory=dict)
+
+    def add(self, entry: ZipEntry) -> None:
+        stats = self.classes.setdefault(entry.label, CompressionStats())
+        stats.files += 1
+        stats.size += entry.size
+        stats.compressed_size += entry.compressed_size
+        stats.seconds += entry.seconds
+        stats.stored = entry.method == zipfile.ZIP_STORED
+        stats.reused += entry.reused
+
+    @property
+    def reused(self) -> int:
+        """Entries copied from the previous archive."""
+        return sum(stats.reused for stats in self.classes.values())
+
+    def summary(self) -> list[str]:
+        """Return one line per compression class, largest first."""
+        lines = []
+        by_size = sorted(self.classes.items(), key=lambda item: -item[1].size)
+        for label, stats in by_size:
+            method = "stored" if stats.stored else "deflated"
+            lines.append(
+                f"{label:<28} {stats.files:>5} files  {stats.size:>12} → "
+                f"{stats.compressed_size:>12} bytes  {stats.ratio:>6.1%}  "
+                f"{stats.seconds:>6.2f}s  {method}"
+                + (f", {stats.reused} reused" if stats.reused else "")
+            )
+        return lines
+
+
+def _date_time(t: time.struct_time) -> DateTime:
+    """Clamp a time to the 1980-2107 range of ZIP timestamps."""
+    if t.tm_year < 1980:
+        return ZIP_EPOCH
+    if t.tm_year > 2107:
+        return (2107, 12, 31, 23, 59, 58)
+    return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec)
+
+
+def _dos_datetime(date_time: DateTime) -> tuple[int, int]:
+    """Return the MS-DOS (time, date) fields of a timestamp."""
+    year, month, day, hour, minute, second = date_time
+    dostime = (hour << 11) | (minute << 5) | (second // 2)
+    dosdate = ((year - 1980) << 9) | (month << 5) | day
+    return dostime, dosdate
+
+
+def normalized_date_time() -> DateTime:
+    """Return the timestamp of reproducible builds.
+
+    ``SOURCE_DATE_EPOCH`` (taken as UTC) if set, else 1980-01-01.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return ZIP_EPOCH
+    return _date_time(time.gmtime(int(epoch)))
+
+
+def normalized_mode(mode: int) -> int:
+    """Return the permissions of a reproducible entry: 0o755 or 0o644."""
+    return stat.S_IFREG | (0o755 if mode & 0o111 else 0o644)
+
+
+class ZipWriter:
+    """Write a ZIP archive from already-compressed entries.
+
+    Only tracks its own offset, so ``fp`` needs no ``tell`` or ``seek``.
+    The central directory is written by :meth:`close`, or when the context
+    manager exits without an error.
+
+    Attributes:
+        fp: Binary stream receiving the archive.
+        offset: Bytes written so far.
+        count: Entries written so far.
+    """
+
+    def __init__(self, fp: "IO[bytes] | HashingWriter"):
+        self.fp = fp
+        self.offset = 0
+        self.count = 0
+        self._central: list[bytes] = []
+
+    def __enter__(self) -> "ZipWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        if exc_type is None:
+            self.close()
+
+    def _write(self, data: bytes) -> None:
+        self.fp.write(data)
+        self.offset += len(data)
+
+    def write(self, entry: ZipEntry) -> None:
+        """Append an entry, copying its compressed data as is."""
+        name = entry.arcname.encode("utf-8")
+        flags = 0 if entry.arcname.isascii() else _UTF8_FLAG
+        dostime, dosdate = _dos_datetime(entry.date_time)
+        header_offset = self.offset
+
+        sizes_overflow = (
+            entry.size >= ZIP64_LIMIT or entry.compressed_size >= ZIP64_LIMIT
+        )
+        extra = b""
+        size = entry.size
+        compressed_size = entry.compressed_size
+        if sizes_overflow:
+            extra = struct.pack("<2H2Q", 1, 16, size, compressed_size)
+            size = compressed_size = _ZIP64_MARKER
+        version = 45 if sizes_overflow else 20
+        self._write(
+            _LOCAL_HEADER.pack(
+                b"PK\003\004",
+                version,
+                0,
+                flags,
+                entry.method,
+                dostime,
+                dosdate,
+                entry.crc,
+                compressed_size,
+                size,
+                len(name),
+                len(extra),
+            )
+            + name
+            + extra
+        )
+        copied = 0
+        while chunk := entry.data.read(CHUNK_SIZE):
+            self._write(chunk)
+            copied += len(chunk)
+        if copied != entry.compressed_size:
+            raise ValueError(
+                f"{entry.arcname}: expected {entry.compressed_size} compressed "
+                f"bytes, got {copied}"
+            )
+
+        # The central directory only moves the fields that overflow
+        fields = []
+        size, compressed_size, offset = (
+            entry.size,
+            entry.compressed_size,
+            header_offset,
+        )
+        if size >= ZIP64_LIMIT:
+            fields.append(size)
+            size = _ZIP64_MARKER
+        if compressed_size >= ZIP64_LIMIT:
+            fields.append(compressed_size)
+            compressed_size = _ZIP64_MARKER
+        if offset >= ZIP64_LIMIT:
+            fields.append(offset)
+            offset = _ZIP64_MARKER
+        extra = b""
+        if fields:
+            extra = struct.pack(f"<2H{len(fields)}Q", 1, 8 * len(fields), *fields)
+        version = 45 if fields else 20
+        self._central.append(
+            _CENTRAL_HEADER.pack(
+                b"PK\001\002",
+                version,
+                _UNIX,
+                version,
+                0,
+                flags,
+                entry.method,
+                dostime,
+                dosdate,
+                entry.crc,
+                compressed_size,
+                size,
+                len(name),
+                len(extra),
+                0,
+                0,
+                0,
+                (entry.mode & 0xFFFF) << 16,
+                offset,
+            )
+            + name
+            + extra
+        )
+        self.count += 1
+
+    def close(self) -> None:
+        """Write the central directory and the end records."""
+        start = self.offset
+        for record in self._central:
+            self._write(record)
+        size = self.offset - start
+        count = self.count
+
+        if count >= ZIP_FILECOUNT_LIMIT or size >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+            end64 = self.offset
+            self._write(
+                _END_RECORD64.pack(
+                    b"PK\006\006",
+                    _END_RECORD64.size - 12,
+                    45,
+                    45,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start,
+                )
+            )
+            self._write(_END_LOCATOR64.pack(b"PK\006\007", 0, end64, 1))
+            count = min(count, 0xFFFF)
+            size = min(size, _ZIP64_MARKER)
+            start = min(start, _ZIP64_MARKER)
+        self._write(_END_RECORD.pack(b"PK\005\006", 0, 0, count, count, size, start, 0))
+        self._central = []
+
+
+def file_crc(path: str | Path) -> int:
+    """Return the CRC-32 of a file's content."""
+    crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class _ArchiveSlice(io.RawIOBase):
+    """Compressed data of an entry of an open archive."""
+
+    def __init__(self, fp: IO[bytes], info: zipfile.ZipInfo):
+        self.fp = fp
+        self.info = info
+        self._pos: int | None = None
+        self._left = info.compress_size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if self._pos is None:
+            # The data follows the local header, whose extra field may differ
+            # from the central directory's
+            self.fp.seek(self.info.header_offset)
+            header = self.fp.read(_LOCAL_HEADER.size)
+            if header[:4] != b"PK\003\004":
+                raise zipfile.BadZipFile(f"Bad local header for {self.info.filename}")
+            fields = _LOCAL_HEADER.unpack(header)
+            self._pos = self.info.header_offset + len(header) + fields[-2] + fields[-1]
+        self.fp.seek(self._pos)
+        data = self.fp.read(min(len(buffer), self._left))
+        if self._left and not data:
+            raise zipfile.BadZipFile(f"Truncated data for {self.info.filename}")
+        buffer[: len(data)] = data
+        self._pos += len(data)
+        self._left -= len(data)
+        return len(data)
+
+
+def _normal_level(level: int) -> int:
+    """Return a zlib level with ``Z_DEFAULT_COMPRESSION`` spelled out as 6."""
+    return 6 if level == zlib.Z_DEFAULT_COMPRESSION else level
+
+
+def _levels_path(zip_path: Path) -> Path:
+    key = hashlib.blake2b(os.fsencode(os.path.abspath(zip_path)), digest_size=16)
+    return get_cache_dir() / "package-levels" / f"{key.hexdigest()}.json"
+
+
+def _archive_signature(zip_path: Path) -> list[int]:
+    st = os.stat(zip_path)
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def save_levels(zip_path: Path, levels: dict[str, int]) -> None:
+    """Record the zlib level of each deflated entry of a freshly built archive.
+
+    The levels are kept in the user cache, keyed by the archive path and
+    stat signature, so the shipped archive carries nothing but standard
+    ZIP records.
+    """
+    path = _levels_path(zip_path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": PACKAGE_LEVELS_VERSION,
+                    "signature": _archive_signature(zip_path),
+                    "levels": levels,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not record the levels of {zip_path.name}: {e}")
+
+
+def load_levels(zip_path: Path) -> dict[str, int]:
+    """Return the levels recorded by :func:`save_levels`, if still valid."""
+    try:
+        with open(_levels_path(zip_path), encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == PACKAGE_LEVELS_VERSION and data.get(
+            "signature"
+        ) == _archive_signature(zip_path):
+            return dict(data["levels"])
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable levels of {zip_path.name}: {e}")
+    return {}
+
+
+class PreviousArchive:
+    """Entries of a previous build, reusable without recompressing them.
+
+    A file is unchanged when it has the size and CRC-32 recorded for its
+    entry, which must use the method and, when deflated, the level the
+    policy picks; its compressed bytes are then copied as they are. Entries
+    are read on the thread writing the new archive.
+
+    Deflated entries are only reused when :func:`save_levels` recorded their
+    level for this very archive.
+
+    Attributes:
+        path: Previous archive.
+        entries: Reusable entries by name.
+        levels: Recorded zlib level of the deflated entries, by name.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            self.entries = {
+                info.filename: info
+                for info in zf.infolist()
+                if not info.flag_bits & 0x1  # Encrypted
+                and info.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+            }
+        self.levels = load_levels(path)
+        self._fp = open(path, "rb")
+
+    def __enter__(self) -> "PreviousArchive":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def reuse(
+        self, path: str | Path, arcname: str, compression: Compression
+    ) -> ZipEntry | None:
+        """Return the entry of an unchanged file, or None."""
+        info = self.entries.get(arcname)
+        if info is None or info.compress_type != compression.method:
+            return None
+        if compression.method == zipfile.ZIP_DEFLATED and self.levels.get(
+            arcname
+        ) != _normal_level(compression.level):
+            return None
+        start = time.perf_counter()
+        st = os.stat(path)
+        if st.st_size != info.file_size or file_crc(path) != info.CRC:
+            return None
+        return ZipEntry(
+            arcname,
+            info.compress_type,
+            info.CRC,
+            info.file_size,
+            info.compress_size,
+            _date_time(time.localtime(st.st_mtime)),
+            st.st_mode,
+            io.BufferedReader(_ArchiveSlice(self._fp, info), CHUNK_SIZE),
+            label=compression.label,
+            seconds=time.perf_counter() - start,
+            reused=True,
+            level=compression.level
+            if compression.method == zipfile.ZIP_DEFLATED
+            else None,
+        )
+
+
+class HashingWriter:
+    """Binary stream wrapper hashing the bytes written through it.
+
+    Attributes:
+        fp: Wrapped stream.
+        hashes: Running hash objects, by algorithm name.
+    """
+
+    def __init__(self, fp: IO[bytes], algorithms: Sequence[str]):
+        unknown = set(algorithms) - set(CHECKSUM_ALGORITHMS)
+        if unknown:
+            raise ValueError(f"Unsupported checksum algorithms: {sorted(unknown)}")
+        self.fp = fp
+        self.hashes = {name: hashlib.new(name) for name in algorithms}
+
+    def write(self, data: bytes) -> int:
+        for h in self.hashes.values():
+            h.update(data)
+        return self.fp.write(data)
+
+    def hexdigests(self) -> dict[str, str]:
+        return {name: h.hexdigest() for name, h in self.hashes.items()}
+
+
+def write_zip(
+    zip_path: Path,
+    files: Sequence[tuple[Path, str]],
+    jobs: int = 1,
+    policy: CompressionPolicy | None = None,
+    callback: Callable[[ZipEntry], Any] | None = None,
+    deterministic: bool = False,
+    checksums: Sequence[str] = (),
+    previous: Path | None = None,
+) -> ZipReport:
+    """Write a ZIP archive, compressing entries concurrently.
+
+    Entries are written in the order of ``files`` whatever the order the
+    workers finish in. At most ``PREFETCH`` entries per worker are compressed
+    ahead of the writer, so memory stays bounded. The archive is written
+    under a temporary name and renamed into place once complete.
+
+    With ``deterministic`` the entries are sorted by name and get the
+    timestamp of :func:`normalized_date_time` and the permissions of
+    :func:`normalized_mode`, so the same files give the same bytes.
+
+    With ``previous`` (an earlier build of the archive, possibly
+    ``zip_path`` itself), the entries of unchanged files are copied from it
+    without recompressing them (see :class:`PreviousArchive`).
+
+    The ``checksums`` of the archive are computed from the bytes as they are
+    written, so the archive is never read back.
+
+    Args:
+        zip_path: Archive to create or replace.
+        files: (file, archive name) pairs, in archive order.
+        jobs: Number of compression workers.
+        policy: Compression of each entry (default: :class:`CompressionPolicy`
+            without user rules).
+        callback: Called with each entry once written.
+        deterministic: Build a reproducible archive.
+        checksums: Digest algorithms, from ``CHECKSUM_ALGORITHMS``.
+        previous: Archive to reuse unchanged entries from.
+
+    Returns:
+        The digests of the archive and the figures per compression class.
+    """
+    start = time.perf_counter()
+    if policy is None:
+        policy = CompressionPolicy()
+    report = ZipReport()
+    if deterministic:
+        files = sorted(files, key=lambda item: item[1])
+        date_time = normalized_date_time()
+    partial = zip_path.with_name(f".{zip_path.name}.partial")
+    pending: deque[Future[ZipEntry]] = deque()
+    levels: dict[str, int] = {}
+
+    old = None
+    if previous is not None and previous.is_file():
+        try:
+            old = PreviousArchive(previous)
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.warning(f"⚠️ Cannot reuse {previous.name}, rebuilding: {e}")
+
+    def compress(path: Path, arcname: str) -> ZipEntry:
+        compression = policy.resolve(path, arcname)
+        if old is not None:
+            entry = old.reuse(path, arcname, compression)
+            if entry is not None:
+                return entry
+        return policy.compress(path, arcname, compression)
+
+    def drain() -> None:
+        entry = pending.popleft().result()
+        if deterministic:
+            entry.date_time = date_time
+            entry.mode = normalized_mode(entry.mode)
+        with entry.data:
+            writer.write(entry)
+        if entry.method == zipfile.ZIP_DEFLATED and entry.level is not None:
+            levels[entry.arcname] = _normal_level(entry.level)
+        report.add(entry)
+        if callback is not None:
+            callback(entry)
+
+    try:
+        with (
+            open(partial, "wb") as f,
+            ZipWriter(hashed := HashingWriter(f, checksums)) as writer,
+            ThreadPoolExecutor(max_workers=max(1, jobs)) as pool,
+        ):
+            for path, arcname in files:
+                pending.append(pool.submit(compress, path, arcname))
+                if len(pending) >= max(1, jobs) * PREFETCH:
+                    drain()
+            while pending:
+                drain()
+        if old is not None:
+            # The previous archive may be zip_path itself, which cannot be
+            # replaced while open on Windows
+            old.close()
+        os.replace(partial, zip_path)
+        save_levels(zip_path, levels)
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        partial.unlink(missing_ok=True)
+        raise
+    finally:
+        if old is not None:
+            old.close()
+
+    elapsed = time.perf_counter() - start
+    size = sum(stats.size for stats in report.classes.values())
+    logger.debug(
+        f"Compressed {len(files)} files ({size} bytes) into "
+        f"{zip_path.stat().st_size} bytes in {elapsed:.2f}s with {jobs} jobs"
+        + (f", {report.reused} entries reused" if old is not None else "")
+    )
+    report.digests = hashed.hexdigests()
+    return report
+
+
+class PackageCache:
+    """Built packages, keyed by a hash of their inputs.
+
+    Each entry is a directory named after the key holding the archive and its
+    checksum file. Packages are placed into and out of the cache as
+    hardlinks (copies across filesystems), which is safe because archives
+    and checksum files are always replaced, never rewritten in place. The
+    ``PACKAGE_CACHE_SIZE`` most recently used entries are kept.
+
+    Attributes:
+        root: Cache directory.
+        hash_cache: Digest cache used to identify file contents.
+    """
+
+    def __init__(self, root: Path | None = None, hash_cache: HashCache | None = None):
+        self.root = root or get_cache_dir() / "packages"
+        self.hash_cache = hash_cache or HashCache()
+
+    def key(
+        self, files: Sequence[tuple[Path, str]], name: str, options: dict[str, Any]
+    ) -> str:
+        """Hash the inputs of a package.
+
+        Args:
+            files: (file, archive name) pairs, as passed to :func:`write_zip`.
+            name: Archive file name (holds the plugin slug and version).
+            options: Build options changing the archive bytes.
+
+        Returns:
+            The hex digest identifying the package.
+        """
+        deterministic = bool(options.get("deterministic"))
+        h = hashlib.blake2b(digest_size=20)
+        header: list[Any] = [PACKAGE_CACHE_VERSION, name, options]
+        if deterministic:
+            files = sorted(files, key=lambda item: item[1])
+            header.append(normalized_date_time())
+        h.update(json.dumps(header, sort_keys=True).encode())
+        for path, arcname in files:
+            st = os.stat(path)
+            if deterministic:
+                meta: Any = normalized_mode(st.st_mode)
+            else:
+                meta = [st.st_mode, _date_time(time.localtime(st.st_mtime))]
+            digest = self.hash_cache.digest(path, st)
+            h.update(json.dumps([arcname, digest, meta]).encode())
+        return h.hexdigest()
+
+    def fetch(self, key: str, dest_dir: Path, names: Sequence[str]) -> bool:
+        """Place the cached files of a package into ``dest_dir``.
+
+        Returns:
+            False if the package is not cached.
+        """
+        entry = self.root / key
+        if not all((entry / name).is_file() for name in names):
+            return False
+        for name in names:
+            _place(entry / name, dest_dir / name)
+        os.utime(entry)  # Most recently used
+        return True
+
+    def put(self, key: str, paths: Sequence[Path]) -> None:
+        """Cache the files of a freshly built package."""
+        entry = self.root / key
+        tmp = self.root / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            for path in paths:
+                _place(path, tmp / path.name)
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp, entry)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        self.prune()
+
+    def prune(self, keep: int = PACKAGE_CACHE_SIZE) -> None:
+        """Remove all but the ``keep`` most recently used packages."""
+        entries = sorted(
+            (p for p in self.root.iterdir() if not p.name.startswith(".")),
+            key=lambda p: p.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in entries[keep:]:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def save(self) -> None:
+        """Persist the digest cache."""
+        self.hash_cache.save()
+
+
+def _place(src: Path, dest: Path) -> None:
+    """Make ``dest`` a hardlink to ``src``, or a copy across filesystems."""
+    dest.unlink(missing_ok=True)
+    try:
+        os.link(src, dest)
+    except OSError:
+        copy_file(src, dest)
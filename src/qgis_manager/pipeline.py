@@ -0,0 +1,166 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Small task pipeline.
+
+Stages declare the stages they run after; every stage starts as soon as its
+dependencies are done, so independent stages (a backup of the target and a
+compilation of the source, say) overlap. The report gives each stage's
+timing and the critical path, the chain of stages that set the total
+duration.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stage:
+    """A pipeline step.
+
+    Attributes:
+        name: Unique stage name.
+        func: Called with the results of the finished stages, by name.
+        after: Names of the stages that must finish first.
+    """
+
+    name: str
+    func: Callable[[dict[str, Any]], Any]
+    after: tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    """When a stage ran, in seconds since the pipeline started."""
+
+    start: float
+    end: float
+
+    @property
+    def seconds(self) -> float:
+        return self.end - self.start
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of a pipeline run.
+
+    Attributes:
+        results: Stage results by name.
+        timings: Stage timings by name.
+        critical_path: Stage names along the critical path, in order.
+        seconds: Wall-clock duration of the pipeline.
+    """
+
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    critical_path: list[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def work_seconds(self) -> float:
+        """Sum of the stage durations (the duration if run in sequence)."""
+        return sum(t.seconds for t in self.timings.values())
+
+    def summary(self) -> str:
+        """Return a one-line description of the critical path."""
+        path = " → ".join(
+            f"{name} {self.timings[name].seconds:.2f}s" for name in self.critical_path
+        )
+        return (
+            f"⏱️ Critical path: {path} ({self.seconds:.2f}s, "
+            f"{self.work_seconds:.2f}s of work)"
+        )
+
+
+def run_pipeline(stages: Sequence[Stage]) -> PipelineReport:
+    """Run stages concurrently, each once its dependencies are done.
+
+    Args:
+        stages: Stages in a valid order (dependencies listed first).
+
+    Returns:
+        The results and timings of the stages.
+
+    Raises:
+        Exception: The error of the first failed stage, in stage order. Stages
+            depending on a failed stage are not run.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        missing = set(stage.after) - names
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown {missing}")
+
+    report = PipelineReport()
+    lock = threading.Lock()
+    futures: dict[str, Future] = {}
+    origin = time.perf_counter()
+
+    def run(stage: Stage) -> Any:
+        for dep in stage.after:
+            futures[dep].result()
+        with lock:
+            done = dict(report.results)
+        start = time.perf_counter() - origin
+        result = stage.func(done)
+        end = time.perf_counter() - origin
+        with lock:
+            report.results[stage.name] = result
+            report.timings[stage.name] = StageTiming(start, end)
+        logger.debug(f"Stage {stage.name} done in {end - start:.2f}s")
+        return result
+
+    # One thread per stage: stages waiting on their dependencies hold a worker
+    with ThreadPoolExecutor(max_workers=max(1, len(stages))) as pool:
+        for stage in stages:
+            futures[stage.name] = pool.submit(run, stage)
+    report.seconds = time.perf_counter() - origin
+
+    for stage in stages:
+        error = futures[stage.name].exception()
+        if error is not None:
+            raise error
+
+    report.critical_path = _critical_path(stages, report.timings)
+    return report
+
+
+def _critical_path(
+    stages: Sequence[Stage], timings: dict[str, StageTiming]
+) -> list[str]:
+    """Walk back from the last stage to finish through its latest dependency."""
+    if not timings:
+        return []
+    after = {stage.name: stage.after for stage in stages}
+    name = max(timings, key=lambda n: timings[n].end)
+    path = [name]
+    while after[name]:
+        name = max(after[name], key=lambda n: timings[n].end)
+        path.append(name)
+    path.reverse()
+    return path
@@ -0,0 +1,229 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Content-addressed object store.
+
+File contents are stored once as blobs named after their digest
+(``objects/ab/cdef...``) in the user cache directory. Backups and staged
+deploys reference the blobs through hardlinks, so a content seen before costs
+a link instead of a copy, whichever plugin version, profile or backup it
+comes from.
+
+The inode link count is the reference count: a blob whose only link is the
+store's own entry is unreferenced and removed by :meth:`ObjectStore.gc`.
+Deleting the whole store is always safe, the referencing trees keep their
+data. Blobs are only ever written by the store (never linked from the
+project), and referencing files are replaced rather than modified in place.
+"""
+
+import errno
+import logging
+import os
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .copying import copy_file
+from .hashing import HashCache, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoreStats:
+    """Summary of the store content.
+
+    Attributes:
+        blobs: Number of blobs.
+        bytes: Total size of the blobs.
+        unreferenced: Blobs only referenced by the store.
+        unreferenced_bytes: Total size of those blobs.
+    """
+
+    blobs: int = 0
+    bytes: int = 0
+    unreferenced: int = 0
+    unreferenced_bytes: int = 0
+
+
+class ObjectStore:
+    """Content-addressed blob store referenced through hardlinks.
+
+    Attributes:
+        root: Store directory.
+        hash_cache: Digest cache used to identify file contents.
+        added: Blobs written since the store was opened.
+        reused: Contents found already stored.
+        bytes_added: Volume of the written blobs.
+    """
+
+    def __init__(self, root: Path | None = None, hash_cache: HashCache | None = None):
+        self.root = root or get_cache_dir() / "objects"
+        self.hash_cache = hash_cache or HashCache()
+        self.added = 0
+        self.reused = 0
+        self.bytes_added = 0
+        self._lock = threading.Lock()
+
+    def blob_path(self, digest: str) -> Path:
+        """Return the path of the blob holding a content digest."""
+        return self.root / digest[:2] / digest[2:]
+
+    def supports(self, path: Path) -> bool:
+        """Return True if files at ``path`` can hardlink the store's blobs."""
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            while not path.exists():
+                path = path.parent
+            return os.stat(self.root).st_dev == os.stat(path).st_dev
+        except OSError:
+            return False
+
+    def add(self, path: str | Path, digest: str | None = None) -> str:
+        """Store the content of a file, unless already stored.
+
+        Args:
+            path: File to store. It is copied, never linked, so later edits
+                of the file cannot alter the blob.
+            digest: Content digest of the file, if already known.
+
+        Returns:
+            The content digest.
+        """
+        return self._add(path, digest)[0]
+
+    def _add(self, path: str | Path, digest: str | None) -> tuple[str, bool]:
+        if digest is None:
+            digest = self.hash_cache.digest(path)
+        blob = self.blob_path(digest)
+        if blob.exists():
+            with self._lock:
+                self.reused += 1
+            return digest, False
+
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        tmp = blob.with_name(f"{blob.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        copy_file(path, tmp)
+        try:
+            os.link(tmp, blob)
+            new = True
+        except FileExistsError:
+            new = False  # Stored concurrently
+        finally:
+            tmp.unlink()
+
+        with self._lock:
+            if new:
+                self.added += 1
+                self.bytes_added += blob.stat().st_size
+            else:
+                self.reused += 1
+        return digest, new
+
+    def link(self, digest: str, dest: Path) -> None:
+        """Make ``dest`` a hardlink to a stored blob.
+
+        Falls back to a copy if the link is impossible (another filesystem,
+        or too many links to the blob).
+        """
+        blob = self.blob_path(digest)
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(blob, dest)
+        except OSError as e:
+            if e.errno == errno.ENOENT:
+                raise
+            logger.debug(f"Cannot link {dest.name} to the store ({e}), copying")
+            copy_file(blob, dest)
+
+    def checkout(self, path: str | Path, dest: Path, digest: str | None = None) -> bool:
+        """Store a file's content and place it at ``dest`` as a blob link.
+
+        Args:
+            path: File whose content is wanted at ``dest``.
+            dest: Path to create or replace.
+            digest: Content digest of ``path``, if already known.
+
+        Returns:
+            True if the content had to be written into the store.
+        """
+        digest, new = self._add(path, digest)
+        try:
+            self.link(digest, dest)
+        except FileNotFoundError:
+            # Collected by a concurrent gc between add and link
+            digest, new = self._add(path, digest)
+            self.link(digest, dest)
+        return new
+
+    def stats(self) -> StoreStats:
+        """Scan the store and summarise its content."""
+        stats = StoreStats()
+        for blob in self._blobs():
+            st = blob.stat()
+            stats.blobs += 1
+            stats.bytes += st.st_size
+            if st.st_nlink <= 1:
+                stats.unreferenced += 1
+                stats.unreferenced_bytes += st.st_size
+        return stats
+
+    def gc(self) -> tuple[int, int]:
+        """Remove the blobs no backup or deploy references anymore.
+
+        Returns:
+            The number of blobs removed and the bytes freed.
+        """
+        removed = freed = 0
+        for blob in self._blobs():
+            try:
+                st = blob.stat()
+                if st.st_nlink > 1:
+                    continue
+                blob.unlink()
+            except OSError:
+                continue
+            removed += 1
+            freed += st.st_size
+
+        if self.root.is_dir():
+            for subdir in self.root.iterdir():
+                try:
+                    subdir.rmdir()
+                except OSError:
+                    continue  # Not empty
+        if removed:
+            logger.debug(f"🧹 Store gc removed {removed} blobs ({freed} bytes)")
+        return removed, freed
+
+    def save(self) -> None:
+        """Persist the digest cache."""
+        self.hash_cache.save()
+
+    def _blobs(self) -> Iterator[Path]:
+        if not self.root.is_dir():
+            return
+        for subdir in self.root.iterdir():
+            if not subdir.is_dir():
+                continue
+            for blob in subdir.iterdir():
+                if not blob.name.endswith(".tmp"):
+                    yield blob
@@ -0,0 +1,893 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+Two-phase directory synchronisation.
+
+:func:`plan_sync` scans the source and decides what has to change in the
+destination without touching it, producing a :class:`SyncPlan`.
+:func:`execute_sync_plan` applies a plan, optionally on a thread pool.
+:func:`sync_directory` chains both.
+"""
+
+import errno
+import logging
+import os
+import shutil
+import stat
+import sys
+import threading
+import time
+from collections.abc import Callable, Collection, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from .copying import copy_file
+from .discovery import walk_project
+from .hashing import HashCache
+from .ignore import IgnoreMatcher
+from .manifest import DeployManifest, ManifestEntry
+from .store import ObjectStore
+
+logger = logging.getLogger(__name__)
+
+COMPARE_MODES = ("mtime", "hash")
+LINK_MODES = ("symlink", "hardlink")
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count for humans (e.g. ``1.5 MB``)."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+# Minimum delay between two progress events, in seconds
+PROGRESS_INTERVAL = 0.1
+
+
+@dataclass
+class SyncProgress:
+    """Progress of a sync, passed to progress callbacks.
+
+    Events are cumulative snapshots: a callback may skip some without losing
+    information. They are throttled to one per :data:`PROGRESS_INTERVAL`,
+    except the first (``phase == "start"``) and the last (``"done"``).
+
+    Attributes:
+        target: Destination directory.
+        phase: ``"start"``, ``"copy"``, ``"delete"`` or ``"done"``.
+        files_total: Files to copy or link.
+        bytes_total: Bytes to copy.
+        files_done: Files copied or linked so far.
+        bytes_done: Bytes copied so far.
+        skipped: Unchanged files, left alone (or hardlinked when staging).
+        deletes_total: Files and directories to delete.
+        deleted: Deletions done so far.
+        elapsed: Seconds since the sync started.
+    """
+
+    target: Path
+    phase: str
+    files_total: int
+    bytes_total: int
+    files_done: int = 0
+    bytes_done: int = 0
+    skipped: int = 0
+    deletes_total: int = 0
+    deleted: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Copy throughput in bytes per second."""
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until the copies are done, if known."""
+        if self.bytes_done >= self.bytes_total:
+            return 0.0
+        rate = self.rate
+        return (self.bytes_total - self.bytes_done) / rate if rate > 0 else None
+
+
+class _ProgressTracker:
+    """Accumulate progress from worker threads and emit throttled events."""
+
+    def __init__(
+        self,
+        callback: Callable[[SyncProgress], Any],
+        state: SyncProgress,
+    ):
+        self.callback = callback
+        self.state = state
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._last = 0.0
+        self.emit("start")
+
+    def advance(self, phase: str, nbytes: int = 0) -> None:
+        with self._lock:
+            if phase == "delete":
+                self.state.deleted += 1
+            else:
+                self.state.files_done += 1
+                self.state.bytes_done += nbytes
+            now = time.perf_counter()
+            if now - self._last >= PROGRESS_INTERVAL:
+                self._emit(phase, now)
+
+    def emit(self, phase: str) -> None:
+        with self._lock:
+            self._emit(phase, time.perf_counter())
+
+    def _emit(self, phase: str, now: float) -> None:
+        self._last = now
+        self.state.phase = phase
+        self.state.elapsed = now - self._start
+        self.callback(replace(self.state))
+
+
+def _tracked(
+    task: Callable[[], Any], tracker: _ProgressTracker, phase: str, nbytes: int
+) -> None:
+    task()
+    tracker.advance(phase, nbytes)
+
+
+@dataclass
+class FileAction:
+    """A file to copy (or link) into the destination.
+
+    Attributes:
+        path: Relative POSIX path in the destination.
+        source: Path of the source file.
+        size: Size of the source file in bytes.
+    """
+
+    path: str
+    source: str
+    size: int
+
+
+@dataclass
+class SyncPlan:
+    """Everything a sync will change in the destination.
+
+    Attributes:
+        src: Source directory.
+        dst: Destination directory.
+        manifest: Manifest describing the destination once the plan is applied.
+        link: Link mode of the plan (see :func:`plan_sync`).
+        mkdirs: Directories to create, parents first.
+        adds: Files missing from the destination.
+        updates: Files present in the destination but outdated.
+        deletes: Files to delete from the destination.
+        delete_trees: Directories to delete recursively.
+        prune_dirs: Directories to remove if they are left empty, deepest first.
+    """
+
+    src: Path
+    dst: Path
+    manifest: DeployManifest
+    link: str | None = None
+    mkdirs: list[str] = field(default_factory=list)
+    adds: list[FileAction] = field(default_factory=list)
+    updates: list[FileAction] = field(default_factory=list)
+    deletes: list[str] = field(default_factory=list)
+    delete_trees: list[str] = field(default_factory=list)
+    prune_dirs: list[str] = field(default_factory=list)
+
+    @property
+    def transfers(self) -> list[FileAction]:
+        """Adds and updates, in plan order."""
+        return sorted(self.adds + self.updates, key=lambda a: a.path)
+
+    @property
+    def bytes(self) -> int:
+        """Bytes to copy (0 when linking)."""
+        if self.link is not None:
+            return 0
+        return sum(a.size for a in self.adds) + sum(a.size for a in self.updates)
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """Number of operations per kind."""
+        return {
+            "adds": len(self.adds),
+            "updates": len(self.updates),
+            "deletes": len(self.deletes) + len(self.delete_trees),
+            "unchanged": len(self.manifest.files) - len(self.adds) - len(self.updates),
+        }
+
+    @property
+    def is_empty(self) -> bool:
+        """True if applying the plan changes nothing."""
+        return not (
+            self.mkdirs
+            or self.adds
+            or self.updates
+            or self.deletes
+            or self.delete_trees
+            or self.prune_dirs
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable description of the plan."""
+        return {
+            "source": str(self.src),
+            "target": str(self.dst),
+            "link": self.link,
+            "counts": self.counts,
+            "bytes": self.bytes,
+            "adds": [{"path": a.path, "size": a.size} for a in self.adds],
+            "updates": [{"path": a.path, "size": a.size} for a in self.updates],
+            "deletes": sorted(self.deletes + self.delete_trees),
+        }
+
+
+def _directory_ids(path: Path) -> set[tuple[int, int]]:
+    """Return the (device, inode) pairs of a directory and all its parents."""
+    ids: set[tuple[int, int]] = set()
+    try:
+        resolved = path.resolve()
+    except OSError:
+        return ids
+    for directory in (resolved, *resolved.parents):
+        try:
+            st = directory.stat()
+        except OSError:
+            continue
+        ids.add((st.st_dev, st.st_ino))
+    return ids
+
+
+def _same_inode(path: Path, st: os.stat_result) -> bool:
+    """Return True if ``path`` is a hardlink of the file described by ``st``."""
+    try:
+        dst_stat = path.lstat()
+    except FileNotFoundError:
+        return False
+    return (dst_stat.st_dev, dst_stat.st_ino) == (st.st_dev, st.st_ino)
+
+
+@dataclass
+class SourceIndex:
+    """Result of a single scan of a source tree, reusable across targets.
+
+    Attributes:
+        src: Source directory.
+        matcher: Ignore matcher the scan was filtered with.
+        dirs: Relative POSIX paths of the kept directories, parents first.
+        files: (relative path, path, stat result) of the kept files.
+    """
+
+    src: Path
+    matcher: IgnoreMatcher
+    dirs: list[str] = field(default_factory=list)
+    files: list[tuple[str, str, os.stat_result]] = field(default_factory=list)
+
+
+def scan_source(
+    src: Path, matcher: IgnoreMatcher, exclude: Collection[Path] = ()
+) -> SourceIndex:
+    """Walk a source tree once, recording what a sync would deploy.
+
+    Args:
+        src: Source directory.
+        matcher: Ignore matcher for the source tree.
+        exclude: Destination directories; they are never descended into, even
+            when they live inside the source.
+
+    Returns:
+        The source index.
+    """
+    # Safeguard: Do not copy the destination directory into itself
+    # This prevents infinite recursion if deploying into a subfolder of the project
+    guarded: set[tuple[int, int]] = set()
+    for dst in exclude:
+        guarded |= _directory_ids(dst)
+
+    def is_destination(rel: str, entry: os.DirEntry[str]) -> bool:
+        try:
+            st = entry.stat()
+        except OSError:
+            return False
+        return (st.st_dev, st.st_ino) in guarded
+
+    index = SourceIndex(src, matcher)
+    for rel, entry in walk_project(
+        src, matcher, include_dirs=True, follow_symlinks=True, prune=is_destination
+    ):
+        if entry.is_dir():
+            index.dirs.append(rel)
+        else:
+            index.files.append((rel, entry.path, entry.stat()))
+    return index
+
+
+def plan_sync(
+    src: Path,
+    dst: Path,
+    matcher: IgnoreMatcher,
+    manifest: DeployManifest | None = None,
+    compare: str = "mtime",
+    link: str | None = None,
+    index: SourceIndex | None = None,
+) -> SyncPlan:
+    """Compute the changes needed to sync source to destination (rsync-like).
+
+    The destination is only read, never modified.
+
+    Args:
+        src: Source directory.
+        dst: Destination directory (it may not exist yet).
+        matcher: Ignore matcher for the source tree.
+        manifest: Manifest of the previous deploy into ``dst``. When given,
+            changes are detected against it and the destination tree is
+            neither stat-ed nor walked.
+        compare: ``"mtime"`` to detect changes by size and mtime, or ``"hash"``
+            to compare blake2b content digests (cached on disk), so files
+            whose mtime changed without a content change are not recopied.
+        link: ``"symlink"`` or ``"hardlink"`` to build the destination as a
+            link farm pointing at the source files instead of copying them.
+            Existing links are kept, so only added or removed files cost
+            anything. Syncing without ``link`` into a link farm replaces the
+            links with real copies.
+        index: Scan of the source from :func:`scan_source`, to share one scan
+            between several destinations. Scanned here when omitted.
+
+    Returns:
+        The sync plan.
+    """
+    if compare not in COMPARE_MODES:
+        raise ValueError(f"Unknown compare mode: {compare}")
+    if link is not None and link not in LINK_MODES:
+        raise ValueError(f"Unknown link mode: {link}")
+    hash_cache = HashCache() if compare == "hash" and link is None else None
+    # Files of a previous link farm must be replaced, not written through
+    relink_all = manifest is not None and manifest.link != link
+
+    if index is None:
+        index = scan_source(src, matcher, exclude=[dst])
+
+    result = DeployManifest(source=str(src.resolve()), link=link)
+    plan = SyncPlan(src=src, dst=dst, manifest=result, link=link)
+
+    # 1. Find files to copy/update from source
+    for rel in index.dirs:
+        if manifest is not None:
+            if rel not in manifest.dirs:
+                plan.mkdirs.append(rel)
+        elif not (dst / rel).is_dir():
+            plan.mkdirs.append(rel)
+        result.dirs.add(rel)
+
+    for rel, source, src_stat in index.files:
+        record = ManifestEntry(src_stat.st_size, src_stat.st_mtime_ns)
+        result.files[rel] = record
+        if hash_cache is not None:
+            record.digest = hash_cache.digest(source, src_stat)
+        action = FileAction(rel, source, src_stat.st_size)
+
+        # Check if we need to copy
+        if manifest is not None:
+            previous = manifest.files.get(rel)
+            if previous is None:
+                plan.adds.append(action)
+                continue
+            if relink_all:
+                pass  # Links of a previous farm are replaced, copies by links
+            elif link == "symlink":
+                continue
+            elif link == "hardlink":
+                if _same_inode(dst / rel, src_stat):
+                    continue
+            else:
+                if record.digest is not None and previous.digest is not None:
+                    unchanged = record.digest == previous.digest
+                else:
+                    unchanged = previous.matches(src_stat)
+                if unchanged:
+                    record.digest = record.digest or previous.digest
+                    continue
+            plan.updates.append(action)
+            continue
+
+        dst_item = dst / rel
+        try:
+            dst_stat = dst_item.lstat()
+        except FileNotFoundError:
+            plan.adds.append(action)
+            continue
+
+        # A link to the source always has to be replaced by a copy
+        is_link = stat.S_ISLNK(dst_stat.st_mode) or (
+            dst_stat.st_dev == src_stat.st_dev and dst_stat.st_ino == src_stat.st_ino
+        )
+        if link == "symlink":
+            if stat.S_ISLNK(dst_stat.st_mode) and os.readlink(
+                dst_item
+            ) == os.path.abspath(source):
+                continue
+        elif link == "hardlink":
+            if _same_inode(dst_item, src_stat):
+                continue
+        elif is_link:
+            pass  # Replaced by a real copy
+        # Skip if size and mtime (or content hash) match
+        elif src_stat.st_size == dst_stat.st_size:
+            if hash_cache is not None:
+                if hash_cache.digest(dst_item, dst_stat) == record.digest:
+                    continue
+            elif src_stat.st_mtime == dst_stat.st_mtime:
+                continue
+        plan.updates.append(action)
+
+    if hash_cache is not None:
+        hash_cache.save()
+        logger.debug(
+            f"🔑 Hash cache: {hash_cache.hits} hits, {hash_cache.misses} files hashed"
+        )
+
+    # 2. Find files in destination that no longer exist in source
+    if manifest is not None:
+        # The manifest lists exactly what the previous deploy created
+        plan.deletes = sorted(manifest.files.keys() - result.files.keys())
+        plan.prune_dirs = sorted(manifest.dirs - result.dirs, reverse=True)
+    else:
+        # Important: only cleanup items NOT ignored (otherwise we'd delete .git)
+        seen = result.files.keys() | result.dirs
+        missing = set(plan.mkdirs)
+        for rel_dir in ["", *sorted(result.dirs - missing)]:
+            try:
+                with os.scandir(dst / rel_dir) as scanner:
+                    stale = list(scanner)
+            except FileNotFoundError:
+                continue
+            for item in stale:
+                rel = f"{rel_dir}/{item.name}" if rel_dir else item.name
+                if rel in seen:
+                    continue
+                source_item = src / rel
+                # If it doesn't exist in source AND is not ignored/dev file
+                if not source_item.exists() and not matcher.should_exclude(source_item):
+                    if item.is_dir(follow_symlinks=False):
+                        plan.delete_trees.append(rel)
+                    else:
+                        plan.deletes.append(rel)
+        plan.deletes.sort()
+        plan.delete_trees.sort()
+
+    return plan
+
+
+def plan_paths(
+    src: Path,
+    dst: Path,
+    matcher: IgnoreMatcher,
+    paths: Collection[str],
+    manifest: DeployManifest,
+    compare: str = "mtime",
+) -> SyncPlan:
+    """Plan the sync of a set of changed paths only.
+
+    Used by watch mode: instead of scanning the whole source, only the given
+    relative paths (files or directories, existing or removed) are looked at
+    and the previous manifest is updated accordingly.
+
+    Args:
+        src: Source directory.
+        dst: Destination directory.
+        matcher: Ignore matcher for the source tree.
+        paths: Changed POSIX paths relative to ``src``.
+        manifest: Manifest of the current deploy into ``dst``.
+        compare: Change detection mode, as in :func:`plan_sync`.
+
+    Returns:
+        The sync plan, whose manifest covers the whole destination.
+    """
+    if compare not in COMPARE_MODES:
+        raise ValueError(f"Unknown compare mode: {compare}")
+    hash_cache = HashCache() if compare == "hash" and manifest.link is None else None
+    result = DeployManifest(
+        source=manifest.source,
+        files=dict(manifest.files),
+        dirs=set(manifest.dirs),
+        link=manifest.link,
+    )
+    plan = SyncPlan(src=src, dst=dst, manifest=result, link=manifest.link)
+
+    def plan_file(rel: str, st: os.stat_result, source: str) -> None:
+        previous = result.files.get(rel)
+        record = ManifestEntry(st.st_size, st.st_mtime_ns)
+        if hash_cache is not None:
+            record.digest = hash_cache.digest(source, st)
+        if previous is not None:
+            if plan.link == "symlink":
+                return
+            elif plan.link == "hardlink":
+                if _same_inode(dst / rel, st):
+                    return
+            elif record.digest is not None and previous.digest is not None:
+                if record.digest == previous.digest:
+                    result.files[rel] = record
+                    return
+            elif previous.matches(st):
+                return
+        result.files[rel] = record
+        action = FileAction(rel, source, st.st_size)
+        (plan.adds if previous is None else plan.updates).append(action)
+
+    def plan_removal(rel: str) -> None:
+        prefix = f"{rel}/"
+        for file_rel in [f for f in result.files if f == rel or f.startswith(prefix)]:
+            del result.files[file_rel]
+            plan.deletes.append(file_rel)
+        for dir_rel in [d for d in result.dirs if d == rel or d.startswith(prefix)]:
+            result.dirs.discard(dir_rel)
+            plan.prune_dirs.append(dir_rel)
+
+    for rel in sorted(set(paths)):
+        path = src / rel
+        if not rel or matcher.should_exclude(path):
+            continue
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            plan_removal(rel)
+            continue
+
+        if not stat.S_ISDIR(st.st_mode):
+            plan_file(rel, st, str(path))
+            continue
+
+        # New or moved-in directory: plan its parents and whole subtree
+        parts = rel.split("/")
+        for depth in range(1, len(parts) + 1):
+            dir_rel = "/".join(parts[:depth])
+            if dir_rel not in result.dirs:
+                result.dirs.add(dir_rel)
+                plan.mkdirs.append(dir_rel)
+        for sub_rel, entry in walk_project(
+            path, matcher, include_dirs=True, follow_symlinks=True
+        ):
+            full_rel = f"{rel}/{sub_rel}"
+            if entry.is_dir():
+                if full_rel not in result.dirs:
+                    result.dirs.add(full_rel)
+                    plan.mkdirs.append(full_rel)
+            else:
+                plan_file(full_rel, entry.stat(), entry.path)
+
+    # Files created in directories that did not exist yet
+    for action in plan.adds:
+        parent = action.path.rpartition("/")[0]
+        if parent and parent not in result.dirs:
+            parts = parent.split("/")
+            for depth in range(1, len(parts) + 1):
+                dir_rel = "/".join(parts[:depth])
+                if dir_rel not in result.dirs:
+                    result.dirs.add(dir_rel)
+                    plan.mkdirs.append(dir_rel)
+
+    if hash_cache is not None:
+        hash_cache.save()
+
+    plan.mkdirs.sort()
+    plan.deletes.sort()
+    plan.prune_dirs.sort(reverse=True)
+    return plan
+
+
+def _copy_file(src: str, dest: Path) -> None:
+    # Replace the file instead of writing into it: it may be a link into the
+    # source tree or share its inode with a backup
+    dest.unlink(missing_ok=True)
+    try:
+        copy_file(src, dest)
+    except FileNotFoundError:
+        # Parent removed from the target behind our back
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        copy_file(src, dest)
+
+
+def _link_file(src: str, dest: Path, mode: str) -> None:
+    dest.unlink(missing_ok=True)
+    if mode == "symlink":
+        os.symlink(src, dest)
+        return
+    try:
+        os.link(src, dest)
+    except OSError as e:
+        if e.errno == errno.EXDEV:
+            raise OSError(
+                e.errno,
+                "Hardlinks need the project and the QGIS profile on the same "
+                "filesystem, use --link=symlink",
+                str(dest),
+            ) from e
+        raise
+
+
+def _run_tasks(tasks: Sequence[Callable[[], Any]], jobs: int = 1) -> None:
+    """Run I/O tasks, concurrently on a bounded thread pool when jobs > 1.
+
+    In parallel mode every task is attempted and failures are raised afterwards
+    in task order, so the reported error does not depend on thread scheduling.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            task()
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(task) for task in tasks]
+
+    errors = [e for e in (f.exception() for f in futures) if e is not None]
+    for extra in errors[1:]:
+        logger.error(f"  ❌ {extra}")
+    if errors:
+        raise errors[0]
+
+
+def _start_progress(
+    plan: SyncPlan,
+    target: Path,
+    progress: Callable[[SyncProgress], Any] | None,
+    skipped: int,
+    deletes: int,
+) -> _ProgressTracker | None:
+    if progress is None:
+        return None
+    state = SyncProgress(
+        target=target,
+        phase="start",
+        files_total=len(plan.adds) + len(plan.updates),
+        bytes_total=plan.bytes,
+        skipped=skipped,
+        deletes_total=deletes,
+    )
+    return _ProgressTracker(progress, state)
+
+
+def _track(
+    tasks: Sequence[Callable[[], Any]],
+    sizes: Sequence[int],
+    tracker: _ProgressTracker | None,
+    phase: str,
+) -> list[Callable[[], Any]]:
+    """Make each task report its completion to the tracker, if any."""
+    if tracker is None:
+        return list(tasks)
+    return [
+        partial(_tracked, task, tracker, phase, size)
+        for task, size in zip(tasks, sizes, strict=True)
+    ]
+
+
+def execute_sync_plan(
+    plan: SyncPlan,
+    jobs: int = 1,
+    progress: Callable[[SyncProgress], Any] | None = None,
+) -> DeployManifest:
+    """Apply a sync plan to its destination.
+
+    Args:
+        plan: Plan computed by :func:`plan_sync`.
+        jobs: Number of concurrent copy/delete workers.
+        progress: Called with :class:`SyncProgress` events, from the worker
+            threads, as files are copied and deleted.
+
+    Returns:
+        The manifest describing the synced destination.
+    """
+    dst = plan.dst
+    start = time.perf_counter()
+    tracker = _start_progress(
+        plan,
+        dst,
+        progress,
+        skipped=plan.counts["unchanged"],
+        deletes=len(plan.deletes) + len(plan.delete_trees),
+    )
+
+    dst.mkdir(parents=True, exist_ok=True)
+    for rel in plan.mkdirs:
+        (dst / rel).mkdir(exist_ok=True)
+
+    transfers = plan.transfers
+    if plan.link is not None:
+        tasks = [
+            partial(_link_file, os.path.abspath(a.source), dst / a.path, plan.link)
+            for a in transfers
+        ]
+    else:
+        tasks = [partial(_copy_file, a.source, dst / a.path) for a in transfers]
+    sizes = [0 if plan.link else a.size for a in transfers]
+    _run_tasks(_track(tasks, sizes, tracker, "copy"), jobs)
+    for action in transfers:
+        logger.debug(f"  ✅ {action.path} ({'linked' if plan.link else 'updated'})")
+
+    deletes: list[Callable[[], Any]] = [
+        partial((dst / rel).unlink, missing_ok=True) for rel in plan.deletes
+    ]
+    deletes += [partial(shutil.rmtree, dst / rel) for rel in plan.delete_trees]
+    _run_tasks(_track(deletes, [0] * len(deletes), tracker, "delete"), jobs)
+    for rel in sorted(plan.deletes + plan.delete_trees):
+        logger.debug(f"  🗑️ {rel} (removed from target)")
+
+    for rel in plan.prune_dirs:
+        try:
+            (dst / rel).rmdir()
+        except OSError:
+            continue  # Holds files we did not deploy
+        logger.debug(f"  🗑️ {rel} (removed from target)")
+
+    elapsed = time.perf_counter() - start
+    if transfers and plan.link is not None:
+        logger.info(f"🔗 {len(transfers)} {plan.link}s created in {elapsed:.2f}s")
+    elif transfers:
+        rate = plan.bytes / elapsed if elapsed > 0 else 0.0
+        logger.info(
+            f"📊 {len(transfers)} files copied ({format_bytes(plan.bytes)}) in "
+            f"{elapsed:.2f}s, {format_bytes(rate)}/s"
+            + (f" with {jobs} jobs" if jobs > 1 else "")
+        )
+
+    if tracker is not None:
+        tracker.emit("done")
+    return plan.manifest
+
+
+def _link_or_copy(existing: Path, source: str, dest: Path) -> None:
+    try:
+        os.link(existing, dest, follow_symlinks=False)
+    except OSError:
+        copy_file(source, dest)
+
+
+def stage_sync_plan(
+    plan: SyncPlan,
+    staging: Path,
+    jobs: int = 1,
+    store: ObjectStore | None = None,
+    progress: Callable[[SyncProgress], Any] | None = None,
+) -> DeployManifest:
+    """Build the synced destination in a new directory instead of in place.
+
+    Files the plan leaves unchanged are hardlinked from the current
+    destination, so staging costs one link per file plus the changed files.
+
+    Args:
+        plan: Plan computed by :func:`plan_sync` (without ``link``).
+        staging: New (missing or empty) directory, on the same filesystem
+            as the target.
+        jobs: Number of concurrent copy/link workers.
+        store: Object store the changed files are linked from, so contents
+            already stored (by another profile or a backup) are not copied.
+        progress: Called with :class:`SyncProgress` events as files are
+            staged. Hardlinked unchanged files count as skipped.
+
+    Returns:
+        The manifest describing the staged tree.
+    """
+    if plan.link is not None:
+        raise ValueError("Link farms cannot be staged")
+    if store is not None and not store.supports(staging.parent):
+        logger.debug(f"Object store not on the filesystem of {staging.parent}")
+        store = None
+
+    start = time.perf_counter()
+    staging.mkdir(exist_ok=True)
+    # Sorted paths list every parent before its children
+    for rel in sorted(plan.manifest.dirs):
+        (staging / rel).mkdir()
+
+    transfers = {a.path: a for a in plan.transfers}
+    tasks: list[Callable[[], Any]] = []
+    links: list[Callable[[], Any]] = []
+    sizes = []
+    for rel in sorted(plan.manifest.files):
+        action = transfers.get(rel)
+        if action is not None and store is not None:
+            digest = plan.manifest.files[rel].digest
+            tasks.append(partial(store.checkout, action.source, staging / rel, digest))
+        elif action is not None:
+            tasks.append(partial(_copy_file, action.source, staging / rel))
+        else:
+            source = str(plan.src / rel)
+            links.append(partial(_link_or_copy, plan.dst / rel, source, staging / rel))
+            continue
+        sizes.append(action.size)
+    linked = len(links)
+    tracker = _start_progress(plan, staging, progress, skipped=linked, deletes=0)
+    _run_tasks(links + _track(tasks, sizes, tracker, "copy"), jobs)
+
+    elapsed = time.perf_counter() - start
+    logger.info(
+        f"🏗️ Staged {len(transfers)} changed files ({format_bytes(plan.bytes)}) "
+        f"and {linked} hardlinks in {elapsed:.2f}s"
+    )
+    if tracker is not None:
+        tracker.emit("done")
+    return plan.manifest
+
+
+# From linux/fs.h
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+
+def exchange_directories(a: Path, b: Path) -> None:
+    """Swap two directories.
+
+    Uses ``renameat2(RENAME_EXCHANGE)`` on Linux, which is atomic: both paths
+    exist at every moment. Elsewhere, or if the filesystem does not support
+    it, falls back to three renames (the first path is briefly missing).
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+
+            libc = ctypes.CDLL(None, use_errno=True)
+            result = libc.renameat2(
+                AT_FDCWD, os.fsencode(a), AT_FDCWD, os.fsencode(b), RENAME_EXCHANGE
+            )
+            if result == 0:
+                return
+            logger.debug(f"renameat2 failed: {os.strerror(ctypes.get_errno())}")
+        except (OSError, AttributeError, TypeError):
+            pass  # Not available in this libc
+
+    tmp = a.with_name(f".{a.name}.swap")
+    os.rename(a, tmp)
+    try:
+        os.rename(b, a)
+    except OSError:
+        os.rename(tmp, a)
+        raise
+    os.rename(tmp, b)
+
+
+def sync_directory(
+    src: Path,
+    dst: Path,
+    matcher: IgnoreMatcher,
+    manifest: DeployManifest | None = None,
+    jobs: int = 1,
+    compare: str = "mtime",
+    link: str | None = None,
+) -> DeployManifest:
+    """Sync source to destination only copying changed files (rsync-like).
+
+    Plans the sync with :func:`plan_sync` (see it for the arguments) and
+    applies it with :func:`execute_sync_plan`, on ``jobs`` workers.
+
+    Returns:
+        The manifest describing the synced destination.
+    """
+    plan = plan_sync(src, dst, matcher, manifest=manifest, compare=compare, link=link)
+    return execute_sync_plan(plan, jobs=jobs)
@@ -30,6 +30,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from .discovery import walk_project
+from .ignore import IgnoreMatcher
+
 
 @dataclass
 class ValidationResult:
@@ -182,10 +185,12 @@ def validate_official_compliance(project_root: Path) -> ValidationResult:
 
     # 1. Prohibited binary extensions
     prohibited = [".so", ".dll", ".exe", ".dylib", ".pyd", ".pyc", ".pyo"]
-    found_binaries = []
-    for ext in prohibited:
-        for p in project_root.rglob(f"*{ext}"):
-            found_binaries.append(str(p.relative_to(project_root)))
+    matcher = IgnoreMatcher(project_root, include_dev=False)
+    found_binaries = [
+        rel
+        for rel, entry in walk_project(project_root, matcher)
+        if entry.name.endswith(tuple(prohibited))
+    ]
 
     if found_binaries:
         errors.append(
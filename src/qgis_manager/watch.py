@@ -0,0 +1,340 @@
+# /***************************************************************************
+#  QGIS Plugin Manager
+#                                  A CLI Tool
+#  Modern command-line interface for QGIS plugin development and deployment.
+#                               -------------------
+#         begin                : 2026-10-18
+#         copyright            : (C) 2026 by Juan M Bernales
+#         email                : juanbernales@gmail.com
+#  ***************************************************************************/
+#
+# /***************************************************************************
+#  *                                                                         *
+#  *   This program is free software; you can redistribute it and/or modify  *
+#  *   it under the terms of the GNU General Public License as published by  *
+#  *   the Free Software Foundation; either version 2 of the License, or     *
+#  *   (at your option) any later version.                                   *
+#  *                                                                         *
+#  ***************************************************************************/
+
+"""
+File watching for ``deploy --watch``.
+
+Changes are reported by inotify on Linux, or by periodically diffing a
+snapshot of the tree elsewhere. Events are grouped in debounced batches of
+relative paths, filtered by the project's ignore rules.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections.abc import Collection, Iterator
+from pathlib import Path
+from typing import Protocol
+
+from .discovery import find_project_files, walk_project
+from .ignore import IgnoreMatcher
+
+logger = logging.getLogger(__name__)
+
+# From sys/inotify.h
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Returned in a batch when events were lost and everything must be rescanned
+RESCAN = ""
+
+
+class Watcher(Protocol):
+    """Source of changed paths, relative to the watched root."""
+
+    def read(self, timeout: float) -> set[str]:
+        """Wait up to ``timeout`` seconds and return the paths changed since."""
+        ...
+
+    def close(self) -> None:
+        """Release the watcher resources."""
+        ...
+
+
+class InotifyWatcher:
+    """Recursive watcher built on Linux inotify (through ctypes).
+
+    Excluded directories are never watched, and watches are added for
+    directories created while watching.
+    """
+
+    def __init__(self, root: Path, matcher: IgnoreMatcher):
+        self.root = root
+        self.matcher = matcher
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._watches: dict[int, str] = {}
+        self._add_tree("")
+
+    def _add_watch(self, rel: str) -> None:
+        path = os.fsencode(self.root / rel if rel else self.root)
+        wd = self._libc.inotify_add_watch(self._fd, path, WATCH_MASK)
+        if wd < 0:
+            logger.debug(
+                f"Cannot watch {rel or '.'}: {os.strerror(ctypes.get_errno())}"
+            )
+            return
+        self._watches[wd] = rel
+
+    def _add_tree(self, rel: str) -> None:
+        self._add_watch(rel)
+        base = self.root / rel if rel else self.root
+        for sub_rel, entry in walk_project(base, self.matcher, include_dirs=True):
+            if entry.is_dir():
+                self._add_watch(f"{rel}/{sub_rel}" if rel else sub_rel)
+
+    def read(self, timeout: float) -> set[str]:
+        changed: set[str] = set()
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return changed
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.add(RESCAN)
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            parent = self._watches.get(wd)
+            if parent is None or not name:
+                continue
+
+            name_str = os.fsdecode(name)
+            rel = f"{parent}/{name_str}" if parent else name_str
+            if self.matcher.should_exclude(self.root / rel):
+                continue
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(rel)
+            changed.add(rel)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Portable watcher that diffs snapshots of (size, mtime) per path."""
+
+    def __init__(self, root: Path, matcher: IgnoreMatcher):
+        self.root = root
+        self.matcher = matcher
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int, bool]]:
+        snapshot = {}
+        for rel, entry in walk_project(
+            self.root, self.matcher, include_dirs=True, follow_symlinks=True
+        ):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            snapshot[rel] = (st.st_size, st.st_mtime_ns, entry.is_dir())
+        return snapshot
+
+    def read(self, timeout: float) -> set[str]:
+        time.sleep(timeout)
+        snapshot = self._scan()
+        previous, self._snapshot = self._snapshot, snapshot
+        changed = {
+            rel
+            for rel, state in snapshot.items()
+            if previous.get(rel) != state and not state[2]
+        }
+        # New directories (their files are new too) and removals
+        changed.update(rel for rel in snapshot.keys() - previous.keys())
+        changed.update(previous.keys() - snapshot.keys())
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def create_watcher(
+    root: Path, matcher: IgnoreMatcher, polling: bool = False
+) -> Watcher:
+    """Return an inotify watcher when available, a polling watcher otherwise."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root, matcher)
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify unavailable ({e}), polling for changes")
+    return PollingWatcher(root, matcher)
+
+
+def watch_batches(
+    watcher: Watcher, debounce: float = 0.3, poll_timeout: float = 1.0
+) -> Iterator[set[str]]:
+    """Yield changed paths in batches.
+
+    A batch starts with the first change and is closed once no further change
+    has been seen for ``debounce`` seconds, so a save touching several files
+    (or an editor writing through a temporary file) is applied once.
+
+    Args:
+        watcher: Source of changes.
+        debounce: Quiet period that closes a batch, in seconds.
+        poll_timeout: Maximum wait for the first change of a batch.
+
+    Yields:
+        Sets of changed POSIX paths relative to the watched root. A batch
+        containing :data:`RESCAN` means events were lost.
+    """
+    while True:
+        batch = watcher.read(poll_timeout)
+        if not batch:
+            continue
+        while more := watcher.read(debounce):
+            batch |= more
+        yield batch
+
+
+class OwnWrites:
+    """Files the watch loop writes itself, such as compiled Qt resources.
+
+    Each file is stamped with its size and mtime right after being written.
+    The next batch only drops it while it still has that stamp, so an edit
+    made after ours is still deployed.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._stamps: dict[str, tuple[int, int] | None] = {}
+
+    def _stamp(self, rel: str) -> tuple[int, int] | None:
+        try:
+            st = (self.root / rel).stat()
+        except OSError:
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def record(self, rel: str) -> None:
+        """Stamp a file just written, by its POSIX path relative to the root."""
+        self._stamps[rel] = self._stamp(rel)
+
+    def paths(self) -> set[str]:
+        """Return the files recorded since the last :meth:`filter`."""
+        return set(self._stamps)
+
+    def filter(self, batch: set[str]) -> set[str]:
+        """Return ``batch`` without our unchanged writes, and forget them."""
+        ours = {rel for rel, stamp in self._stamps.items() if self._stamp(rel) == stamp}
+        self._stamps = {}
+        return batch - ours
+
+
+def _qrc_dependencies(qrc: Path, project_root: Path) -> set[str]:
+    """Return the project-relative files referenced by a ``.qrc`` file."""
+    try:
+        tree = ET.parse(qrc)
+    except (ET.ParseError, OSError) as e:
+        logger.debug(f"Cannot parse {qrc}: {e}")
+        return set()
+
+    deps = set()
+    for node in tree.iter("file"):
+        if not node.text:
+            continue
+        path = (qrc.parent / node.text.strip()).resolve()
+        try:
+            deps.add(path.relative_to(project_root.resolve()).as_posix())
+        except ValueError:
+            continue
+    return deps
+
+
+class QtSourceIndex:
+    """Map changed files to the ``.qrc``/``.ts`` files that must be recompiled.
+
+    A ``.qrc`` file is affected when it or one of the files it lists changes,
+    a ``.ts`` file when it changes itself.
+    """
+
+    def __init__(self, project_root: Path):
+        self.project_root = project_root
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Rescan the project for Qt sources and their dependencies."""
+        root = self.project_root
+        self.qrc_files = {
+            qrc.relative_to(root).as_posix(): qrc
+            for qrc in find_project_files(root, ".qrc")
+        }
+        self.ts_files = {
+            ts.relative_to(root).as_posix(): ts
+            for ts in find_project_files(root, ".ts")
+        }
+        self.dependencies = {
+            rel: _qrc_dependencies(qrc, root) for rel, qrc in self.qrc_files.items()
+        }
+
+    def affected(self, changed: Collection[str]) -> list[Path]:
+        """Return the Qt sources to recompile for a batch of changed paths."""
+        changed = set(changed)
+        if RESCAN in changed or any(rel.endswith((".qrc", ".ts")) for rel in changed):
+            # Sources were added, removed or edited (a .qrc may list new files)
+            self.refresh()
+
+        if RESCAN in changed:
+            return [*self.qrc_files.values(), *self.ts_files.values()]
+
+        affected = [
+            qrc
+            for rel, qrc in self.qrc_files.items()
+            if rel in changed or self.dependencies[rel] & changed
+        ]
+        affected.extend(ts for rel, ts in self.ts_files.items() if rel in changed)
+        return affected
@@ -0,0 +1,416 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis_manager.backups import (
+    BackupIndex,
+    RetentionPolicy,
+    archive_backup,
+    backup_timestamp,
+    create_backup,
+    find_backup,
+    list_backups,
+    parse_size,
+    prune_backups,
+    register_backup,
+    restore_backup,
+    rollback,
+)
+from qgis_manager.core import deploy_plugin, rotate_backups
+from qgis_manager.manifest import DeployManifest
+
+
+class TestIncrementalBackups(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.target = self.root / "plugins" / "demo"
+        (self.target / "libs").mkdir(parents=True)
+        (self.target / "plugin.py").write_text("x = 1")
+        (self.target / "libs" / "vendored.py").write_text("big = True")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def backup(self, timestamp, incremental=True):
+        path = self.target.parent / f"demo.bak.{timestamp}"
+        return create_backup(self.target, path, incremental=incremental)
+
+    def test_unchanged_files_are_linked_to_previous_backup(self):
+        first = self.backup("20260101000000")
+        self.assertIsNone(first.previous)
+        self.assertEqual((first.linked, first.copied), (0, 2))
+
+        (self.target / "plugin.py").write_text("x = 22")
+        second = self.backup("20260102000000")
+        self.assertEqual(second.previous, first.path)
+        self.assertEqual((second.linked, second.copied), (1, 1))
+        self.assertEqual(second.bytes_copied, 6)
+
+        vendored = Path("libs") / "vendored.py"
+        self.assertEqual(
+            (first.path / vendored).stat().st_ino,
+            (second.path / vendored).stat().st_ino,
+        )
+        self.assertNotEqual(
+            (first.path / vendored).stat().st_ino,
+            (self.target / vendored).stat().st_ino,
+        )
+        self.assertEqual((first.path / "plugin.py").read_text(), "x = 1")
+        self.assertEqual((second.path / "plugin.py").read_text(), "x = 22")
+
+    def test_full_backup_copies_everything(self):
+        self.backup("20260101000000")
+        stats = self.backup("20260102000000", incremental=False)
+        self.assertIsNone(stats.previous)
+        self.assertEqual((stats.linked, stats.copied), (0, 2))
+
+    def test_rotation_keeps_linked_generations_intact(self):
+        for day in range(1, 5):
+            (self.target / "plugin.py").write_text(f"x = {day}")
+            self.backup(f"2026010{day}000000")
+
+        rotate_backups(self.target.parent, "demo", limit=2)
+
+        backups = list_backups(self.target.parent, "demo")
+        self.assertEqual(
+            [b.name for b in backups],
+            ["demo.bak.20260104000000", "demo.bak.20260103000000"],
+        )
+        for backup in backups:
+            self.assertEqual(
+                (backup / "libs" / "vendored.py").read_text(), "big = True"
+            )
+        self.assertEqual((backups[0] / "plugin.py").read_text(), "x = 4")
+        self.assertEqual((backups[1] / "plugin.py").read_text(), "x = 3")
+
+    def test_deploy_does_not_modify_linked_backups(self):
+        project = self.root / "project"
+        project.mkdir()
+        (project / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        (project / "plugin.py").write_text("x = 1")
+        plugins = self.target.parent
+
+        deploy_plugin(project, dest_dir=plugins, no_backup=True)
+        self.backup("20260101000000")
+        deploy_plugin(project, dest_dir=plugins)
+
+        backups = list_backups(plugins, "demo")
+        self.assertEqual(len(backups), 2)
+        self.assertEqual(
+            (backups[0] / "plugin.py").stat().st_ino,
+            (backups[1] / "plugin.py").stat().st_ino,
+        )
+
+        (project / "plugin.py").write_text("x = 2")
+        os.utime(project / "plugin.py", (2_000_000_000, 2_000_000_000))
+        deploy_plugin(project, dest_dir=plugins, no_backup=True)
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 2")
+        for backup in backups:
+            self.assertEqual((backup / "plugin.py").read_text(), "x = 1")
+
+
+class TestBackupArchives(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.archives = self.root / "archives"
+        self.project = self.root / "project"
+        self.project.mkdir()
+        (self.project / "metadata.txt").write_text("[general]\nname=Demo\nversion=1")
+        (self.project / "plugin.py").write_text("x = 1")
+        self.plugins = self.root / "plugins"
+        self.target = self.plugins / "demo"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_archive_and_restore_round_trip(self):
+        (self.target / "libs").mkdir(parents=True)
+        (self.target / "libs" / "lib.py").write_text("lib = 1")
+        (self.target / "plugin.py").symlink_to(self.project / "plugin.py")
+
+        archive = archive_backup(
+            self.target, self.archives, "demo", "20260101000000", "xz"
+        )
+        self.assertEqual(archive.name, "demo.bak.20260101000000.tar.xz")
+        self.assertEqual(
+            sorted(os.listdir(self.archives)), [".demo.backups.json", archive.name]
+        )
+
+        shutil.rmtree(self.target)
+        self.assertIsNone(restore_backup(archive, self.target))
+        self.assertEqual((self.target / "libs" / "lib.py").read_text(), "lib = 1")
+        # Symlinks are archived as the files they point to
+        self.assertFalse((self.target / "plugin.py").is_symlink())
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 1")
+        self.assertEqual([p.name for p in self.plugins.iterdir()], ["demo"])
+
+    def test_archives_in_the_same_second_are_kept_apart(self):
+        self.target.mkdir(parents=True)
+        names = []
+        for version, compression in (("1", "gz"), ("2", "gz"), ("3", "xz")):
+            (self.target / "plugin.py").write_text(version)
+            archive = archive_backup(
+                self.target, self.archives, "demo", "20260101000000", compression
+            )
+            names.append(archive.name)
+
+        self.assertEqual(
+            names,
+            [
+                "demo.bak.20260101000000.tar.gz",
+                "demo.bak.20260101000000-1.tar.gz",
+                "demo.bak.20260101000000-2.tar.xz",
+            ],
+        )
+        first = find_backup(self.archives, "demo", "20260101000000", archive=True)
+        shutil.rmtree(self.target)
+        restore_backup(first, self.target)
+        self.assertEqual((self.target / "plugin.py").read_text(), "1")
+
+    def test_restore_archives_the_replaced_version(self):
+        self.target.mkdir(parents=True)
+        (self.target / "plugin.py").write_text("old")
+        archive = archive_backup(self.target, self.archives, "demo", "20260101000000")
+        (self.target / "plugin.py").write_text("new")
+
+        previous = restore_backup(archive, self.target, archive_dir=self.archives)
+        self.assertEqual((self.target / "plugin.py").read_text(), "old")
+        self.assertEqual(find_backup(self.archives, "demo", archive=True), previous)
+        self.assertEqual(
+            find_backup(self.archives, "demo", "20260101000000", archive=True), archive
+        )
+        with self.assertRaises(FileNotFoundError):
+            find_backup(self.archives, "demo", "19990101000000", archive=True)
+
+    def test_deploy_archives_backups_outside_the_profile(self):
+        deploy_plugin(self.project, dest_dir=self.plugins, no_backup=True)
+        for day in range(1, 4):
+            (self.project / "plugin.py").write_text(f"x = {day + 1}")
+            with patch("qgis_manager.core.datetime") as mock_datetime:
+                mock_datetime.now.return_value.strftime.return_value = (
+                    f"2026010{day}000000"
+                )
+                deploy_plugin(
+                    self.project,
+                    dest_dir=self.plugins,
+                    archive="gz",
+                    archive_dir=self.archives,
+                    max_backups=2,
+                )
+
+        self.assertEqual([p.name for p in self.plugins.iterdir()], ["demo"])
+        self.assertEqual(
+            [p.name for p in list_backups(self.archives, "demo")],
+            ["demo.bak.20260103000000.tar.gz", "demo.bak.20260102000000.tar.gz"],
+        )
+        restore_backup(find_backup(self.archives, "demo", archive=True), self.target)
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 3")
+
+    def test_atomic_deploy_archives_previous_version(self):
+        deploy_plugin(self.project, dest_dir=self.plugins, no_backup=True)
+        (self.project / "plugin.py").write_text("x = 2")
+        deploy_plugin(
+            self.project,
+            dest_dir=self.plugins,
+            atomic=True,
+            archive="gz",
+            archive_dir=self.archives,
+        )
+
+        self.assertEqual([p.name for p in self.plugins.iterdir()], ["demo"])
+        (archive,) = list_backups(self.archives, "demo")
+        restore_backup(archive, self.target)
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 1")
+
+
+class TestRollback(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.plugins = Path(self.tmp.name)
+        self.target = self.plugins / "demo"
+        for version, timestamp in [("1", "20260101000000"), ("2", "20260102000000")]:
+            backup = self.plugins / f"demo.bak.{timestamp}"
+            backup.mkdir()
+            (backup / "plugin.py").write_text(f"x = {version}")
+        self.target.mkdir()
+        (self.target / "plugin.py").write_text("x = 3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rollback_swaps_newest_backup_without_copying(self):
+        ino = (self.plugins / "demo.bak.20260102000000" / "plugin.py").stat().st_ino
+        current_ino = (self.target / "plugin.py").stat().st_ino
+
+        backup, replaced = rollback(self.target)
+
+        self.assertEqual(backup.name, "demo.bak.20260102000000")
+        self.assertEqual((self.target / "plugin.py").stat().st_ino, ino)
+        self.assertEqual((replaced / "plugin.py").stat().st_ino, current_ino)
+        self.assertEqual(
+            [b.name for b in list_backups(self.plugins, "demo")],
+            [replaced.name, "demo.bak.20260101000000"],
+        )
+
+    def test_rollback_to_timestamp_and_back(self):
+        _, replaced = rollback(self.target, "20260101000000")
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 1")
+
+        rollback(self.target, backup_timestamp(replaced))
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 3")
+        self.assertEqual(len(list_backups(self.plugins, "demo")), 2)
+
+        with self.assertRaises(FileNotFoundError):
+            rollback(self.target, "19990101000000")
+
+    def test_rollback_discards_link_farm(self):
+        (self.target / "plugin.py").unlink()
+        (self.target / "plugin.py").symlink_to(self.plugins / "elsewhere.py")
+        DeployManifest(source="/src", link="symlink").save(self.target)
+
+        _, replaced = rollback(self.target)
+        self.assertIsNone(replaced)
+        self.assertEqual((self.target / "plugin.py").read_text(), "x = 2")
+        self.assertEqual(len(list_backups(self.plugins, "demo")), 1)
+
+
+class TestRetention(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.plugins = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_backups(self, timestamps):
+        for timestamp in timestamps:
+            backup = self.plugins / f"demo.bak.{timestamp}"
+            backup.mkdir()
+            (backup / "plugin.py").write_text("x" * 100)
+            register_backup(backup)
+
+    def names(self, backups):
+        return [(f"demo.bak.{t}", size) for t, size in backups]
+
+    def test_keep_last_daily_and_weekly(self):
+        backups = self.names(
+            [
+                ("20260115120000", 1),
+                ("20260115090000", 1),
+                ("20260114120000", 1),
+                ("20260113120000", 1),
+                ("20260106120000", 1),
+                ("20260101120000", 1),
+            ]
+        )
+        self.assertEqual(
+            RetentionPolicy(keep_last=2).select(backups),
+            ["demo.bak.20260115120000", "demo.bak.20260115090000"],
+        )
+        self.assertEqual(
+            RetentionPolicy(keep_last=1, keep_daily=3).select(backups),
+            [
+                "demo.bak.20260115120000",
+                "demo.bak.20260114120000",
+                "demo.bak.20260113120000",
+            ],
+        )
+        # 2026-01-12..18 is ISO week 3, 01-05..11 week 2, 01-01 week 1
+        self.assertEqual(
+            RetentionPolicy(keep_last=0, keep_weekly=3).select(backups),
+            [
+                "demo.bak.20260115120000",
+                "demo.bak.20260106120000",
+                "demo.bak.20260101120000",
+            ],
+        )
+        self.assertEqual(len(RetentionPolicy(keep_last=0).select(backups)), 6)
+
+    def test_size_budget_keeps_newest(self):
+        backups = self.names([("20260103000000", 60), ("20260102000000", 60)])
+        policy = RetentionPolicy(keep_last=5, max_bytes=100)
+        self.assertEqual(policy.select(backups), ["demo.bak.20260103000000"])
+        policy = RetentionPolicy(keep_last=5, max_bytes=10)
+        self.assertEqual(policy.select(backups), ["demo.bak.20260103000000"])
+
+    def test_size_budget_charges_the_oldest_kept_backup_in_full(self):
+        old, middle, new = (
+            self.plugins / f"demo.bak.2026010{day}000000" for day in (1, 2, 3)
+        )
+        for backup in (old, middle, new):
+            backup.mkdir()
+        (old / "plugin.py").write_text("x" * 100)
+        register_backup(old, 100)
+        # An incremental backup linking the unchanged file of the older one
+        os.link(old / "plugin.py", middle / "plugin.py")
+        register_backup(middle, 0)
+        (new / "plugin.py").write_text("y" * 100)
+        register_backup(new, 100)
+
+        # Once the oldest goes, the middle one holds 100 bytes on its own;
+        # the sizes come from the index, no backup is walked
+        policy = RetentionPolicy(keep_last=2, max_bytes=150)
+        with patch("qgis_manager.backups._tree_size", side_effect=AssertionError):
+            prune_backups(self.plugins, "demo", policy)
+        self.assertEqual(
+            [p.name for p in list_backups(self.plugins, "demo")], [new.name]
+        )
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size(1024), 1024)
+        self.assertEqual(parse_size("2048"), 2048)
+        self.assertEqual(parse_size("500M"), 500 * 1024**2)
+        self.assertEqual(parse_size("1.5GB"), int(1.5 * 1024**3))
+        self.assertEqual(parse_size("2KiB"), 2048)
+
+    def test_listing_reads_the_index_without_scanning(self):
+        self.make_backups(["20260101000000", "20260102000000"])
+        index = BackupIndex(self.plugins, "demo")
+        self.assertEqual(index.backups["demo.bak.20260101000000"], 100)
+
+        with patch.object(Path, "iterdir", side_effect=AssertionError("scanned")):
+            backups = list_backups(self.plugins, "demo")
+        self.assertEqual(
+            [b.name for b in backups],
+            ["demo.bak.20260102000000", "demo.bak.20260101000000"],
+        )
+
+    def test_background_pruning(self):
+        self.make_backups([f"2026010{day}000000" for day in range(1, 6)])
+
+        thread = rotate_backups(self.plugins, "demo", 2, background=True)
+        # Pruned backups disappear from listings before the deletion ends
+        self.assertEqual(len(list_backups(self.plugins, "demo")), 2)
+        thread.join()
+
+        self.assertEqual(
+            sorted(p.name for p in self.plugins.iterdir()),
+            [
+                ".demo.backups.json",
+                "demo.bak.20260104000000",
+                "demo.bak.20260105000000",
+            ],
+        )
+        self.assertEqual(BackupIndex(self.plugins, "demo").trash, [])
+
+    def test_interrupted_deletion_is_resumed(self):
+        self.make_backups(["20260101000000", "20260102000000"])
+        with patch("qgis_manager.backups.shutil.rmtree"):
+            rotate_backups(self.plugins, "demo", 1)
+        self.assertEqual(
+            BackupIndex(self.plugins, "demo").trash,
+            [".demo.bak.20260101000000.deleting"],
+        )
+
+        rotate_backups(self.plugins, "demo", 1)
+        self.assertFalse((self.plugins / ".demo.bak.20260101000000.deleting").exists())
+        self.assertEqual(BackupIndex(self.plugins, "demo").trash, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
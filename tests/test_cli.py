@@ -76,6 +76,89 @@ class TestCLI(unittest.TestCase):
             tmp_path, "docs", callback=unittest.mock.ANY
         )
 
+    def test_cli_ignore_explain(self):
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir).resolve()
+            (root / "metadata.txt").touch()
+            exit_code, output, _ = self._invoke(
+                ["ignore", "explain", str(root / "__pycache__" / "x.pyc")]
+            )
+            self.assertEqual(exit_code, 0)
+            self.assertIn("excluded", output)
+            self.assertIn("'__pycache__' (default)", output)
+
+    def test_cli_deploy_plan_json(self):
+        import json
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir).resolve() / "demo"
+            root.mkdir()
+            (root / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+            (root / "plugin.py").write_text("x = 1")
+            plugins = Path(tmp_dir) / "plugins"
+
+            with patch("qgis_manager.core.get_qgis_plugin_dir", return_value=plugins):
+                exit_code, output, _ = self._invoke(
+                    ["deploy", str(root), "--json", "--no-compile"]
+                )
+
+            self.assertEqual(exit_code, 0)
+            plan = json.loads(output)
+            self.assertEqual(plan["counts"]["adds"], 2)
+            self.assertIn({"path": "plugin.py", "size": 5}, plan["adds"])
+            # Nothing was deployed
+            self.assertFalse(plugins.exists())
+
+    def test_cli_restore_from_archive(self):
+        import os
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir).resolve() / "demo"
+            root.mkdir()
+            (root / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+            (root / "plugin.py").write_text("x = 1")
+            plugins = Path(tmp_dir) / "plugins"
+            env = {"XDG_DATA_HOME": str(Path(tmp_dir) / "data")}
+
+            with (
+                patch.dict(os.environ, env),
+                patch("qgis_manager.core.get_qgis_plugin_dir", return_value=plugins),
+                patch(
+                    "qgis_manager.cli.commands.restore.get_qgis_plugin_dir",
+                    return_value=plugins,
+                ),
+            ):
+                deploy = ["deploy", str(root), "--no-compile", "--archive"]
+                self.assertEqual(self._invoke(deploy + ["--no-backup"])[0], 0)
+                (root / "plugin.py").write_text("x = 2")
+                self.assertEqual(self._invoke(deploy)[0], 0)
+
+                # A second archive taken in the same second
+                from qgis_manager.backups import (
+                    archive_backup,
+                    backup_timestamp,
+                    get_archive_dir,
+                    list_backups,
+                )
+
+                (archive,) = list_backups(get_archive_dir(), "demo")
+                timestamp = backup_timestamp(archive)
+                archive_backup(plugins / "demo", get_archive_dir(), "demo", timestamp)
+
+                exit_code, output, _ = self._invoke(["restore", str(root), "--list"])
+                self.assertEqual(exit_code, 0)
+                self.assertIn(".tar.gz", output)
+                self.assertIn(f"{timestamp}-1  ", output)
+
+                restore = ["restore", str(root), "--from", timestamp, "--no-backup"]
+                exit_code, _, _ = self._invoke(restore)
+                self.assertEqual(exit_code, 0)
+                self.assertEqual((plugins / "demo" / "plugin.py").read_text(), "x = 1")
+
 
 if __name__ == "__main__":
     unittest.main()
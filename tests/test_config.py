@@ -38,6 +38,47 @@ pre-deploy = "echo 1"
             self.assertFalse(settings.auto_compile)
             self.assertEqual(settings.hooks["pre-deploy"], "echo 1")
 
+    def test_retention_settings(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "pyproject.toml").write_text(
+                """
+[tool.qgis-manager]
+max_backups = 2
+keep_daily = 7
+keep_weekly = 4
+backup_budget = "1G"
+""",
+                encoding="utf-8",
+            )
+
+            policy = load_project_config(tmp_path, Settings()).retention_policy()
+            self.assertEqual(policy.keep_last, 2)
+            self.assertEqual(policy.keep_daily, 7)
+            self.assertEqual(policy.keep_weekly, 4)
+            self.assertEqual(policy.max_bytes, 1024**3)
+
+    def test_compression_settings(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "pyproject.toml").write_text(
+                """
+[tool.qgis-manager]
+compression_level = 9
+compression_auto = false
+
+[tool.qgis-manager.compression]
+"*.qm" = "store"
+"help/*" = 1
+""",
+                encoding="utf-8",
+            )
+
+            policy = load_project_config(tmp_path, Settings()).compression_policy()
+            self.assertEqual(policy.rules[:2], [("*.qm", "store"), ("help/*", 1)])
+            self.assertEqual(policy.level, 9)
+            self.assertFalse(policy.auto)
+
     @patch("pathlib.Path.home")
     def test_load_config_no_file(self, mock_home):
         mock_home.return_value = Path("/nonexistent")
@@ -0,0 +1,93 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis_manager import copying
+from qgis_manager.copying import COPY_BACKENDS, copy_file, get_copy_backends
+
+
+class TestCopyBackends(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.src = self.root / "layer.gpkg"
+        self.src.write_bytes(os.urandom(256 * 1024))
+        os.utime(self.src, (1_000_000, 1_000_000))
+        copying._backends.clear()
+
+    def tearDown(self):
+        copying._backends.clear()
+        self.tmp.cleanup()
+
+    def test_copy_preserves_content_and_metadata(self):
+        dst = self.root / "copy.gpkg"
+        self.assertEqual(copy_file(self.src, dst), dst)
+        self.assertEqual(dst.read_bytes(), self.src.read_bytes())
+        self.assertEqual(dst.stat().st_mtime, self.src.stat().st_mtime)
+        self.assertIn("copyfile", get_copy_backends(self.src, dst))
+
+    def test_unsupported_backend_is_disabled_once(self):
+        dst = self.root / "copy.gpkg"
+        calls = []
+
+        def unsupported(src_fd, dst_fd, size):
+            calls.append(size)
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        backends = {"reflink": unsupported, "copy_file_range": unsupported}
+        with patch.dict(copying._FD_BACKENDS, backends):
+            copy_file(self.src, dst)
+            copy_file(self.src, self.root / "again.gpkg")
+
+        self.assertEqual(dst.read_bytes(), self.src.read_bytes())
+        self.assertEqual(get_copy_backends(self.src, dst), ["copyfile"])
+        # Each backend was probed once, then skipped for this device pair
+        self.assertLessEqual(len(calls), 2)
+
+    def test_copy_file_range_copying_nothing_falls_back(self):
+        dst = self.root / "copy.gpkg"
+
+        def no_reflink(src_fd, dst_fd, size):
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        with (
+            patch.object(copying, "_platform_backends", lambda: list(COPY_BACKENDS)),
+            patch.dict(copying._FD_BACKENDS, {"reflink": no_reflink}),
+            patch.object(copying.os, "copy_file_range", return_value=0, create=True),
+        ):
+            copy_file(self.src, dst)
+
+        self.assertEqual(dst.read_bytes(), self.src.read_bytes())
+        self.assertEqual(get_copy_backends(self.src, dst), ["copyfile"])
+
+    def test_real_errors_propagate(self):
+        for code in (errno.ENOSPC, errno.EPERM, errno.EBADF):
+
+            def failing(src_fd, dst_fd, size, code=code):
+                raise OSError(code, os.strerror(code))
+
+            backends = {"reflink": failing, "copy_file_range": failing}
+            with patch.dict(copying._FD_BACKENDS, backends):
+                with self.assertRaises(OSError) as raised:
+                    copy_file(self.src, self.root / "copy.gpkg")
+            self.assertEqual(raised.exception.errno, code)
+            # The backend stays enabled: the error was not about support
+            self.assertIn(
+                get_copy_backends(self.src, self.root)[0],
+                ("reflink", "copy_file_range"),
+            )
+
+    def test_usable_as_copytree_copy_function(self):
+        tree = self.root / "tree"
+        (tree / "sub").mkdir(parents=True)
+        (tree / "sub" / "a.txt").write_text("a")
+        shutil.copytree(tree, self.root / "backup", copy_function=copy_file)
+        self.assertEqual((self.root / "backup" / "sub" / "a.txt").read_text(), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
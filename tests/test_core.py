@@ -8,6 +8,8 @@ from qgis_manager.core import (
     compile_docs,
     compile_qt_resources,
     deploy_plugin,
+    deploy_to_profiles,
+    discover_qgis_profiles,
     get_qgis_plugin_dir,
     init_plugin_project,
 )
@@ -52,7 +54,7 @@ class TestCore(unittest.TestCase):
             get_qgis_plugin_dir()
 
     @patch("qgis_manager.core.get_plugin_metadata")
-    @patch("qgis_manager.core.sync_directory")
+    @patch("qgis_manager.core.execute_sync_plan")
     def test_deploy_plugin(self, mock_sync, mock_get_meta):
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
@@ -74,7 +76,7 @@ class TestCore(unittest.TestCase):
     @patch("qgis_manager.core.get_plugin_metadata")
     @patch("shutil.copytree")
     @patch("qgis_manager.core.datetime")
-    @patch("qgis_manager.core.sync_directory")
+    @patch("qgis_manager.core.execute_sync_plan")
     def test_deploy_plugin_with_backup(
         self, mock_sync, mock_datetime, mock_copytree, mock_get_meta
     ):
@@ -156,7 +158,7 @@ class TestCore(unittest.TestCase):
             self.assertIn("description=Cool description", content)
 
     @patch("qgis_manager.core.get_plugin_metadata")
-    @patch("qgis_manager.core.sync_directory")
+    @patch("qgis_manager.core.execute_sync_plan")
     def test_deploy_plugin_with_callback(self, mock_sync, mock_get_meta):
         with tempfile.TemporaryDirectory() as tmp_dir:
             tmp_path = Path(tmp_dir)
@@ -237,6 +239,60 @@ class TestCore(unittest.TestCase):
             self.assertIn("DONE:Documentación", callback_lines)
             self.assertIn("START:Documentación (html)", callback_lines)
 
+    @patch("sys.platform", "linux")
+    def test_get_qgis_plugin_dir_qgis4_profile(self):
+        expected = Path.home() / ".local/share/QGIS/QGIS4/profiles/dev/python/plugins"
+        self.assertEqual(get_qgis_plugin_dir(profile="QGIS4/dev"), expected)
+
+    @patch("sys.platform", "linux")
+    def test_discover_qgis_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            home = Path(tmp_dir)
+            share = home / ".local/share/QGIS"
+            for profile in ("default", "qa"):
+                (share / "QGIS3/profiles" / profile).mkdir(parents=True)
+            (share / "QGIS3/profiles/profiles.ini").touch()
+            (share / "QGIS4/profiles/default").mkdir(parents=True)
+
+            with patch.object(Path, "home", return_value=home):
+                self.assertEqual(
+                    discover_qgis_profiles(), ["default", "qa", "QGIS4/default"]
+                )
+
+    @patch("sys.platform", "linux")
+    def test_deploy_to_profiles_scans_once(self):
+        from qgis_manager import core
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            home = Path(tmp_dir) / "home"
+            root = Path(tmp_dir) / "demo"
+            root.mkdir()
+            (root / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+            (root / "plugin.py").write_text("x = 1")
+
+            profiles = ["dev", "qa", "QGIS4/demo"]
+            with (
+                patch.object(Path, "home", return_value=home),
+                patch.object(core, "scan_source", wraps=core.scan_source) as scan,
+            ):
+                results = deploy_to_profiles(root, profiles, no_backup=True)
+                scan.assert_called_once()
+
+                self.assertEqual([r.profile for r in results], profiles)
+                for result in results:
+                    self.assertIsNone(result.error)
+                    self.assertTrue((result.target / "plugin.py").exists())
+                    self.assertEqual(result.plan.counts["adds"], 2)
+
+                # The same plugins directory twice is deployed once
+                with patch.object(
+                    core, "deploy_plugin", wraps=core.deploy_plugin
+                ) as deploy:
+                    results = deploy_to_profiles(root, ["qa", "dev", "qa"])
+                self.assertEqual(deploy.call_count, 2)
+                self.assertEqual([r.profile for r in results], ["qa", "dev", "qa"])
+                self.assertIs(results[0].plan, results[2].plan)
+
 
 if __name__ == "__main__":
     unittest.main()
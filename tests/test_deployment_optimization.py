@@ -1,9 +1,13 @@
+import json
+import os
 import shutil
 import tempfile
 import time
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
+from src.qgis_manager.constants import MANIFEST_FILENAME
 from src.qgis_manager.core import rotate_backups, sync_directory
 from src.qgis_manager.ignore import IgnoreMatcher
 
@@ -89,6 +93,407 @@ class TestDeploymentOptimization(unittest.TestCase):
         self.assertFalse((self.dst / "file2.txt").exists())
         self.assertTrue((self.dst / "file1.txt").exists())
 
+    def test_sync_directory_with_manifest(self):
+        (self.src / "file1.txt").write_text("content1")
+        (self.src / "subdir").mkdir()
+        (self.src / "subdir" / "file2.txt").write_text("content2")
+        manifest = sync_directory(self.src, self.dst, self.matcher)
+        self.assertEqual(set(manifest.files), {"file1.txt", "subdir/file2.txt"})
+        self.assertEqual(manifest.dirs, {"subdir"})
+
+        # Unchanged files are decided from the manifest, not the target
+        (self.dst / "file1.txt").write_text("edited in target")
+        (self.src / "subdir" / "file2.txt").unlink()
+        (self.src / "subdir").rmdir()
+        (self.src / "file3.txt").write_text("content3")
+
+        real_stat = Path.stat
+        stat_calls = []
+
+        def recording_stat(path, *args, **kwargs):
+            stat_calls.append(path)
+            return real_stat(path, *args, **kwargs)
+
+        with patch.object(Path, "stat", recording_stat):
+            manifest = sync_directory(
+                self.src, self.dst, self.matcher, manifest=manifest
+            )
+
+        self.assertFalse([p for p in stat_calls if self.dst in p.parents])
+
+        self.assertEqual((self.dst / "file1.txt").read_text(), "edited in target")
+        self.assertTrue((self.dst / "file3.txt").exists())
+        self.assertFalse((self.dst / "subdir").exists())
+        self.assertEqual(set(manifest.files), {"file1.txt", "file3.txt"})
+
+    def test_deploy_writes_manifest(self):
+        from src.qgis_manager.constants import MANIFEST_FILENAME
+        from src.qgis_manager.core import deploy_plugin
+        from src.qgis_manager.manifest import DeployManifest
+
+        (self.src / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        (self.src / "plugin.py").write_text("x = 1")
+        deploy_plugin(self.src, dest_dir=self.dst, no_backup=True)
+
+        target = self.dst / "demo"
+        self.assertTrue((target / MANIFEST_FILENAME).exists())
+        manifest = DeployManifest.load(target)
+        self.assertIsNotNone(manifest)
+        assert manifest is not None
+        self.assertIn("plugin.py", manifest.files)
+
+        # A stray file not created by a deploy is left alone in manifest mode
+        (target / "user_notes.txt").write_text("keep me")
+        (self.src / "plugin.py").unlink()
+        deploy_plugin(self.src, dest_dir=self.dst, no_backup=True)
+        self.assertFalse((target / "plugin.py").exists())
+        self.assertTrue((target / "user_notes.txt").exists())
+
+    def test_sync_directory_parallel(self):
+        for i in range(20):
+            sub = self.src / f"dir{i % 4}"
+            sub.mkdir(exist_ok=True)
+            (sub / f"file{i}.txt").write_text(f"content{i}")
+        (self.dst / "stale.txt").write_text("old")
+
+        manifest = sync_directory(self.src, self.dst, self.matcher, jobs=4)
+
+        self.assertEqual(len(manifest.files), 20)
+        self.assertFalse((self.dst / "stale.txt").exists())
+        for i in range(20):
+            target = self.dst / f"dir{i % 4}" / f"file{i}.txt"
+            self.assertEqual(target.read_text(), f"content{i}")
+
+    def test_sync_directory_parallel_error_is_deterministic(self):
+        for name in ("a.txt", "b.txt", "c.txt"):
+            (self.src / name).write_text(name)
+
+        def failing_copy(src, dst):
+            if Path(src).name != "a.txt":
+                raise OSError(f"cannot copy {Path(src).name}")
+            shutil.copy2(src, dst)
+
+        with patch("src.qgis_manager.sync.copy_file", side_effect=failing_copy):
+            with self.assertRaisesRegex(OSError, "cannot copy b.txt"):
+                sync_directory(self.src, self.dst, self.matcher, jobs=3)
+
+        # Every copy was attempted, not only those before the first failure
+        self.assertTrue((self.dst / "a.txt").exists())
+
+    def test_sync_directory_hash_compare(self):
+        (self.src / "file1.txt").write_text("content1")
+        (self.src / "file2.txt").write_text("content2")
+
+        with patch.dict("os.environ", {"XDG_CACHE_HOME": str(self.test_dir / "c")}):
+            manifest = sync_directory(self.src, self.dst, self.matcher, compare="hash")
+            self.assertIsNotNone(manifest.files["file1.txt"].digest)
+
+            # A checkout touches every mtime but changes only one file
+            future = time.time() + 100
+            for name in ("file1.txt", "file2.txt"):
+                os.utime(self.src / name, (future, future))
+            (self.src / "file2.txt").write_text("CONTENT2")
+
+            with patch("src.qgis_manager.sync._copy_file") as mock_copy:
+                sync_directory(
+                    self.src, self.dst, self.matcher, manifest=manifest, compare="hash"
+                )
+                copied = [call.args[1].name for call in mock_copy.call_args_list]
+            self.assertEqual(copied, ["file2.txt"])
+
+            # Without a manifest the target content is hashed instead
+            with patch("src.qgis_manager.sync._copy_file") as mock_copy:
+                sync_directory(self.src, self.dst, self.matcher, compare="hash")
+                copied = [call.args[1].name for call in mock_copy.call_args_list]
+            self.assertEqual(copied, ["file2.txt"])
+
+    def test_sync_directory_symlink_farm(self):
+        (self.src / "plugin.py").write_text("x = 1")
+        (self.src / "sub").mkdir()
+        (self.src / "sub" / "util.py").write_text("y = 2")
+
+        manifest = sync_directory(self.src, self.dst, self.matcher, link="symlink")
+        self.assertEqual(manifest.link, "symlink")
+        self.assertTrue((self.dst / "plugin.py").is_symlink())
+        self.assertTrue((self.dst / "sub").is_dir())
+        self.assertFalse((self.dst / "sub").is_symlink())
+
+        # Edits show up without a deploy; only additions/removals relink
+        (self.src / "plugin.py").write_text("x = 42")
+        self.assertEqual((self.dst / "plugin.py").read_text(), "x = 42")
+        (self.src / "sub" / "util.py").unlink()
+        (self.src / "new.py").write_text("z = 3")
+        with patch("src.qgis_manager.sync._link_file") as mock_link:
+            manifest = sync_directory(
+                self.src, self.dst, self.matcher, manifest=manifest, link="symlink"
+            )
+            linked = [call.args[1].name for call in mock_link.call_args_list]
+        self.assertEqual(linked, ["new.py"])
+        self.assertFalse((self.dst / "sub" / "util.py").exists())
+
+    def test_sync_directory_materializes_link_farm(self):
+        (self.src / "plugin.py").write_text("x = 1")
+        manifest = sync_directory(self.src, self.dst, self.matcher, link="hardlink")
+        self.assertEqual(
+            (self.dst / "plugin.py").stat().st_ino,
+            (self.src / "plugin.py").stat().st_ino,
+        )
+
+        manifest = sync_directory(self.src, self.dst, self.matcher, manifest=manifest)
+        self.assertIsNone(manifest.link)
+        self.assertNotEqual(
+            (self.dst / "plugin.py").stat().st_ino,
+            (self.src / "plugin.py").stat().st_ino,
+        )
+        # Writing the copy must not touch the source
+        (self.dst / "plugin.py").write_text("changed")
+        self.assertEqual((self.src / "plugin.py").read_text(), "x = 1")
+
+    def test_sync_directory_replaces_symlinks_without_manifest(self):
+        (self.src / "plugin.py").write_text("x = 1")
+        sync_directory(self.src, self.dst, self.matcher, link="symlink")
+        sync_directory(self.src, self.dst, self.matcher)
+        self.assertFalse((self.dst / "plugin.py").is_symlink())
+        self.assertEqual((self.dst / "plugin.py").read_text(), "x = 1")
+
+    def test_plan_sync_does_not_touch_destination(self):
+        from src.qgis_manager.core import execute_sync_plan, plan_sync
+
+        (self.src / "keep.txt").write_text("same")
+        (self.src / "change.txt").write_text("new content")
+        (self.src / "sub").mkdir()
+        (self.src / "sub" / "add.txt").write_text("added")
+        sync_directory(self.src, self.dst, self.matcher)
+        (self.src / "sub" / "add.txt").unlink()
+        (self.src / "sub" / "new.txt").write_text("added")
+        (self.src / "change.txt").write_text("newer content")
+        (self.dst / "stale.txt").write_text("old")
+
+        before = sorted(p.name for p in self.dst.rglob("*"))
+        plan = plan_sync(self.src, self.dst, self.matcher)
+        self.assertEqual(sorted(p.name for p in self.dst.rglob("*")), before)
+
+        self.assertEqual([a.path for a in plan.adds], ["sub/new.txt"])
+        self.assertEqual([a.path for a in plan.updates], ["change.txt"])
+        self.assertEqual(plan.deletes, ["stale.txt", "sub/add.txt"])
+        self.assertEqual(plan.bytes, len("added") + len("newer content"))
+        self.assertEqual(
+            plan.counts, {"adds": 1, "updates": 1, "deletes": 2, "unchanged": 1}
+        )
+
+        execute_sync_plan(plan)
+        self.assertTrue(plan_sync(self.src, self.dst, self.matcher).is_empty)
+
+    def test_execute_sync_plan_reports_progress(self):
+        from src.qgis_manager.core import execute_sync_plan, plan_sync
+
+        (self.src / "keep.txt").write_text("same")
+        sync_directory(self.src, self.dst, self.matcher)
+        (self.src / "a.txt").write_text("aaaa")
+        (self.src / "b.txt").write_text("bb")
+        (self.dst / "stale.txt").write_text("old")
+
+        events = []
+        plan = plan_sync(self.src, self.dst, self.matcher)
+        execute_sync_plan(plan, jobs=2, progress=events.append)
+
+        self.assertEqual(events[0].phase, "start")
+        self.assertEqual((events[0].files_total, events[0].bytes_total), (2, 6))
+        self.assertEqual((events[0].files_done, events[0].bytes_done), (0, 0))
+        last = events[-1]
+        self.assertEqual(last.phase, "done")
+        self.assertEqual((last.files_done, last.bytes_done), (2, 6))
+        self.assertEqual((last.skipped, last.deletes_total, last.deleted), (1, 1, 1))
+        self.assertEqual(last.eta, 0.0)
+        # Events are snapshots, not a shared mutable state
+        self.assertEqual(events[0].bytes_done, 0)
+
+    def test_deploy_changes_only_touches_changed_paths(self):
+        from src.qgis_manager.core import deploy_changes, deploy_plugin
+
+        (self.src / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        (self.src / "plugin.py").write_text("x = 1")
+        (self.src / "old.py").write_text("y = 1")
+        deploy_plugin(self.src, dest_dir=self.dst, no_backup=True)
+        target = self.dst / "demo"
+
+        (self.src / "plugin.py").write_text("x = 42")
+        (self.src / "old.py").unlink()
+        (self.src / "pkg").mkdir()
+        (self.src / "pkg" / "mod.py").write_text("z = 1")
+        (self.src / "untouched.py").write_text("not in the batch")
+
+        plan = deploy_changes(
+            self.src, {"plugin.py", "old.py", "pkg"}, dest_dir=self.dst
+        )
+        self.assertEqual([a.path for a in plan.adds], ["pkg/mod.py"])
+        self.assertEqual([a.path for a in plan.updates], ["plugin.py"])
+        self.assertEqual(plan.deletes, ["old.py"])
+        self.assertEqual((target / "plugin.py").read_text(), "x = 42")
+        self.assertTrue((target / "pkg" / "mod.py").exists())
+        self.assertFalse((target / "old.py").exists())
+        self.assertFalse((target / "untouched.py").exists())
+
+        # The stored manifest covers the whole target
+        from src.qgis_manager.manifest import DeployManifest
+
+        manifest = DeployManifest.load(target)
+        assert manifest is not None
+        self.assertIn("metadata.txt", manifest.files)
+        self.assertIn("pkg/mod.py", manifest.files)
+        self.assertNotIn("old.py", manifest.files)
+
+    def test_deploy_changes_honours_compare_and_atomic(self):
+        from src.qgis_manager.core import deploy_changes, deploy_plugin
+
+        (self.src / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        (self.src / "plugin.py").write_text("x = 1")
+        (self.src / "touched.py").write_text("same")
+        target = self.dst / "demo"
+        with patch.dict("os.environ", {"XDG_CACHE_HOME": str(self.test_dir / "c")}):
+            deploy_plugin(self.src, dest_dir=self.dst, no_backup=True, compare="hash")
+            inode = target.stat().st_ino
+
+            (self.src / "plugin.py").write_text("x = 2")
+            os.utime(self.src / "touched.py", ns=(1, 1))
+            plan = deploy_changes(
+                self.src,
+                {"plugin.py", "touched.py"},
+                dest_dir=self.dst,
+                compare="hash",
+                atomic=True,
+            )
+
+        # The content did not change, only the mtime
+        self.assertEqual([a.path for a in plan.updates], ["plugin.py"])
+        self.assertEqual((target / "plugin.py").read_text(), "x = 2")
+        self.assertEqual((target / "touched.py").read_text(), "same")
+        # Swapped in without keeping the previous version
+        self.assertNotEqual(target.stat().st_ino, inode)
+        self.assertEqual(sorted(p.name for p in self.dst.iterdir()), ["demo"])
+
+    def test_atomic_deploy_swaps_and_keeps_backup(self):
+        from src.qgis_manager.core import deploy_plugin
+
+        (self.src / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        (self.src / "plugin.py").write_text("x = 1")
+        (self.src / "data.gpkg").write_bytes(b"big dataset")
+        deploy_plugin(self.src, dest_dir=self.dst, no_backup=True)
+        target = self.dst / "demo"
+
+        (self.src / "plugin.py").write_text("x = 2")
+        deploy_plugin(self.src, dest_dir=self.dst, atomic=True)
+
+        backups = [p for p in self.dst.iterdir() if p.name.startswith("demo.bak.")]
+        self.assertEqual(len(backups), 1)
+        self.assertEqual((target / "plugin.py").read_text(), "x = 2")
+        self.assertEqual((backups[0] / "plugin.py").read_text(), "x = 1")
+        # Unchanged files are shared with the previous version, not copied
+        self.assertEqual(
+            (target / "data.gpkg").stat().st_ino,
+            (backups[0] / "data.gpkg").stat().st_ino,
+        )
+        # No staging directory left behind, only the backup and its index
+        self.assertEqual(
+            sorted(p.name for p in self.dst.iterdir()),
+            [".demo.backups.json", "demo", backups[0].name],
+        )
+        # The backup is charged only for the files it does not share
+        index = json.loads((self.dst / ".demo.backups.json").read_text())
+        manifest = (backups[0] / MANIFEST_FILENAME).stat().st_size
+        self.assertEqual(index["backups"], {backups[0].name: len("x = 1") + manifest})
+
+        # Staging reports the changed file and skips the hardlinked ones
+        events = []
+        (self.src / "plugin.py").write_text("x = 3")
+        deploy_plugin(self.src, dest_dir=self.dst, atomic=True, progress=events.append)
+        self.assertEqual(events[-1].phase, "done")
+        self.assertEqual(events[-1].files_done, 1)
+        self.assertEqual(events[-1].bytes_done, len("x = 3"))
+        self.assertEqual(events[-1].skipped, 2)
+
+        # Later in-place deploys must not modify the shared backup inode
+        (self.src / "data.gpkg").write_bytes(b"new dataset")
+        deploy_plugin(self.src, dest_dir=self.dst, no_backup=True)
+        self.assertEqual((backups[0] / "data.gpkg").read_bytes(), b"big dataset")
+
+    def test_atomic_deploys_in_the_same_second(self):
+        from datetime import datetime
+
+        from src.qgis_manager.core import deploy_plugin
+
+        (self.src / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        (self.src / "plugin.py").write_text("x = 0")
+        deploy_plugin(self.src, dest_dir=self.dst, no_backup=True)
+        # Left by an interrupted deploy
+        stale = self.dst / ".demo.staging.20200101000000"
+        stale.mkdir()
+        (stale / "plugin.py").write_text("x = -1")
+
+        with patch("src.qgis_manager.core.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2026, 1, 1, 12, 0, 0)
+            for version in (1, 2, 3):
+                (self.src / "plugin.py").write_text(f"x = {version}")
+                deploy_plugin(self.src, dest_dir=self.dst, atomic=True)
+
+        self.assertEqual((self.dst / "demo" / "plugin.py").read_text(), "x = 3")
+        backups = {
+            p.name: (p / "plugin.py").read_text()
+            for p in self.dst.iterdir()
+            if p.name.startswith("demo.bak.")
+        }
+        self.assertEqual(
+            backups,
+            {
+                "demo.bak.20260101120000": "x = 0",
+                "demo.bak.20260101120000-1": "x = 1",
+                "demo.bak.20260101120000-2": "x = 2",
+            },
+        )
+        # No previous version left behind in a staging directory
+        self.assertFalse(any(".staging." in p.name for p in self.dst.iterdir()))
+
+    def test_first_atomic_deploy_gets_regular_permissions(self):
+        from src.qgis_manager.core import deploy_plugin
+
+        (self.src / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+        self.dst.chmod(0o755)
+        deploy_plugin(self.src, dest_dir=self.dst, atomic=True)
+
+        self.assertEqual((self.dst / "demo").stat().st_mode & 0o777, 0o755)
+
+    def test_exchange_directories_fallback(self):
+        from src.qgis_manager.sync import exchange_directories
+
+        (self.src / "a.txt").write_text("src")
+        (self.dst / "b.txt").write_text("dst")
+        with patch("ctypes.CDLL", side_effect=OSError):
+            exchange_directories(self.src, self.dst)
+        self.assertTrue((self.src / "b.txt").exists())
+        self.assertTrue((self.dst / "a.txt").exists())
+        self.assertEqual(
+            sorted(p.name for p in self.test_dir.iterdir()), ["dst", "src"]
+        )
+
+    def test_exchange_directories_off_linux(self):
+        from src.qgis_manager.sync import exchange_directories
+
+        (self.src / "a.txt").write_text("src")
+        (self.dst / "b.txt").write_text("dst")
+        # ctypes.CDLL(None) raises TypeError on Windows
+        with (
+            patch("src.qgis_manager.sync.sys.platform", "win32"),
+            patch("ctypes.CDLL", side_effect=TypeError) as cdll,
+        ):
+            exchange_directories(self.src, self.dst)
+        cdll.assert_not_called()
+        self.assertTrue((self.src / "b.txt").exists())
+        self.assertTrue((self.dst / "a.txt").exists())
+
+        with patch("ctypes.CDLL", side_effect=TypeError):
+            exchange_directories(self.src, self.dst)
+        self.assertTrue((self.src / "a.txt").exists())
+
 
 if __name__ == "__main__":
     unittest.main()
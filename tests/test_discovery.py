@@ -1,6 +1,8 @@
+import os
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from qgis_manager.discovery import find_project_root, get_plugin_metadata, slugify
 
@@ -64,6 +66,43 @@ class TestDiscovery(unittest.TestCase):
             self.assertIn("metadata.txt", basenames)
             self.assertIn("resources.qrc", basenames)
 
+    def test_walk_project_prunes_excluded_directories(self):
+        from qgis_manager.discovery import walk_project
+        from qgis_manager.ignore import IgnoreMatcher
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "plugin.py").touch()
+            (tmp_path / "gui").mkdir()
+            (tmp_path / "gui" / "dialog.py").touch()
+            (tmp_path / ".venv" / "lib").mkdir(parents=True)
+            (tmp_path / ".venv" / "lib" / "site.py").touch()
+
+            matcher = IgnoreMatcher(tmp_path)
+            with patch("os.scandir", wraps=os.scandir) as scandir:
+                entries = list(walk_project(tmp_path, matcher, include_dirs=True))
+
+            rel_paths = [rel for rel, _ in entries]
+            self.assertIn("plugin.py", rel_paths)
+            self.assertIn("gui/dialog.py", rel_paths)
+            self.assertLess(rel_paths.index("gui"), rel_paths.index("gui/dialog.py"))
+            self.assertFalse(any(r.startswith(".venv") for r in rel_paths))
+
+            scanned = [str(c.args[0]) for c in scandir.call_args_list]
+            self.assertNotIn(str(tmp_path / ".venv"), scanned)
+
+    def test_find_project_files(self):
+        from qgis_manager.discovery import find_project_files
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            (tmp_path / "resources.qrc").touch()
+            (tmp_path / "venv").mkdir()
+            (tmp_path / "venv" / "vendored.qrc").touch()
+
+            found = find_project_files(tmp_path, ".qrc")
+            self.assertEqual(found, [tmp_path / "resources.qrc"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis_manager.hashing import HashCache, file_digest
+
+
+class TestHashCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.cache_path = self.root / "cache" / "hashes.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_digest_is_cached_across_instances(self):
+        data = self.root / "data.gpkg"
+        data.write_bytes(b"x" * 4096)
+
+        cache = HashCache(self.cache_path)
+        digest = cache.digest(data)
+        self.assertEqual(digest, file_digest(data))
+        self.assertEqual(cache.misses, 1)
+        cache.save()
+
+        cache = HashCache(self.cache_path)
+        with patch("qgis_manager.hashing.file_digest") as mock_digest:
+            self.assertEqual(cache.digest(data), digest)
+            mock_digest.assert_not_called()
+        self.assertEqual(cache.hits, 1)
+
+    def test_stale_signature_rehashes(self):
+        data = self.root / "data.txt"
+        data.write_text("one")
+        cache = HashCache(self.cache_path)
+        first = cache.digest(data)
+
+        data.write_text("two")
+        st = data.stat()
+        os.utime(data, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        self.assertNotEqual(cache.digest(data), first)
+        self.assertEqual(cache.misses, 2)
+
+    def test_digest_during_save(self):
+        first, second = self.root / "a.txt", self.root / "b.txt"
+        first.write_text("a")
+        second.write_text("b")
+        cache = HashCache(self.cache_path)
+        cache.digest(first)
+        dump = json.dump
+
+        def dump_racing_a_digest(obj, f, **kwargs):
+            # Another thread hashes a file while the cache is being written
+            class Writer:
+                def write(self, data):
+                    if str(first) in data and not second_digest:
+                        second_digest.append(cache.digest(second))
+                    f.write(data)
+
+            dump(obj, Writer(), **kwargs)
+
+        second_digest = []
+        with patch("qgis_manager.hashing.json.dump", dump_racing_a_digest):
+            cache.save()
+        # The entry added meanwhile is written by the next save
+        cache.save()
+        self.assertIn(str(second), json.loads(self.cache_path.read_text())["entries"])
+
+    def test_corrupt_cache_is_ignored(self):
+        self.cache_path.parent.mkdir(parents=True)
+        self.cache_path.write_text("{not json")
+        data = self.root / "data.txt"
+        data.write_text("one")
+        self.assertEqual(HashCache(self.cache_path).digest(data), file_digest(data))
+
+
+if __name__ == "__main__":
+    unittest.main()
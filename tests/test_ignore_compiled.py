@@ -0,0 +1,94 @@
+import itertools
+import tempfile
+import unittest
+from pathlib import Path
+
+from qgis_manager.ignore import CompiledPatterns, IgnoreMatcher, pattern_matches
+
+
+class TestCompiledPatterns(unittest.TestCase):
+    PATTERNS = [
+        "__pycache__",
+        "*.pyc",
+        "*.bak*",
+        ".venv",
+        "/tests",
+        "/tests/**/*",
+        "/secret/",
+        "/data/*.csv",
+        "data/*.log",
+        "logs/debug",
+        "folder/sub/file.py",
+        "my_data/",
+        "build",
+        "[ab]*.tmp",
+        "/",
+        "",
+    ]
+
+    NAMES = [
+        "tests",
+        "data",
+        "logs",
+        "debug",
+        "folder",
+        "sub",
+        "file.py",
+        "x.csv",
+        "x.log",
+        "a1.tmp",
+        "c1.tmp",
+        "plugin.py",
+        "__pycache__",
+        "m.pyc",
+        "y.bak.1",
+        "build",
+        "secret",
+        "my_data",
+        "gui",
+    ]
+
+    def _paths(self):
+        for depth in (1, 2, 3):
+            for combo in itertools.product(self.NAMES, repeat=depth):
+                if depth == 3 and len(set(combo)) < 3:
+                    continue
+                yield combo
+
+    def test_matches_reference_implementation(self):
+        compiled = CompiledPatterns(self.PATTERNS)
+        for parts in self._paths():
+            path_str = "/".join(parts)
+            expected = any(pattern_matches(p, path_str, parts) for p in self.PATTERNS)
+            self.assertEqual(compiled.matches(path_str, parts), expected, msg=path_str)
+
+    def test_partitioning(self):
+        compiled = CompiledPatterns(self.PATTERNS)
+        self.assertIn("__pycache__", compiled.basenames)
+        self.assertIn("build", compiled.basenames)
+        self.assertIn("my_data", compiled.basenames)
+        self.assertIn("tests", compiled.root_prefixes)
+        self.assertIn("secret", compiled.root_prefixes)
+        self.assertNotIn("*.pyc", compiled.basenames)
+
+    def test_matcher_recompiles_after_pattern_change(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_path = Path(tmp_dir)
+            matcher = IgnoreMatcher(tmp_path)
+            target = tmp_path / "deploy_target" / "file.py"
+            self.assertFalse(matcher.should_exclude(target))
+
+            matcher.patterns.append("/deploy_target")
+            self.assertTrue(matcher.should_exclude(target))
+
+            matcher.patterns[-1] = "/other"
+            self.assertFalse(matcher.should_exclude(target))
+            matcher.patterns = ["*.py"]
+            self.assertTrue(matcher.should_exclude(target))
+
+            compiled = matcher.compiled
+            self.assertIs(matcher.compiled, compiled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from qgis_manager.discovery import walk_project
+from qgis_manager.ignore import IgnoreMatcher, ProfilingIgnoreMatcher
+
+
+class TestIgnoreExplain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / ".gitignore").write_text("*.csv\n!keep.csv\n", encoding="utf-8")
+        (self.root / "pyproject.toml").write_text(
+            '[tool.qgis-manager]\nignore = ["samples/"]\n', encoding="utf-8"
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_explain_sources(self):
+        matcher = IgnoreMatcher(self.root)
+
+        decision = matcher.explain(self.root / "gui" / "__pycache__" / "a.pyc")
+        self.assertTrue(decision.excluded)
+        self.assertEqual(decision.pattern, "__pycache__")
+        self.assertEqual(decision.source, "default")
+        self.assertEqual(decision.matched_path, "gui/__pycache__")
+
+        decision = matcher.explain(self.root / "data.csv")
+        self.assertTrue(decision.excluded)
+        self.assertEqual(decision.source, ".gitignore")
+
+        decision = matcher.explain(self.root / "keep.csv")
+        self.assertFalse(decision.excluded)
+        self.assertEqual(decision.pattern, "!keep.csv")
+
+        decision = matcher.explain(self.root / "samples" / "a.gpkg")
+        self.assertTrue(decision.excluded)
+        self.assertEqual(decision.source, "pyproject.toml")
+
+        decision = matcher.explain(self.root / "plugin.py")
+        self.assertFalse(decision.excluded)
+        self.assertIsNone(decision.pattern)
+
+    def test_explain_agrees_with_should_exclude(self):
+        matcher = IgnoreMatcher(self.root)
+        for rel in ["a.csv", "keep.csv", "tests/x.py", "gui/b.py", ".venv/lib/c"]:
+            path = self.root / rel
+            self.assertEqual(
+                matcher.explain(path).excluded, matcher.should_exclude(path), rel
+            )
+
+    def test_profiling_matcher_counts_hits(self):
+        (self.root / "a.csv").touch()
+        (self.root / "b.csv").touch()
+        (self.root / "plugin.py").touch()
+
+        matcher = ProfilingIgnoreMatcher(self.root)
+        kept = list(walk_project(self.root, matcher))
+
+        self.assertEqual(matcher.evaluated, 5)
+        self.assertEqual(matcher.evaluated - matcher.excluded, len(kept))
+        stats = matcher.stats[("*.csv", ".gitignore")]
+        self.assertEqual(stats.hits, 2)
+        self.assertGreater(stats.seconds, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from qgis_manager.discovery import walk_project
+from qgis_manager.ignore import IgnoreMatcher, IgnoreRule
+
+
+class TestIgnoreRule(unittest.TestCase):
+    def test_parse_flags(self):
+        rule = IgnoreRule.parse("!/data/keep/\n")
+        self.assertIsNotNone(rule)
+        assert rule is not None
+        self.assertTrue(rule.negated)
+        self.assertTrue(rule.dir_only)
+        self.assertTrue(rule.regex.match("data/keep"))
+        self.assertFalse(rule.regex.match("sub/data/keep"))
+
+        self.assertIsNone(IgnoreRule.parse("# comment\n"))
+        self.assertIsNone(IgnoreRule.parse("   \n"))
+
+    def test_unanchored_and_double_star(self):
+        rule = IgnoreRule.parse("*.tif")
+        assert rule is not None
+        self.assertTrue(rule.regex.match("a/b/c.tif"))
+        self.assertFalse(rule.regex.match("a/b.tif/c"))
+
+        rule = IgnoreRule.parse("raw/**/*.csv")
+        assert rule is not None
+        self.assertTrue(rule.regex.match("raw/x.csv"))
+        self.assertTrue(rule.regex.match("raw/a/b/x.csv"))
+        self.assertFalse(rule.regex.match("other/raw/x.csv"))
+
+
+class TestNestedIgnoreFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_nested_gitignore_is_relative_to_its_directory(self):
+        data = self.root / "data"
+        (data / "raw").mkdir(parents=True)
+        (data / ".gitignore").write_text("/raw/\n*.tif\n", encoding="utf-8")
+        (self.root / "raw").mkdir()
+
+        matcher = IgnoreMatcher(self.root)
+        self.assertTrue(matcher.should_exclude(data / "raw"))
+        self.assertTrue(matcher.should_exclude(data / "raw" / "big.csv"))
+        self.assertTrue(matcher.should_exclude(data / "sub" / "dem.tif"))
+        self.assertFalse(matcher.should_exclude(data / "sample.csv"))
+        # Rules do not leak outside the directory holding the ignore file
+        self.assertFalse(matcher.should_exclude(self.root / "raw"))
+        self.assertFalse(matcher.should_exclude(self.root / "dem.tif"))
+
+    def test_negation(self):
+        (self.root / ".qgisignore").write_text("*.csv\n!keep.csv\n", encoding="utf-8")
+        data = self.root / "data"
+        data.mkdir()
+        (data / ".gitignore").write_text("*.log\n!debug.log\n", encoding="utf-8")
+
+        matcher = IgnoreMatcher(self.root)
+        self.assertTrue(matcher.should_exclude(self.root / "other.csv"))
+        self.assertFalse(matcher.should_exclude(self.root / "keep.csv"))
+        # Deeper ignore files take precedence over the defaults ("*.log")
+        self.assertFalse(matcher.should_exclude(data / "debug.log"))
+        self.assertTrue(matcher.should_exclude(data / "trace.log"))
+
+    def test_root_rules_keep_the_legacy_semantics(self):
+        rules = "output/\nmaps/raw\n"
+        (self.root / "logs").mkdir()
+        (self.root / "logs" / "output").touch()
+        (self.root / ".gitignore").write_text(rules, encoding="utf-8")
+
+        # Root: a trailing slash also matches files, and a pattern with a
+        # slash matches at any depth
+        matcher = IgnoreMatcher(self.root)
+        self.assertTrue(matcher.should_exclude(self.root / "logs" / "output"))
+        self.assertTrue(matcher.should_exclude(self.root / "src" / "maps" / "raw"))
+
+        # The same lines in a nested ignore file follow gitignore semantics
+        (self.root / ".gitignore").unlink()
+        pkg = self.root / "pkg"
+        (pkg / "logs").mkdir(parents=True)
+        (pkg / "logs" / "output").touch()
+        (pkg / ".gitignore").write_text(rules, encoding="utf-8")
+        matcher = IgnoreMatcher(self.root)
+        self.assertFalse(matcher.should_exclude(pkg / "logs" / "output"))
+        self.assertFalse(matcher.should_exclude(pkg / "src" / "maps" / "raw"))
+        self.assertTrue(matcher.should_exclude(pkg / "maps" / "raw"))
+
+    def test_directory_only_rule(self):
+        pkg = self.root / "pkg"
+        (pkg / "cache").mkdir(parents=True)
+        (pkg / "cache" / "item.bin").touch()
+        (pkg / "sub").mkdir()
+        (pkg / "sub" / "cache").touch()
+        (pkg / ".gitignore").write_text("cache/\n", encoding="utf-8")
+
+        matcher = IgnoreMatcher(self.root)
+        self.assertTrue(matcher.should_exclude(pkg / "cache"))
+        self.assertTrue(matcher.should_exclude(pkg / "cache" / "item.bin"))
+        self.assertFalse(matcher.should_exclude(pkg / "sub" / "cache"))
+
+    def test_walker_loads_nested_rules(self):
+        data = self.root / "data"
+        (data / "rasters").mkdir(parents=True)
+        (data / "rasters" / "dem.tif").touch()
+        (data / "points.gpkg").touch()
+        (data / ".gitignore").write_text("rasters/\n", encoding="utf-8")
+
+        matcher = IgnoreMatcher(self.root)
+        rel_paths = [rel for rel, _ in walk_project(self.root, matcher)]
+        self.assertIn("data/points.gpkg", rel_paths)
+        self.assertNotIn("data/rasters/dem.tif", rel_paths)
+
+    def test_nested_disabled(self):
+        data = self.root / "data"
+        data.mkdir()
+        (data / ".gitignore").write_text("*.csv\n", encoding="utf-8")
+
+        matcher = IgnoreMatcher(self.root, nested=False)
+        self.assertFalse(matcher.should_exclude(data / "points.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
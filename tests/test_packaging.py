@@ -0,0 +1,378 @@
+import hashlib
+import os
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis_manager import packaging
+from qgis_manager.core import create_plugin_package
+from qgis_manager.hashing import HashCache
+from qgis_manager.packaging import (
+    Compression,
+    CompressionPolicy,
+    PackageCache,
+    write_zip,
+)
+
+
+class TestParallelPackaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.project = self.root / "demo"
+        self.project.mkdir()
+        (self.project / "metadata.txt").write_text("[general]\nname=Demo\nversion=1")
+        (self.project / "plugin.py").write_text("x = 1\n" * 1000)
+        (self.project / "libs").mkdir()
+        (self.project / "libs" / "blob.bin").write_bytes(os.urandom(300_000))
+        (self.project / "libs" / "café.txt").write_text("non-ascii name")
+        (self.project / "run.sh").write_text("#!/bin/sh\n")
+        (self.project / "run.sh").chmod(0o755)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_package_is_a_standard_deflate_archive(self):
+        zip_path = create_plugin_package(self.project, jobs=4)
+
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertIsNone(zf.testzip())
+            names = zf.namelist()
+            self.assertIn("demo/libs/café.txt", names)
+            for info in zf.infolist():
+                # Random bytes are detected as incompressible and stored
+                expected = (
+                    zipfile.ZIP_STORED
+                    if info.filename.endswith(".bin")
+                    else zipfile.ZIP_DEFLATED
+                )
+                self.assertEqual(info.compress_type, expected)
+                source = self.project / info.filename.split("/", 1)[1]
+                self.assertEqual(zf.read(info), source.read_bytes())
+            mode = zf.getinfo("demo/run.sh").external_attr >> 16
+            self.assertEqual(mode & 0o777, 0o755)
+
+        checksum = zip_path.with_name(zip_path.name + ".sha256").read_text()
+        self.assertTrue(checksum.endswith(f"  {zip_path.name}\n"))
+
+    def test_checksums_are_computed_while_writing(self):
+        zip_path = create_plugin_package(self.project, checksums=["blake2b", "sha512"])
+        content = zip_path.read_bytes()
+
+        for name in ("sha256", "sha512", "blake2b"):
+            checksum = zip_path.with_name(f"{zip_path.name}.{name}").read_text()
+            expected = hashlib.new(name, content).hexdigest()
+            self.assertEqual(checksum, f"{expected}  {zip_path.name}\n")
+
+        with self.assertRaises(ValueError):
+            write_zip(self.root / "bad.zip", [], checksums=["md5"])
+        self.assertFalse((self.root / "bad.zip").exists())
+
+    def test_entry_order_does_not_depend_on_workers(self):
+        files = sorted(
+            (p, f"demo/{p.relative_to(self.project)}")
+            for p in self.project.rglob("*")
+            if p.is_file()
+        )
+        single = self.root / "single.zip"
+        parallel = self.root / "parallel.zip"
+        write_zip(single, files, jobs=1)
+        write_zip(parallel, files, jobs=8)
+
+        self.assertEqual(single.read_bytes(), parallel.read_bytes())
+        with zipfile.ZipFile(parallel) as zf:
+            self.assertEqual(zf.namelist(), [arcname for _, arcname in files])
+
+    def test_zip64_records_are_readable(self):
+        files = [(self.project / "plugin.py", "a.py"), (self.project / "run.sh", "b")]
+        zip_path = self.root / "zip64.zip"
+        with (
+            patch.object(packaging, "ZIP64_LIMIT", 1),
+            patch.object(packaging, "ZIP_FILECOUNT_LIMIT", 1),
+        ):
+            write_zip(zip_path, files, jobs=2)
+
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.read("a.py"), (self.project / "plugin.py").read_bytes())
+            self.assertEqual(zf.getinfo("b").extract_version, 45)
+
+    def test_failed_build_leaves_previous_package(self):
+        zip_path = self.root / "demo.zip"
+        zip_path.write_bytes(b"previous")
+        files = [(self.project / "plugin.py", "a.py"), (self.root / "missing", "b")]
+
+        with self.assertRaises(FileNotFoundError):
+            write_zip(zip_path, files, jobs=2)
+        self.assertEqual(zip_path.read_bytes(), b"previous")
+        self.assertEqual(
+            sorted(p.name for p in self.root.iterdir()), ["demo", "demo.zip"]
+        )
+
+
+class TestIncrementalPackaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.project = self.root / "demo"
+        self.project.mkdir()
+        (self.project / "metadata.txt").write_text("[general]\nname=Demo\nversion=1")
+        (self.project / "plugin.py").write_text("x = 1\n" * 1000)
+        (self.project / "lib.py").write_text("y = 1\n" * 1000)
+        (self.project / "icon.png").write_bytes(os.urandom(1000))
+        cache = patch.dict(os.environ, {"XDG_CACHE_HOME": str(self.root / "cache")})
+        cache.start()
+        self.addCleanup(cache.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, policy=None):
+        reports = []
+        with patch.object(
+            packaging, "compress_file", wraps=packaging.compress_file
+        ) as compress:
+            zip_path = create_plugin_package(
+                self.project,
+                incremental=True,
+                policy=policy,
+                on_report=reports.append,
+            )
+        compressed = sorted(c.args[1] for c in compress.call_args_list)
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertIsNone(zf.testzip())
+            for info in zf.infolist():
+                source = self.project / info.filename.split("/", 1)[1]
+                self.assertEqual(zf.read(info), source.read_bytes())
+        return compressed, reports[0]
+
+    def test_only_changed_files_are_compressed(self):
+        compressed, report = self.build()
+        self.assertEqual(len(compressed), 4)
+        self.assertEqual(report.reused, 0)
+
+        # Same size, different content: caught by the CRC
+        (self.project / "plugin.py").write_text("x = 2\n" * 1000)
+        (self.project / "new.py").write_text("z = 1")
+        compressed, report = self.build()
+        self.assertEqual(compressed, ["demo/new.py", "demo/plugin.py"])
+        self.assertEqual(report.reused, 3)
+
+        # A version bump reuses the package of the previous version
+        (self.project / "metadata.txt").write_text("[general]\nname=Demo\nversion=2")
+        compressed, report = self.build()
+        self.assertEqual(compressed, ["demo/metadata.txt"])
+        self.assertTrue((self.project / "dist" / "demo.2.zip").exists())
+
+    def test_level_change_recompresses(self):
+        self.build()
+        with zipfile.ZipFile(self.project / "dist" / "demo.1.zip") as zf:
+            self.assertEqual({info.extra for info in zf.infolist()}, {b""})
+
+        # The default level is level 6, as in the CLI configuration
+        compressed, report = self.build(CompressionPolicy(level=6))
+        self.assertEqual(report.reused, 4)
+
+        policy = CompressionPolicy(level=9)
+        with patch.object(
+            packaging, "compress_file", wraps=packaging.compress_file
+        ) as compress:
+            create_plugin_package(self.project, incremental=True, policy=policy)
+            # Only the stored PNG keeps its previous data
+            self.assertEqual(compress.call_count, 3)
+
+            compress.reset_mock()
+            create_plugin_package(self.project, incremental=True, policy=policy)
+            compress.assert_not_called()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "reads /proc/self/fd")
+    def test_same_version_replaces_a_closed_previous_package(self):
+        self.build()
+        replace = os.replace
+
+        def windows_replace(src, dst):
+            # Windows refuses to replace a file that is still open
+            for fd in os.listdir("/proc/self/fd"):
+                try:
+                    target = os.readlink(f"/proc/self/fd/{fd}")
+                except OSError:
+                    continue
+                if target == os.path.realpath(dst):
+                    raise PermissionError(f"{dst} is open")
+            replace(src, dst)
+
+        (self.project / "plugin.py").write_text("x = 3\n" * 1000)
+        with patch.object(packaging.os, "replace", windows_replace):
+            compressed, report = self.build()
+        self.assertEqual(compressed, ["demo/plugin.py"])
+        self.assertEqual(report.reused, 3)
+
+    def test_packages_of_other_plugins_are_not_reused(self):
+        dist = self.project / "dist"
+        dist.mkdir()
+        # Plugin "demo.tools" shares the "demo." prefix
+        other = dist / "demo.tools.1.0.zip"
+        with zipfile.ZipFile(other, "w") as zf:
+            zf.write(self.project / "plugin.py", "demo/plugin.py")
+
+        compressed, report = self.build()
+        self.assertEqual(len(compressed), 4)
+        self.assertEqual(report.reused, 0)
+
+        # After a version bump, the package of the previous version is used
+        (self.project / "metadata.txt").write_text(
+            "[general]\nname=Demo\nversion=1.1rc1"
+        )
+        os.utime(other)
+        compressed, report = self.build()
+        self.assertEqual(compressed, ["demo/metadata.txt"])
+
+    def test_unreadable_previous_package_is_rebuilt(self):
+        dist = self.project / "dist"
+        dist.mkdir()
+        (dist / "demo.1.zip").write_bytes(b"not a zip")
+        compressed, report = self.build()
+        self.assertEqual(len(compressed), 4)
+
+
+class TestCompressionPolicy(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.text = self.root / "text.txt"
+        self.text.write_text("compressible " * 5000)
+        self.noise = self.root / "noise.dat"
+        self.noise.write_bytes(os.urandom(100_000))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rules_then_defaults_then_sampling(self):
+        policy = CompressionPolicy({"help/*": "store", "*.txt": 9}, level=4)
+
+        self.assertEqual(
+            policy.resolve(self.text, "demo/a.txt"),
+            Compression(zipfile.ZIP_DEFLATED, 9, "*.txt"),
+        )
+        # Patterns with a slash match the path inside the plugin folder
+        self.assertEqual(
+            policy.resolve(self.text, "demo/help/a.txt").method, zipfile.ZIP_STORED
+        )
+        # Default rules for compressed formats, case-insensitive
+        self.assertEqual(
+            policy.resolve(self.text, "demo/icon.PNG"),
+            Compression(zipfile.ZIP_STORED, 0, "*.png"),
+        )
+        self.assertEqual(
+            policy.resolve(self.noise, "demo/noise.dat"),
+            Compression(zipfile.ZIP_STORED, 0, "*.dat (incompressible)"),
+        )
+        self.assertEqual(
+            policy.resolve(self.text, "demo/text.log"),
+            Compression(zipfile.ZIP_DEFLATED, 4, "*.log"),
+        )
+        manual = CompressionPolicy(auto=False)
+        self.assertEqual(
+            manual.resolve(self.noise, "demo/noise.dat").method, zipfile.ZIP_DEFLATED
+        )
+
+        with self.assertRaises(ValueError):
+            CompressionPolicy({"*.py": "brotli"})
+
+    def test_report_per_class(self):
+        zip_path = self.root / "out.zip"
+        files = [(self.text, "demo/text.txt"), (self.noise, "demo/noise.dat")]
+        report = write_zip(zip_path, files, policy=CompressionPolicy())
+
+        self.assertEqual(sorted(report.classes), ["*.dat (incompressible)", "*.txt"])
+        noise = report.classes["*.dat (incompressible)"]
+        self.assertTrue(noise.stored)
+        self.assertEqual(noise.ratio, 1.0)
+        self.assertLess(report.classes["*.txt"].ratio, 0.1)
+        self.assertEqual(len(report.summary()), 2)
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(zf.read("demo/noise.dat"), self.noise.read_bytes())
+
+
+class TestReproduciblePackaging(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.project = self.root / "demo"
+        self.project.mkdir()
+        (self.project / "metadata.txt").write_text("[general]\nname=Demo\nversion=1")
+        (self.project / "b.py").write_text("b = 1")
+        (self.project / "a.py").write_text("a = 1")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_deterministic_builds_are_byte_identical(self):
+        first = create_plugin_package(
+            self.project, self.root / "one", deterministic=True
+        )
+        os.utime(self.project / "a.py", (1, 1))
+        (self.project / "b.py").chmod(0o600)
+        second = create_plugin_package(
+            self.project, self.root / "two", deterministic=True, jobs=3
+        )
+
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+        with zipfile.ZipFile(second) as zf:
+            self.assertEqual(
+                zf.namelist(), ["demo/a.py", "demo/b.py", "demo/metadata.txt"]
+            )
+            info = zf.getinfo("demo/b.py")
+            self.assertEqual(info.date_time, (1980, 1, 1, 0, 0, 0))
+            self.assertEqual((info.external_attr >> 16) & 0o777, 0o644)
+
+        with patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1700000000"}):
+            third = create_plugin_package(
+                self.project, self.root / "three", deterministic=True
+            )
+        with zipfile.ZipFile(third) as zf:
+            self.assertEqual(
+                zf.getinfo("demo/a.py").date_time, (2023, 11, 14, 22, 13, 20)
+            )
+
+    def test_cache_returns_previous_build_until_inputs_change(self):
+        cache = PackageCache(self.root / "cache", HashCache(self.root / "h.json"))
+        dist = self.root / "dist"
+        zip_path = create_plugin_package(
+            self.project, dist, deterministic=True, cache=cache
+        )
+        checksum = zip_path.with_name(zip_path.name + ".sha256").read_text()
+        built = zip_path.read_bytes()
+        zip_path.unlink()
+
+        with patch("qgis_manager.core.write_zip") as write:
+            self.assertEqual(
+                create_plugin_package(
+                    self.project, dist, deterministic=True, cache=cache
+                ),
+                zip_path,
+            )
+            write.assert_not_called()
+        self.assertEqual(zip_path.read_bytes(), built)
+        self.assertEqual(
+            zip_path.with_name(zip_path.name + ".sha256").read_text(), checksum
+        )
+
+        # A different build option or content is a different package
+        with patch("qgis_manager.core.write_zip") as write:
+            create_plugin_package(self.project, dist, cache=cache)
+            write.assert_called_once()
+        (self.project / "a.py").write_text("a = 2")
+        create_plugin_package(self.project, dist, deterministic=True, cache=cache)
+        self.assertNotEqual(zip_path.read_bytes(), built)
+        # The cached copy of the first build was not modified in place
+        cached = [p.read_bytes() for p in (self.root / "cache").glob("*/*.zip")]
+        self.assertIn(built, cached)
+
+
+if __name__ == "__main__":
+    unittest.main()
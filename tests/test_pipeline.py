@@ -0,0 +1,107 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis_manager import core
+from qgis_manager.core import deploy_plugin
+from qgis_manager.pipeline import Stage, run_pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    def test_independent_stages_overlap(self):
+        barrier = threading.Barrier(2, timeout=5)
+        report = run_pipeline(
+            [
+                Stage("a", lambda _: barrier.wait()),
+                Stage("b", lambda _: barrier.wait()),
+                Stage("c", lambda results: sorted(results), after=("a", "b")),
+            ]
+        )
+        self.assertEqual(report.results["c"], ["a", "b"])
+        self.assertGreaterEqual(
+            report.timings["c"].start,
+            max(report.timings["a"].end, report.timings["b"].end),
+        )
+
+    def test_critical_path_follows_the_slowest_dependency(self):
+        report = run_pipeline(
+            [
+                Stage("compile", lambda _: time.sleep(0.05)),
+                Stage("backup", lambda _: None),
+                Stage("scan", lambda _: None, after=("compile",)),
+                Stage("sync", lambda _: None, after=("scan", "backup")),
+            ]
+        )
+        self.assertEqual(report.critical_path, ["compile", "scan", "sync"])
+        self.assertIn("compile", report.summary())
+        self.assertLessEqual(report.seconds, report.work_seconds + 0.05)
+
+    def test_failure_stops_dependents(self):
+        ran = []
+
+        def fail(_):
+            raise RuntimeError("compile failed")
+
+        with self.assertRaisesRegex(RuntimeError, "compile failed"):
+            run_pipeline(
+                [
+                    Stage("compile", fail),
+                    Stage("backup", lambda _: ran.append("backup")),
+                    Stage("sync", lambda _: ran.append("sync"), ("compile", "backup")),
+                ]
+            )
+        self.assertEqual(ran, ["backup"])
+
+    def test_unknown_dependency(self):
+        with self.assertRaises(ValueError):
+            run_pipeline([Stage("sync", lambda _: None, after=("scan",))])
+
+
+class TestPipelinedDeploy(unittest.TestCase):
+    def test_backup_overlaps_compilation(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir) / "demo"
+            root.mkdir()
+            (root / "metadata.txt").write_text("[general]\nname=Demo\nversion=0.1")
+            plugins = Path(tmp_dir) / "plugins"
+            deploy_plugin(root, dest_dir=plugins, no_backup=True)
+
+            backup_started = threading.Event()
+            create_backup = core.create_backup
+
+            def tracking_backup(*args, **kwargs):
+                backup_started.set()
+                return create_backup(*args, **kwargs)
+
+            def compile_step():
+                # The backup starts while the compilation is still running
+                self.assertTrue(backup_started.wait(5))
+                (root / "resources_rc.py").write_text("qt_resource_data = b''")
+
+            reports = []
+            with (
+                patch.object(core, "create_backup", side_effect=tracking_backup),
+                self.assertLogs("qgis_manager.core", "INFO") as logs,
+            ):
+                plan = deploy_plugin(
+                    root,
+                    dest_dir=plugins,
+                    compile_step=compile_step,
+                    on_report=reports.append,
+                )
+
+            # The scan ran after the compilation and saw its output
+            self.assertIn("resources_rc.py", [a.path for a in plan.adds])
+            self.assertTrue((plugins / "demo" / "resources_rc.py").exists())
+            (report,) = reports
+            self.assertEqual(set(report.timings), {"compile", "backup", "scan", "sync"})
+            self.assertEqual(report.critical_path[-1], "sync")
+            # Reported through the callback only, not logged as well
+            self.assertNotIn(report.summary(), [r.getMessage() for r in logs.records])
+
+
+if __name__ == "__main__":
+    unittest.main()
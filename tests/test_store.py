@@ -0,0 +1,98 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from qgis_manager.backups import create_backup
+from qgis_manager.core import deploy_plugin, rotate_backups
+from qgis_manager.hashing import HashCache
+from qgis_manager.store import ObjectStore
+
+
+class TestObjectStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.store = ObjectStore(
+            self.root / "objects", HashCache(self.root / "hashes.json")
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_checkout_stores_each_content_once(self):
+        a = self.root / "a.txt"
+        b = self.root / "b.txt"
+        a.write_text("same")
+        b.write_text("same")
+
+        self.assertTrue(self.store.checkout(a, self.root / "a.link"))
+        self.assertFalse(self.store.checkout(b, self.root / "b.link"))
+        self.assertEqual((self.store.added, self.store.reused), (1, 1))
+
+        inode = (self.root / "a.link").stat().st_ino
+        self.assertEqual((self.root / "b.link").stat().st_ino, inode)
+        self.assertNotEqual(a.stat().st_ino, inode)
+        self.assertEqual(self.store.stats().blobs, 1)
+
+    def test_gc_removes_only_unreferenced_blobs(self):
+        for name in ("kept", "dropped"):
+            (self.root / name).write_text(name)
+            self.store.checkout(self.root / name, self.root / f"{name}.link")
+
+        (self.root / "dropped.link").unlink()
+        stats = self.store.stats()
+        self.assertEqual((stats.blobs, stats.unreferenced), (2, 1))
+
+        self.assertEqual(self.store.gc(), (1, len("dropped")))
+        self.assertEqual(self.store.stats().blobs, 1)
+        self.assertEqual((self.root / "kept.link").read_text(), "kept")
+
+    def test_backups_share_blobs_and_rotation_collects_them(self):
+        plugins = self.root / "plugins"
+        target = plugins / "demo"
+        target.mkdir(parents=True)
+        (target / "lib.py").write_text("lib")
+
+        for day, version in enumerate(["1", "2", "1"], start=1):
+            (target / "plugin.py").write_text(f"x = {version}")
+            create_backup(
+                target,
+                plugins / f"demo.bak.2026010{day}000000",
+                incremental=False,
+                store=self.store,
+            )
+
+        # lib.py and the two plugin.py versions
+        self.assertEqual(self.store.stats().blobs, 3)
+        self.assertEqual(
+            (plugins / "demo.bak.20260101000000" / "plugin.py").stat().st_ino,
+            (plugins / "demo.bak.20260103000000" / "plugin.py").stat().st_ino,
+        )
+
+        rotate_backups(plugins, "demo", limit=1, store=self.store)
+        self.assertEqual(self.store.stats().blobs, 2)
+        backup = plugins / "demo.bak.20260103000000"
+        self.assertEqual((backup / "plugin.py").read_text(), "x = 1")
+
+    def test_atomic_deploys_to_two_profiles_share_blobs(self):
+        project = self.root / "project"
+        project.mkdir()
+        (project / "metadata.txt").write_text("[general]\nname=Demo\nversion=1")
+        (project / "data.gpkg").write_bytes(b"big dataset")
+
+        targets = []
+        for profile in ("dev", "qa"):
+            plugins = self.root / profile
+            deploy_plugin(project, dest_dir=plugins, atomic=True, store=self.store)
+            targets.append(plugins / "demo")
+
+        self.assertEqual(
+            (targets[0] / "data.gpkg").stat().st_ino,
+            (targets[1] / "data.gpkg").stat().st_ino,
+        )
+        self.assertEqual(self.store.added, 2)
+        self.assertEqual(self.store.reused, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import sys
+import tempfile
+import unittest
+from itertools import islice
+from pathlib import Path
+
+from qgis_manager.ignore import IgnoreMatcher
+from qgis_manager.watch import (
+    InotifyWatcher,
+    OwnWrites,
+    PollingWatcher,
+    QtSourceIndex,
+    watch_batches,
+)
+
+
+class FakeWatcher:
+    def __init__(self, reads):
+        self.reads = list(reads)
+
+    def read(self, timeout):
+        return set(self.reads.pop(0)) if self.reads else set()
+
+    def close(self):
+        pass
+
+
+class TestWatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "metadata.txt").write_text("[general]\nname=Demo")
+        self.matcher = IgnoreMatcher(self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_batches_are_debounced(self):
+        watcher = FakeWatcher([[], ["a.py"], ["b.py"], [], ["c.py"], []])
+        batches = list(islice(watch_batches(watcher, debounce=0), 2))
+        self.assertEqual(batches, [{"a.py", "b.py"}, {"c.py"}])
+
+    def test_own_writes_only_hide_unchanged_files(self):
+        own = OwnWrites(self.root)
+        (self.root / "resources.py").write_text("compiled")
+        (self.root / "i18n.qm").write_text("compiled")
+        own.record("resources.py")
+        own.record("i18n.qm")
+        self.assertEqual(own.paths(), {"resources.py", "i18n.qm"})
+
+        # Edited again after our compilation: a real change
+        (self.root / "i18n.qm").write_text("edited by hand")
+        batch = {"resources.py", "i18n.qm", "plugin.py"}
+        self.assertEqual(own.filter(batch), {"i18n.qm", "plugin.py"})
+        # Forgotten once a batch was filtered
+        self.assertEqual(own.filter({"resources.py"}), {"resources.py"})
+
+    def test_polling_watcher(self):
+        (self.root / "plugin.py").write_text("x = 1")
+        watcher = PollingWatcher(self.root, self.matcher)
+
+        (self.root / "plugin.py").write_text("x = 22")
+        (self.root / "sub").mkdir()
+        (self.root / "sub" / "new.py").touch()
+        (self.root / "__pycache__").mkdir()
+        (self.root / "__pycache__" / "plugin.pyc").touch()
+        self.assertEqual(watcher.read(0), {"plugin.py", "sub", "sub/new.py"})
+
+        (self.root / "sub" / "new.py").unlink()
+        self.assertEqual(watcher.read(0), {"sub/new.py"})
+        self.assertEqual(watcher.read(0), set())
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux only")
+    def test_inotify_watcher(self):
+        (self.root / "sub").mkdir()
+        watcher = InotifyWatcher(self.root, self.matcher)
+        try:
+            (self.root / "sub" / "a.py").write_text("x = 1")
+            (self.root / "__pycache__").mkdir()
+            (self.root / "new").mkdir()
+            changed = watcher.read(1.0)
+            self.assertIn("sub/a.py", changed)
+            self.assertIn("new", changed)
+            self.assertNotIn("__pycache__", changed)
+
+            # Directories created while watching are watched too
+            (self.root / "new" / "b.py").touch()
+            self.assertIn("new/b.py", watcher.read(1.0))
+        finally:
+            watcher.close()
+
+    def test_qt_source_index(self):
+        (self.root / "icons").mkdir()
+        (self.root / "icons" / "icon.png").touch()
+        (self.root / "resources.qrc").write_text(
+            '<RCC><qresource prefix="/plugins/demo">'
+            "<file>icons/icon.png</file></qresource></RCC>"
+        )
+        (self.root / "i18n").mkdir()
+        (self.root / "i18n" / "demo_es.ts").touch()
+
+        index = QtSourceIndex(self.root)
+        self.assertEqual(index.affected({"plugin.py"}), [])
+        self.assertEqual(
+            index.affected({"icons/icon.png"}), [self.root / "resources.qrc"]
+        )
+        self.assertEqual(
+            index.affected({"i18n/demo_es.ts"}), [self.root / "i18n" / "demo_es.ts"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()